@@ -0,0 +1 @@
+"""Throughput and latency benchmarks for the ingestion and chat pipelines (see ``python -m benchmarks.run --help``)."""
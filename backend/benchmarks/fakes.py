@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+from app.domain import DocumentChunk, DocumentSource, ExtractedPage, QueryResult
+from benchmarks.synthetic import read_synthetic_pdf
+
+_TOKEN = re.compile(r"\w+")
+
+
+class SyntheticPdfExtractor:
+    """Reads the text layer of ``synthetic_pdf`` output, optionally sleeping ``page_latency_ms`` per page like OCR."""
+
+    def __init__(self, *, page_latency_ms: float = 0.0) -> None:
+        self.page_latency = page_latency_ms / 1000
+
+    @property
+    def fingerprint(self) -> str:
+        return "synthetic-pdf"
+
+    def extract_text(self, source: DocumentSource) -> str:
+        return "\n".join(page.text for page in self.iter_pages(source))
+
+    def iter_pages(self, source: DocumentSource) -> Iterator[ExtractedPage]:
+        if isinstance(source, (bytes, bytearray)):
+            data = bytes(source)
+        elif hasattr(source, "read"):
+            data = source.read()
+        else:
+            with open(source, "rb") as handle:
+                data = handle.read()
+        for number, text in enumerate(read_synthetic_pdf(data), start=1):
+            if self.page_latency:
+                time.sleep(self.page_latency)
+            yield ExtractedPage(number=number, text=text, metadata={"extraction": "text_layer"})
+
+    def close(self) -> None:
+        pass
+
+
+class HashingEmbedder:
+    """
+    Deterministic bag-of-words embeddings via signed feature hashing.
+
+    Texts sharing words get similar vectors, so retrieval returns relevant chunks without a model.
+    ``latency_ms_per_text`` emulates encoder cost.
+    """
+
+    def __init__(self, *, dim: int = 384, max_tokens: int = 254, latency_ms_per_text: float = 0.0) -> None:
+        self.dim = dim
+        self.max_tokens = max_tokens
+        self.latency_per_text = latency_ms_per_text / 1000
+
+    @property
+    def fingerprint(self) -> str:
+        return f"hashing:dim={self.dim}"
+
+    def count_tokens(self, text: str) -> int:
+        return len(_TOKEN.findall(text))
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if self.latency_per_text:
+            time.sleep(self.latency_per_text * len(texts))
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in _TOKEN.findall(text.lower()):
+                digest = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+                vectors[row, digest % self.dim] += 1.0 if digest >> 63 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return np.ascontiguousarray(vectors / norms)
+
+
+class InMemoryVectorStore:
+    """Brute-force cosine search over a growing numpy matrix."""
+
+    def __init__(self, embedder: HashingEmbedder) -> None:
+        self.embedder = embedder
+        self._chunks: list[DocumentChunk] = []
+        self._rows: list[np.ndarray] = []
+        self._matrix: np.ndarray | None = None
+        self._live: list[bool] = []
+        self._lock = threading.Lock()
+
+    def add_documents(self, chunks: Iterable[DocumentChunk]) -> None:
+        chunks = list(chunks)
+        missing = [chunk.content for chunk in chunks if chunk.embedding is None]
+        computed = iter(self.embedder.embed(missing)) if missing else iter(())
+        with self._lock:
+            for chunk in chunks:
+                vector = chunk.embedding if chunk.embedding is not None else next(computed)
+                self._chunks.append(chunk)
+                self._rows.append(np.asarray(vector, dtype=np.float32))
+                self._live.append(True)
+            self._matrix = None
+
+    def query(
+        self,
+        text: str,
+        limit: int = 5,
+        *,
+        where: dict[str, str] | None = None,
+        embedding: np.ndarray | None = None,
+    ) -> list[QueryResult]:
+        query = np.asarray(embedding if embedding is not None else self.embedder.embed([text])[0], dtype=np.float32)
+        with self._lock:
+            if self._matrix is None and self._rows:
+                self._matrix = np.vstack(self._rows)
+            matrix, chunks, live = self._matrix, self._chunks, np.array(self._live, dtype=bool)
+        if matrix is None:
+            return []
+        scores = matrix @ query
+        scores[~live[: len(scores)]] = -np.inf
+        if where:
+            for index, chunk in enumerate(chunks[: len(scores)]):
+                if any(chunk.metadata.get(key) != value for key, value in where.items()):
+                    scores[index] = -np.inf
+        top = np.argsort(-scores)[:limit]
+        return [QueryResult(chunk=chunks[index], score=float(scores[index])) for index in top if np.isfinite(scores[index])]
+
+    def delete_document(self, document_id: str) -> None:
+        with self._lock:
+            for index, chunk in enumerate(self._chunks):
+                if chunk.metadata.get("document_id") == document_id:
+                    self._live[index] = False
+
+
+class FixedLatencyLlm:
+    """
+    Stand-in RAG model: ``first_token_ms`` of prefill, then ``per_token_ms`` per generated token.
+
+    Answers quote the start of the best context chunk, so they are deterministic for a given retrieval.
+    """
+
+    def __init__(self, *, first_token_ms: float = 50.0, per_token_ms: float = 5.0, answer_tokens: int = 32) -> None:
+        self.first_token = first_token_ms / 1000
+        self.per_token = per_token_ms / 1000
+        self.answer_tokens = answer_tokens
+
+    def count_tokens(self, text: str) -> int:
+        return len(text.split())
+
+    def generate_answer(
+        self,
+        *,
+        question: str,
+        context: Sequence[DocumentChunk],
+        chat_history: Sequence[tuple[str, str]] | None = None,
+    ) -> str:
+        return "".join(self.stream_answer(question=question, context=context, chat_history=chat_history))
+
+    def stream_answer(
+        self,
+        *,
+        question: str,
+        context: Sequence[DocumentChunk],
+        chat_history: Sequence[tuple[str, str]] | None = None,
+    ) -> Iterator[str]:
+        words = (context[0].content if context else question).split()[: self.answer_tokens]
+        time.sleep(self.first_token)
+        for index, word in enumerate(words):
+            if index:
+                time.sleep(self.per_token)
+            yield word if index == 0 else f" {word}"
+
+    def close(self) -> None:
+        pass
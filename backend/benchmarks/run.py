@@ -0,0 +1,451 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from app.application.bulk_ingestion import BulkIngestionPipeline
+from app.application.chat import ChatUseCase
+from app.application.upload_document import UploadDocumentUseCase
+from app.bootstrap import build_chunker
+from app.core.config import Settings, get_settings
+from app.core.executors import ExecutorPools
+from app.core.metrics import MetricsRegistry
+from app.domain import EmbeddingService, RagService, TextExtractorService, VectorStore
+from app.infrastructure import (
+    InMemoryAnswerCache,
+    InstrumentedEmbeddingService,
+    InstrumentedRagService,
+    InstrumentedTextExtractor,
+    InstrumentedVectorStore,
+    MicroBatchingEmbedder,
+    MmapVectorStore,
+    SqliteBm25Index,
+    SqliteIngestionRegistry,
+)
+from benchmarks.fakes import FixedLatencyLlm, HashingEmbedder, InMemoryVectorStore, SyntheticPdfExtractor
+from benchmarks.synthetic import SyntheticCorpus, SyntheticDocument
+
+logger = logging.getLogger("benchmarks")
+
+RESULT_VERSION = 1
+
+
+@dataclass
+class _Components:
+    executors: ExecutorPools
+    extractor: TextExtractorService
+    embedder: EmbeddingService
+    vector_store: VectorStore
+    rag_service: RagService
+    registry: SqliteIngestionRegistry
+    lexical_index: SqliteBm25Index | None
+    query_embedder: MicroBatchingEmbedder | None
+    answer_cache: InMemoryAnswerCache | None
+
+    async def close(self) -> None:
+        if self.query_embedder is not None:
+            await self.query_embedder.close()
+        self.executors.shutdown(wait=False)
+        for component in (self.extractor, self.rag_service, self.registry, self.lexical_index):
+            close = getattr(component, "close", None)
+            if close is not None:
+                close()
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description=(
+            "Benchmark ingestion throughput and chat latency with deterministic stand-ins for the models "
+            "and vector database. Pool, chunker and batching settings come from the usual KB_* variables."
+        ),
+    )
+    corpus = parser.add_argument_group("corpus")
+    corpus.add_argument("--seed", type=int, default=0)
+    corpus.add_argument("--documents", type=int, default=20)
+    corpus.add_argument("--pages", type=int, default=10, help="pages per document")
+
+    ingestion = parser.add_argument_group("ingestion")
+    ingestion.add_argument("--ingest-mode", choices=["single", "bulk"], default="single",
+                           help="one embed_and_store call per document, or the bulk pipeline")
+    ingestion.add_argument("--ingest-concurrency", type=int, default=1, help="documents in flight in single mode")
+    ingestion.add_argument("--page-latency-ms", type=float, default=0.0, help="simulated OCR time per page")
+    ingestion.add_argument("--embed-latency-ms", type=float, default=0.0, help="simulated encoder time per text")
+
+    chat = parser.add_argument_group("chat")
+    chat.add_argument("--chat-requests", type=int, default=200, help="measured requests per concurrency level")
+    chat.add_argument("--warmup", type=int, default=5, help="unmeasured requests before each level")
+    chat.add_argument("--concurrency", default="1,4,16", help="comma-separated concurrency levels")
+    chat.add_argument("--stream", action="store_true", help="use stream_chat and report time to first token")
+    chat.add_argument("--first-token-ms", type=float, default=50.0, help="fake LLM prefill latency")
+    chat.add_argument("--per-token-ms", type=float, default=5.0, help="fake LLM decode latency per token")
+    chat.add_argument("--answer-tokens", type=int, default=32)
+    chat.add_argument("--answer-cache", action="store_true", help="enable the answer cache (off by default)")
+
+    backends = parser.add_argument_group("backends")
+    backends.add_argument("--vector-store", choices=["memory", "mmap"], default="memory")
+    backends.add_argument("--real-models", action="store_true",
+                          help="use KB_EMBEDDING_MODEL and KB_RAG_MODEL_NAME from the local Hugging Face cache")
+    backends.add_argument("--real-extractor", action="store_true",
+                          help="use the configured pdftotext/Tesseract extractor instead of the synthetic reader")
+
+    output = parser.add_argument_group("output")
+    output.add_argument("--output", help="write the JSON result here instead of stdout")
+    output.add_argument("--baseline", help="earlier JSON result to compare against")
+    output.add_argument("--workdir", help="directory for on-disk state (defaults to a temporary directory)")
+    output.add_argument("--verbose", action="store_true", help="show application logs")
+    return parser.parse_args(argv)
+
+
+def _build(args: argparse.Namespace, settings: Settings, workdir: str, metrics: MetricsRegistry) -> _Components:
+    executors = ExecutorPools.from_settings(settings)
+
+    if args.real_models:
+        # Never download weights in the middle of a benchmark run.
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+        from app.bootstrap import build_embedding_service, build_rag_service
+
+        try:
+            embedder: Any = build_embedding_service(settings, metrics)
+            rag_service: Any = build_rag_service(settings, metrics)
+        except Exception as exc:  # noqa: BLE001 - reported as a usage error
+            raise SystemExit(
+                f"--real-models needs {settings.embedding_model} and {settings.rag_model_name} in the local "
+                f"Hugging Face cache ({type(exc).__name__}: {exc})"
+            ) from exc
+    else:
+        embedder = InstrumentedEmbeddingService(HashingEmbedder(latency_ms_per_text=args.embed_latency_ms), metrics)
+        rag_service = InstrumentedRagService(
+            FixedLatencyLlm(
+                first_token_ms=args.first_token_ms, per_token_ms=args.per_token_ms, answer_tokens=args.answer_tokens
+            ),
+            metrics,
+        )
+
+    if args.real_extractor:
+        from app.bootstrap import build_text_extractor
+
+        extractor: Any = build_text_extractor(settings)
+    else:
+        extractor = SyntheticPdfExtractor(page_latency_ms=args.page_latency_ms)
+
+    if args.vector_store == "mmap":
+        vector_store: Any = MmapVectorStore(directory=os.path.join(workdir, "vectors"), embedder=embedder)
+    else:
+        vector_store = InMemoryVectorStore(embedder)
+
+    query_embedder = (
+        MicroBatchingEmbedder(
+            embedder,
+            max_batch_size=settings.embedding_batch_max_size,
+            max_wait_ms=settings.embedding_batch_max_wait_ms,
+            pool=executors.embedding,
+        )
+        if settings.embedding_batching_enabled
+        else None
+    )
+    return _Components(
+        executors=executors,
+        extractor=InstrumentedTextExtractor(extractor, metrics),
+        embedder=embedder,
+        vector_store=InstrumentedVectorStore(vector_store, metrics),
+        rag_service=rag_service,
+        registry=SqliteIngestionRegistry(os.path.join(workdir, "ingestion.sqlite3")),
+        lexical_index=(
+            SqliteBm25Index(os.path.join(workdir, "bm25.sqlite3")) if settings.hybrid_search_enabled else None
+        ),
+        query_embedder=query_embedder,
+        answer_cache=InMemoryAnswerCache() if args.answer_cache else None,
+    )
+
+
+async def _bench_ingestion(
+    args: argparse.Namespace, use_case: UploadDocumentUseCase, documents: list[SyntheticDocument]
+) -> dict[str, Any]:
+    start = time.perf_counter()
+    if args.ingest_mode == "bulk":
+        settings = get_settings()
+        pipeline = BulkIngestionPipeline(
+            use_case,
+            extract_concurrency=settings.bulk_extract_concurrency,
+            embed_concurrency=settings.bulk_embed_concurrency,
+            queue_size=settings.bulk_queue_size,
+        )
+        report = await pipeline.run((document.filename, document.data) for document in documents)
+        chunks = sum(result.chunk_count for result in report.results)
+        failed = sum(1 for result in report.results if result.status == "failed")
+    else:
+        slots = asyncio.Semaphore(max(args.ingest_concurrency, 1))
+
+        async def _ingest(document: SyntheticDocument) -> int:
+            async with slots:
+                result = await use_case.embed_and_store(filename=document.filename, source=document.data)
+                return result.chunk_count
+
+        outcomes = await asyncio.gather(*(_ingest(document) for document in documents), return_exceptions=True)
+        chunks = sum(outcome for outcome in outcomes if isinstance(outcome, int))
+        failed = sum(1 for outcome in outcomes if isinstance(outcome, BaseException))
+    elapsed = time.perf_counter() - start
+
+    pages = sum(len(document.pages) for document in documents)
+    return {
+        "mode": args.ingest_mode,
+        "documents": len(documents),
+        "failed": failed,
+        "pages": pages,
+        "chunks": chunks,
+        "elapsed_seconds": round(elapsed, 4),
+        "docs_per_minute": round(len(documents) / elapsed * 60, 2),
+        "pages_per_second": round(pages / elapsed, 2),
+        "chunks_per_second": round(chunks / elapsed, 2),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+async def _bench_chat(
+    args: argparse.Namespace, chat: ChatUseCase, questions: list[str], concurrency: int
+) -> dict[str, Any]:
+    async def _ask(question: str) -> tuple[float, float | None]:
+        start = time.perf_counter()
+        if not args.stream:
+            await chat.chat(question=question)
+            return time.perf_counter() - start, None
+        stream = await chat.stream_chat(question=question)
+        first_token = None
+        async for _ in stream.tokens:
+            if first_token is None:
+                first_token = time.perf_counter() - start
+        return time.perf_counter() - start, first_token
+
+    async def _run(batch: list[str]) -> list[tuple[float, float | None]]:
+        pending = iter(batch)
+        results: list[tuple[float, float | None]] = []
+
+        async def _worker() -> None:
+            for question in pending:
+                results.append(await _ask(question))
+
+        await asyncio.gather(*(_worker() for _ in range(concurrency)))
+        return results
+
+    await _run(questions[: args.warmup])
+    measured = questions[args.warmup : args.warmup + args.chat_requests]
+    start = time.perf_counter()
+    results = await _run(measured)
+    elapsed = time.perf_counter() - start
+
+    summary: dict[str, Any] = {
+        "concurrency": concurrency,
+        "requests": len(results),
+        "elapsed_seconds": round(elapsed, 4),
+        "throughput_rps": round(len(results) / elapsed, 2),
+        "latency_ms": _latency_summary([latency for latency, _ in results]),
+    }
+    if args.stream:
+        summary["time_to_first_token_ms"] = _latency_summary([ttft for _, ttft in results if ttft is not None])
+    summary["peak_rss_mb"] = _peak_rss_mb()
+    return summary
+
+
+def _latency_summary(seconds: list[float]) -> dict[str, float]:
+    values = sorted(value * 1000 for value in seconds)
+    if not values:
+        return {}
+    return {
+        "p50": round(_percentile(values, 50), 3),
+        "p95": round(_percentile(values, 95), 3),
+        "p99": round(_percentile(values, 99), 3),
+        "mean": round(sum(values) / len(values), 3),
+        "max": round(values[-1], 3),
+    }
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """Linear interpolation between closest ranks of sorted ``values``."""
+    position = (len(values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _stage_summary(metrics: MetricsRegistry) -> dict[str, dict[str, float]]:
+    stages = {}
+    for histogram in metrics.histograms("stage_duration_seconds"):
+        if histogram.count:
+            stages[histogram.labels["stage"]] = {
+                "count": histogram.count,
+                "total_seconds": round(histogram.total, 4),
+                "mean_ms": round(histogram.total / histogram.count * 1000, 3),
+            }
+    return dict(sorted(stages.items()))
+
+
+def _compare(result: dict[str, Any], baseline: dict[str, Any]) -> dict[str, Any]:
+    """Relative change (``+0.1`` = 10% higher) of the headline numbers against ``baseline``."""
+
+    def _change(current: float | None, previous: float | None) -> float | None:
+        if current is None or not previous:
+            return None
+        return round((current - previous) / previous, 4)
+
+    comparison: dict[str, Any] = {
+        "baseline_timestamp": baseline.get("timestamp"),
+        "baseline_git_commit": baseline.get("git_commit"),
+        "chunks_per_second": _change(
+            result["ingestion"]["chunks_per_second"], baseline.get("ingestion", {}).get("chunks_per_second")
+        ),
+        "chat": [],
+    }
+    previous_levels = {level["concurrency"]: level for level in baseline.get("chat", [])}
+    for level in result["chat"]:
+        previous = previous_levels.get(level["concurrency"])
+        if previous is None:
+            continue
+        comparison["chat"].append(
+            {
+                "concurrency": level["concurrency"],
+                "throughput_rps": _change(level["throughput_rps"], previous.get("throughput_rps")),
+                **{
+                    key: _change(level["latency_ms"].get(key), previous.get("latency_ms", {}).get(key))
+                    for key in ("p50", "p95", "p99")
+                },
+            }
+        )
+    return comparison
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+async def _run(args: argparse.Namespace, workdir: str) -> dict[str, Any]:
+    settings = get_settings()
+    metrics = MetricsRegistry()
+    corpus = SyntheticCorpus(seed=args.seed)
+    documents = corpus.documents(args.documents, pages=args.pages)
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    questions = corpus.questions(documents, args.warmup + args.chat_requests)
+
+    components = _build(args, settings, workdir, metrics)
+    try:
+        upload = UploadDocumentUseCase(
+            text_extractor=components.extractor,
+            embedder=components.embedder,
+            vector_store=components.vector_store,
+            chunker=build_chunker(settings, components.embedder),  # type: ignore[arg-type]
+            registry=components.registry,
+            lexical_index=components.lexical_index,
+            answer_cache=components.answer_cache,
+            executors=components.executors,
+        )
+        logger.warning("Ingesting %d synthetic documents (%d pages each)", len(documents), args.pages)
+        ingestion = await _bench_ingestion(args, upload, documents)
+
+        chat = ChatUseCase(
+            vector_store=components.vector_store,
+            rag_service=components.rag_service,
+            top_k=settings.rag_top_k,
+            registry=components.registry,
+            query_embedder=components.query_embedder.embed_one if components.query_embedder else None,
+            lexical_index=components.lexical_index,
+            fusion_k=settings.rrf_k,
+            answer_cache=components.answer_cache,
+            executors=components.executors,
+        )
+        chat_levels = []
+        for concurrency in levels:
+            logger.warning("Running %d chat requests at concurrency %d", args.chat_requests, concurrency)
+            chat_levels.append(await _bench_chat(args, chat, questions, concurrency))
+    finally:
+        await components.close()
+
+    return {
+        "version": RESULT_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            **vars(args),
+            "chunker": settings.chunker,
+            "hybrid_search": settings.hybrid_search_enabled,
+            "embedding_batching": settings.embedding_batching_enabled,
+            "pools": {pool.name: pool.max_workers for pool in components.executors.all()},
+        },
+        "ingestion": ingestion,
+        "chat": chat_levels,
+        "stages": _stage_summary(metrics),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
+    )
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+        result = asyncio.run(_run(args, args.workdir))
+    else:
+        with tempfile.TemporaryDirectory(prefix="kb-bench-") as workdir:
+            result = asyncio.run(_run(args, workdir))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            result["comparison"] = _compare(result, json.load(handle))
+
+    rendered = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(rendered + "\n")
+        ingestion = result["ingestion"]
+        print(
+            f"ingestion: {ingestion['chunks_per_second']} chunks/s, {ingestion['docs_per_minute']} docs/min",
+            file=sys.stderr,
+        )
+        for level in result["chat"]:
+            latency = level["latency_ms"]
+            print(
+                f"chat x{level['concurrency']}: p50={latency.get('p50')}ms p95={latency.get('p95')}ms "
+                f"p99={latency.get('p99')}ms {level['throughput_rps']} req/s",
+                file=sys.stderr,
+            )
+        print(f"peak RSS: {result['peak_rss_mb']} MB -> {args.output}", file=sys.stderr)
+    else:
+        print(rendered)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
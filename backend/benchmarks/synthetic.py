@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import random
+import re
+from dataclasses import dataclass
+
+_SYLLABLES = (
+    "ka", "lo", "mi", "ne", "ru", "ta", "vi", "so", "de", "pa", "qu", "ex", "ol", "an", "ti", "ber",
+    "gar", "mon", "sel", "tor", "ven", "zu", "pri", "cal", "dor", "fen", "hal", "jin", "lus", "mar",
+)
+_STREAM = re.compile(rb"stream\n(.*?)\nendstream", re.S)
+_SHOWN_TEXT = re.compile(rb"\(((?:\\.|[^\\)])*)\) Tj")
+_LINE_CHARS = 90
+_LINES_PER_PAGE = 48
+
+
+@dataclass
+class SyntheticDocument:
+    filename: str
+    pages: list[str]
+    data: bytes
+
+
+class SyntheticCorpus:
+    """
+    Deterministic documents and questions generated from ``seed``.
+
+    Words follow a Zipf-like distribution over a fixed vocabulary, so keyword and vector search
+    behave roughly like they do on natural text; questions reuse phrases from the documents.
+    """
+
+    def __init__(self, *, seed: int = 0, vocabulary_size: int = 3000) -> None:
+        self.seed = seed
+        rng = random.Random(seed)
+        words: set[str] = set()
+        while len(words) < vocabulary_size:
+            words.add("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 4))))
+        self.vocabulary = sorted(words)
+        rng.shuffle(self.vocabulary)
+        self._weights = [1.0 / (rank + 1) for rank in range(len(self.vocabulary))]
+
+    def documents(self, count: int, *, pages: int) -> list[SyntheticDocument]:
+        rng = random.Random(f"{self.seed}:documents")
+        documents = []
+        for index in range(count):
+            page_texts = [self._page(rng) for _ in range(pages)]
+            documents.append(
+                SyntheticDocument(filename=f"synthetic-{index:04d}.pdf", pages=page_texts, data=synthetic_pdf(page_texts))
+            )
+        return documents
+
+    def questions(self, documents: list[SyntheticDocument], count: int) -> list[str]:
+        rng = random.Random(f"{self.seed}:questions")
+        questions = []
+        for _ in range(count):
+            page = rng.choice(rng.choice(documents).pages)
+            words = page.split()
+            start = rng.randrange(max(len(words) - 8, 1))
+            phrase = " ".join(word.strip(".,") for word in words[start : start + rng.randint(4, 8)])
+            questions.append(f"What does the document say about {phrase}?")
+        return questions
+
+    def _page(self, rng: random.Random) -> str:
+        paragraphs = []
+        budget = _LINE_CHARS * (_LINES_PER_PAGE - 6)
+        while budget > 0:
+            sentences = [self._sentence(rng) for _ in range(rng.randint(3, 7))]
+            paragraph = " ".join(sentences)
+            paragraphs.append(paragraph)
+            budget -= len(paragraph) + _LINE_CHARS
+        return "\n\n".join(paragraphs)
+
+    def _sentence(self, rng: random.Random) -> str:
+        words = rng.choices(self.vocabulary, weights=self._weights, k=rng.randint(8, 20))
+        sentence = " ".join(words)
+        if rng.random() < 0.3:
+            middle = rng.randrange(len(words) // 2, len(words))
+            sentence = " ".join(words[:middle]) + ", " + " ".join(words[middle:])
+        return sentence[0].upper() + sentence[1:] + "."
+
+
+def synthetic_pdf(pages: list[str]) -> bytes:
+    """A minimal PDF with one text-layer page per entry (readable by ``pdftotext`` for real-extractor runs)."""
+    page_count = len(pages)
+    objects: list[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids ["
+        + b" ".join(f"{4 + 2 * index} 0 R".encode() for index in range(page_count))
+        + f"] /Count {page_count} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for index, text in enumerate(pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {5 + 2 * index} 0 R >>".encode()
+        )
+        content = _content_stream(text)
+        objects.append(f"<< /Length {len(content)} >>\nstream\n".encode() + content + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def read_synthetic_pdf(data: bytes) -> list[str]:
+    """Page texts of a PDF written by ``synthetic_pdf``."""
+    pages = []
+    for stream in _STREAM.findall(data):
+        lines = [_unescape(match) for match in _SHOWN_TEXT.findall(stream)]
+        pages.append("\n".join(lines))
+    return pages
+
+
+def _content_stream(text: str) -> bytes:
+    lines: list[str] = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split():
+            if line and len(line) + 1 + len(word) > _LINE_CHARS:
+                lines.append(line)
+                line = word
+            else:
+                line = f"{line} {word}" if line else word
+        lines.append(line)
+    commands = [b"BT /F1 10 Tf 12 TL 50 750 Td"]
+    for line in lines:
+        escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        commands.append(f"({escaped}) Tj T*".encode("latin-1", errors="replace"))
+    commands.append(b"ET")
+    return b"\n".join(commands)
+
+
+def _unescape(raw: bytes) -> str:
+    return re.sub(rb"\\(.)", rb"\1", raw).decode("latin-1")
@@ -1,6 +1,7 @@
 """Application layer (use case services)."""
 
 from app.application.chat import ChatUseCase
-from app.application.upload_document import UploadDocumentUseCase
+from app.application.chunking import CharacterChunker, SentenceChunker
+from app.application.upload_document import UploadDocumentUseCase, UploadResult
 
-__all__ = ["ChatUseCase", "UploadDocumentUseCase"]
+__all__ = ["CharacterChunker", "ChatUseCase", "SentenceChunker", "UploadDocumentUseCase", "UploadResult"]
@@ -0,0 +1,379 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import shutil
+import tarfile
+import time
+import uuid
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator
+
+from app.application.spooling import spool_to_disk
+from app.application.upload_document import ChunkBatch, PreparedUpload, UploadDocumentUseCase, UploadResult
+from app.domain import DocumentSource
+
+logger = logging.getLogger(__name__)
+
+_PDF_SUFFIX = ".pdf"
+
+
+def iter_pdf_sources(paths: Iterable[str]) -> Iterator[tuple[str, DocumentSource]]:
+    """
+    Yield ``(filename, source)`` for every PDF in ``paths``.
+
+    Paths may be PDFs, directories (searched recursively) or zip/tar archives; files found inside a
+    directory or archive are named by their relative path. A name already yielded gets a " (2)", " (3)",
+    ... suffix, since the name becomes the document id. PDFs on disk are yielded as paths; archive
+    members are read lazily, one at a time.
+    """
+    seen: set[str] = set()
+    for name, source in _iter_pdf_sources(paths):
+        unique = _unique_name(name, seen)
+        if unique != name:
+            logger.warning("Another document is already named %s; ingesting this one as %s", name, unique)
+        seen.add(unique)
+        yield unique, source
+
+
+def _iter_pdf_sources(paths: Iterable[str]) -> Iterator[tuple[str, DocumentSource]]:
+    for raw_path in paths:
+        path = Path(raw_path)
+        if path.is_dir():
+            for pdf in sorted(p for p in path.rglob("*") if p.is_file() and p.suffix.lower() == _PDF_SUFFIX):
+                yield pdf.relative_to(path).as_posix(), str(pdf)
+        elif zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir() and info.filename.lower().endswith(_PDF_SUFFIX):
+                        yield info.filename, archive.read(info)
+        elif tarfile.is_tarfile(path):
+            with tarfile.open(path) as archive:
+                for member in archive:
+                    if member.isfile() and member.name.lower().endswith(_PDF_SUFFIX):
+                        handle = archive.extractfile(member)
+                        if handle is not None:
+                            yield member.name, handle.read()
+        elif path.suffix.lower() == _PDF_SUFFIX:
+            yield path.name, str(path)
+        else:
+            logger.warning("Skipping %s: not a PDF, directory or zip/tar archive", raw_path)
+
+
+def _unique_name(name: str, taken: set[str]) -> str:
+    if name not in taken:
+        return name
+    stem, dot, suffix = name.rpartition(".")
+    number = 2
+    while (candidate := f"{stem} ({number}).{suffix}" if dot else f"{name} ({number})") in taken:
+        number += 1
+    return candidate
+
+
+@dataclass
+class BulkItemResult:
+    filename: str
+    status: str  # "indexed", "duplicate", "empty" or "failed"
+    document_id: str | None = None
+    chunk_count: int = 0
+    pages: int = 0
+    error: str | None = None
+
+
+@dataclass
+class BulkIngestionReport:
+    results: list[BulkItemResult] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: float | None = None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def docs_per_minute(self) -> float:
+        elapsed = self.elapsed_seconds
+        return len(self.results) / elapsed * 60 if elapsed > 0 else 0.0
+
+    def summary(self) -> dict[str, object]:
+        statuses: dict[str, int] = {}
+        for result in self.results:
+            statuses[result.status] = statuses.get(result.status, 0) + 1
+        return {
+            "documents": len(self.results),
+            "statuses": statuses,
+            "pages": sum(result.pages for result in self.results),
+            "chunks": sum(result.chunk_count for result in self.results),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "docs_per_minute": round(self.docs_per_minute, 2),
+            "errors": list(self.errors),
+            "finished": self.finished_at is not None,
+        }
+
+
+@dataclass
+class _DocumentState:
+    upload: PreparedUpload
+    batches: int = 0
+    settled: int = 0
+    extracted: bool = False
+    finishing: bool = False
+    error: BaseException | None = None
+
+
+class BulkIngestionPipeline:
+    """
+    Ingests many documents with ``UploadDocumentUseCase`` stages running concurrently.
+
+    Extraction (``extract_concurrency`` documents at a time), embedding and storage are connected by
+    queues of at most ``queue_size`` batches, so OCR of one document overlaps embedding and upserts of
+    others while memory stays bounded. A failure only affects its own document.
+    """
+
+    def __init__(
+        self,
+        use_case: UploadDocumentUseCase,
+        *,
+        extract_concurrency: int = 2,
+        embed_concurrency: int = 1,
+        queue_size: int = 4,
+    ) -> None:
+        self.use_case = use_case
+        self.extract_concurrency = max(extract_concurrency, 1)
+        self.embed_concurrency = max(embed_concurrency, 1)
+        self.queue_size = max(queue_size, 1)
+
+    async def run(
+        self, sources: Iterable[tuple[str, DocumentSource]], *, report: BulkIngestionReport | None = None
+    ) -> BulkIngestionReport:
+        report = report if report is not None else BulkIngestionReport()
+        report.started_at = time.monotonic()
+        documents: asyncio.Queue[tuple[str, DocumentSource] | None] = asyncio.Queue(self.extract_concurrency)
+        to_embed: asyncio.Queue[ChunkBatch | None] = asyncio.Queue(self.queue_size)
+        to_store: asyncio.Queue[ChunkBatch | None] = asyncio.Queue(self.queue_size)
+        states: dict[int, _DocumentState] = {}
+
+        async def finish_if_done(state: _DocumentState) -> None:
+            if state.finishing or not state.extracted or state.settled < state.batches:
+                return
+            state.finishing = True
+            del states[id(state.upload)]
+            upload = state.upload
+            if state.error is not None:
+                await self.use_case.abort(upload)
+                report.results.append(_failed(upload.filename, state.error, pages=upload.progress.pages_extracted))
+                return
+            try:
+                result = await self.use_case.complete(upload)
+            except Exception as exc:  # noqa: BLE001 - reported per document
+                report.results.append(_failed(upload.filename, exc, pages=upload.progress.pages_extracted))
+                return
+            report.results.append(
+                BulkItemResult(
+                    filename=upload.filename,
+                    status="indexed" if result.chunk_count else "empty",
+                    document_id=result.document_id,
+                    chunk_count=result.chunk_count,
+                    pages=upload.progress.pages_extracted,
+                )
+            )
+
+        async def feed() -> None:
+            iterator = iter(sources)
+            try:
+                while (item := await asyncio.to_thread(next, iterator, None)) is not None:
+                    await documents.put(item)
+            except Exception as exc:  # noqa: BLE001 - e.g. a corrupt archive; documents read so far still finish
+                logger.exception("Reading bulk ingestion sources failed")
+                report.errors.append(str(exc) or type(exc).__name__)
+            for _ in range(self.extract_concurrency):
+                await documents.put(None)
+
+        async def extract() -> None:
+            while (item := await documents.get()) is not None:
+                filename, source = item
+                try:
+                    prepared = await self.use_case.prepare(filename=filename, source=source)
+                except Exception as exc:  # noqa: BLE001 - reported per document
+                    logger.exception("Bulk ingestion of %s failed during preparation", filename)
+                    report.results.append(_failed(filename, exc))
+                    continue
+                if isinstance(prepared, UploadResult):
+                    report.results.append(
+                        BulkItemResult(
+                            filename=filename,
+                            status="duplicate",
+                            document_id=prepared.document_id,
+                            chunk_count=prepared.chunk_count,
+                        )
+                    )
+                    continue
+
+                state = _DocumentState(upload=prepared)
+                states[id(prepared)] = state
+                try:
+                    async for batch in self.use_case.iter_batches(prepared):
+                        if state.error is not None:
+                            break
+                        state.batches += 1
+                        await to_embed.put(batch)
+                except Exception as exc:  # noqa: BLE001 - reported per document
+                    logger.exception("Bulk ingestion of %s failed during extraction", filename)
+                    state.error = exc
+                state.extracted = True
+                await finish_if_done(state)
+
+        async def embed() -> None:
+            while (batch := await to_embed.get()) is not None:
+                state = states[id(batch.upload)]
+                if state.error is None:
+                    try:
+                        await self.use_case.embed_batch(batch)
+                        await to_store.put(batch)
+                        continue
+                    except Exception as exc:  # noqa: BLE001 - reported per document
+                        logger.exception("Bulk ingestion of %s failed during embedding", batch.upload.filename)
+                        state.error = exc
+                state.settled += 1
+                await finish_if_done(state)
+
+        async def store() -> None:
+            while (batch := await to_store.get()) is not None:
+                state = states[id(batch.upload)]
+                if state.error is None:
+                    try:
+                        await self.use_case.store_batch(batch)
+                    except Exception as exc:  # noqa: BLE001 - reported per document
+                        logger.exception("Bulk ingestion of %s failed during storage", batch.upload.filename)
+                        state.error = exc
+                state.settled += 1
+                await finish_if_done(state)
+
+        loop = asyncio.get_running_loop()
+        feeder = loop.create_task(feed())
+        extractors = [loop.create_task(extract()) for _ in range(self.extract_concurrency)]
+        embedders = [loop.create_task(embed()) for _ in range(self.embed_concurrency)]
+        # A single writer keeps upserts (and registry updates) in order.
+        storer = loop.create_task(store())
+        try:
+            await asyncio.gather(feeder, *extractors)
+            for _ in embedders:
+                await to_embed.put(None)
+            await asyncio.gather(*embedders)
+            await to_store.put(None)
+            await storer
+        except BaseException:
+            for task in [feeder, *extractors, *embedders, storer]:
+                task.cancel()
+            await asyncio.gather(feeder, *extractors, *embedders, storer, return_exceptions=True)
+            for state in list(states.values()):
+                await self.use_case.abort(state.upload)
+            raise
+        finally:
+            report.finished_at = time.monotonic()
+
+        summary = report.summary()
+        logger.info(
+            "Bulk ingestion finished: %d documents in %.1fs (%.1f docs/min) %s",
+            summary["documents"],
+            summary["elapsed_seconds"],
+            summary["docs_per_minute"],
+            summary["statuses"],
+        )
+        return report
+
+
+def _failed(filename: str, exc: BaseException, *, pages: int = 0) -> BulkItemResult:
+    return BulkItemResult(filename=filename, status="failed", pages=pages, error=str(exc) or type(exc).__name__)
+
+
+@dataclass
+class BulkRun:
+    id: str
+    spool_dir: Path
+    report: BulkIngestionReport = field(default_factory=BulkIngestionReport)
+    task: asyncio.Task[BulkIngestionReport] | None = None
+    error: str | None = None
+    files: int = 0
+
+    @property
+    def status(self) -> str:
+        if self.task is None:
+            return "receiving"
+        if not self.task.done():
+            return "running"
+        return "failed" if self.error else "finished"
+
+
+class BulkIngestionService:
+    """Runs bulk uploads through ``BulkIngestionPipeline`` in the background and keeps recent reports."""
+
+    def __init__(
+        self,
+        pipeline: BulkIngestionPipeline,
+        *,
+        spool_dir: str,
+        max_runs: int = 50,
+        max_upload_bytes: int | None = None,
+    ) -> None:
+        self.pipeline = pipeline
+        self.spool_dir = Path(spool_dir)
+        self.max_upload_bytes = max_upload_bytes
+        self.max_runs = max(max_runs, 1)
+        self._runs: dict[str, BulkRun] = {}
+
+    def create_run(self) -> BulkRun:
+        run_id = uuid.uuid4().hex
+        run = BulkRun(id=run_id, spool_dir=self.spool_dir / run_id)
+        run.spool_dir.mkdir(parents=True, exist_ok=True)
+        self._runs[run_id] = run
+        self._forget_old_runs()
+        return run
+
+    async def spool(self, run: BulkRun, filename: str, source: BinaryIO) -> None:
+        """
+        Stream an uploaded PDF or archive into the run's spool directory.
+
+        Raises ``UploadTooLargeError`` when the file exceeds ``max_upload_bytes``.
+        """
+        # Each upload gets its own directory so identical names never collide; only the base name is kept.
+        target = run.spool_dir / str(run.files) / Path(filename).name
+        run.files += 1
+        await asyncio.to_thread(spool_to_disk, source, target, max_bytes=self.max_upload_bytes)
+
+    def launch(self, run: BulkRun) -> BulkRun:
+        paths = [str(path) for path in sorted(run.spool_dir.glob("*/*"), key=lambda p: int(p.parent.name))]
+        run.task = asyncio.get_running_loop().create_task(self._run(run, paths))
+        return run
+
+    def get(self, run_id: str) -> BulkRun | None:
+        return self._runs.get(run_id)
+
+    async def discard(self, run: BulkRun) -> None:
+        """Drop a run that was never launched (e.g. an upload was rejected while spooling)."""
+        self._runs.pop(run.id, None)
+        await asyncio.to_thread(shutil.rmtree, run.spool_dir, True)
+
+    async def close(self) -> None:
+        tasks = [run.task for run in self._runs.values() if run.task is not None and not run.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, run: BulkRun, paths: list[str]) -> BulkIngestionReport:
+        try:
+            return await self.pipeline.run(iter_pdf_sources(paths), report=run.report)
+        except Exception as exc:
+            logger.exception("Bulk ingestion run %s failed", run.id)
+            run.error = str(exc) or type(exc).__name__
+            return run.report
+        finally:
+            await asyncio.to_thread(shutil.rmtree, run.spool_dir, True)
+
+    def _forget_old_runs(self) -> None:
+        finished = [run_id for run_id, run in self._runs.items() if run.task is not None and run.task.done()]
+        for run_id in finished[: max(len(self._runs) - self.max_runs, 0)]:
+            del self._runs[run_id]
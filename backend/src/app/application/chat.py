@@ -1,9 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from typing import Sequence
+from typing import AsyncIterator, Awaitable, Callable, Sequence
 
-from app.domain import DocumentChunk, RagService, VectorStore
+import numpy as np
+
+from app.core.executors import ExecutorPools, run_in_pool, stream_in_pool
+from app.application.retrieval import reciprocal_rank_fusion
+from app.domain import (
+    AnswerCache,
+    CachedAnswer,
+    DocumentChunk,
+    IngestionRegistry,
+    LexicalIndex,
+    QueryResult,
+    RagService,
+    VectorStore,
+)
 
 
 @dataclass
@@ -13,42 +27,171 @@ class ChatResult:
     context: list[DocumentChunk]
 
 
+@dataclass
+class ChatStream:
+    source: str | None
+    context: list[DocumentChunk]
+    tokens: AsyncIterator[str]
+
+
 class ChatUseCase:
     """Use case: retrieve relevant chunks and generate an answer with RAG."""
 
-    def __init__(self, *, vector_store: VectorStore, rag_service: RagService, top_k: int = 5) -> None:
+    def __init__(
+        self,
+        *,
+        vector_store: VectorStore,
+        rag_service: RagService,
+        top_k: int = 5,
+        registry: IngestionRegistry | None = None,
+        query_embedder: Callable[[str], Awaitable[np.ndarray]] | None = None,
+        lexical_index: LexicalIndex | None = None,
+        fusion_k: int = 60,
+        answer_cache: AnswerCache | None = None,
+        executors: ExecutorPools | None = None,
+    ) -> None:
         self.vector_store = vector_store
         self.rag_service = rag_service
         self.top_k = top_k
+        self.registry = registry
+        self.query_embedder = query_embedder
+        self.lexical_index = lexical_index
+        self.fusion_k = fusion_k
+        self.answer_cache = answer_cache
+        self.executors = executors
+        self._cache_generation: int | None = None
 
-    def chat(
+    async def chat(
         self,
         *,
         question: str,
         document_id: str | None = None,
         chat_history: Sequence[tuple[str, str]] | None = None,
     ) -> ChatResult:
-        results = self.vector_store.query(question, limit=self.top_k)
+        document_id = self._resolve_document(document_id)
+        query_embedding = await self._embed_question(question)
+        # Answers that depend on earlier turns are not reusable for another conversation.
+        cache = self.answer_cache if not chat_history else None
+        if cache is not None:
+            self._sync_answer_cache()
+            cached = cache.get(question, scope=document_id, embedding=query_embedding)
+            if cached is not None:
+                return ChatResult(answer=cached.answer, source=cached.source, context=cached.context)
 
-        def _matches_document(chunk: DocumentChunk) -> bool:
-            if document_id is None:
-                return True
-            if chunk.metadata is None:
-                return False
-            return chunk.metadata.get("filename") == document_id or chunk.metadata.get("document_id") == document_id
+        context_chunks = await self._retrieve(question, document_id=document_id, query_embedding=query_embedding)
+        generation_pool = self.executors.generation if self.executors else None
+
+        answer = await run_in_pool(
+            generation_pool,
+            self.rag_service.generate_answer,
+            question=question,
+            context=context_chunks,
+            chat_history=chat_history,
+        )
+        result = ChatResult(answer=answer, source=_source_of(context_chunks), context=context_chunks)
+        if cache is not None:
+            cache.put(
+                question,
+                CachedAnswer(answer=result.answer, source=result.source, context=result.context),
+                scope=document_id,
+                embedding=query_embedding,
+            )
+        return result
+
+    async def stream_chat(
+        self,
+        *,
+        question: str,
+        document_id: str | None = None,
+        chat_history: Sequence[tuple[str, str]] | None = None,
+    ) -> ChatStream:
+        """Retrieve context up front and return the answer as an async stream of text pieces."""
+        document_id = self._resolve_document(document_id)
+        query_embedding = await self._embed_question(question)
+        if self.answer_cache is not None and not chat_history:
+            self._sync_answer_cache()
+            cached = self.answer_cache.get(question, scope=document_id, embedding=query_embedding)
+            if cached is not None:
+                return ChatStream(source=cached.source, context=cached.context, tokens=_replay(cached.answer))
 
-        context_chunks = [result.chunk for result in results if _matches_document(result.chunk)]
-        if not context_chunks:
-            # Fall back to whatever we have to avoid empty context when filtering removes everything.
-            context_chunks = [result.chunk for result in results]
+        context_chunks = await self._retrieve(question, document_id=document_id, query_embedding=query_embedding)
+        generation_pool = self.executors.generation if self.executors else None
 
-        answer = self.rag_service.generate_answer(
+        tokens = stream_in_pool(
+            generation_pool,
+            self.rag_service.stream_answer,
             question=question,
             context=context_chunks,
             chat_history=chat_history,
         )
-        source = None
-        if context_chunks and context_chunks[0].metadata:
-            source = context_chunks[0].metadata.get("filename") or context_chunks[0].metadata.get("document_id")
+        return ChatStream(source=_source_of(context_chunks), context=context_chunks, tokens=tokens)
+
+    def _sync_answer_cache(self) -> None:
+        """
+        Drop cached answers for documents ingested or deleted since the last lookup, including by other
+        API workers and the bulk CLI, which can only invalidate their own caches directly.
+        """
+        if self.answer_cache is None or self.registry is None:
+            return
+        generation = self.registry.generation()
+        if generation == self._cache_generation:
+            return
+        changed = self.registry.changed_since(self._cache_generation) if self._cache_generation is not None else None
+        if changed is None:
+            self.answer_cache.clear()
+        else:
+            for document_id in changed:
+                self.answer_cache.invalidate_document(document_id)
+        self._cache_generation = generation
+
+    def _resolve_document(self, document_id: str | None) -> str | None:
+        if document_id is not None and self.registry is not None:
+            # Renamed duplicates are stored once; map the alias back to the ingested document.
+            return self.registry.resolve(document_id) or document_id
+        return document_id
+
+    async def _embed_question(self, question: str) -> np.ndarray | None:
+        return await self.query_embedder(question) if self.query_embedder is not None else None
+
+    async def _retrieve(
+        self, question: str, *, document_id: str | None, query_embedding: np.ndarray | None
+    ) -> list[DocumentChunk]:
+        # The stores only search the requested document, so top_k is never spent on other documents.
+        where = {"document_id": document_id} if document_id is not None else None
+        if self.lexical_index is None:
+            results = await self._dense_search(question, limit=self.top_k, where=where, embedding=query_embedding)
+            return [result.chunk for result in results]
+
+        # Both legs run concurrently, so hybrid latency is the slower leg rather than the sum.
+        embedding_pool = self.executors.embedding if self.executors else None
+        candidates = self.top_k * 2
+        dense, lexical = await asyncio.gather(
+            self._dense_search(question, limit=candidates, where=where, embedding=query_embedding),
+            run_in_pool(embedding_pool, self.lexical_index.search, question, limit=candidates, where=where),
+        )
+        fused = reciprocal_rank_fusion([dense, lexical], limit=self.top_k, k=self.fusion_k)
+        return [result.chunk for result in fused]
+
+    async def _dense_search(
+        self, question: str, *, limit: int, where: dict[str, str] | None, embedding: np.ndarray | None
+    ) -> list[QueryResult]:
+        embedding_pool = self.executors.embedding if self.executors else None
+        # Without a precomputed embedding the store embeds the question, so retrieval runs on the embedding pool.
+        return await run_in_pool(
+            embedding_pool,
+            self.vector_store.query,
+            question,
+            limit=limit,
+            where=where,
+            embedding=embedding,
+        )
+
+
+async def _replay(answer: str) -> AsyncIterator[str]:
+    yield answer
+
 
-        return ChatResult(answer=answer, source=source, context=context_chunks)
+def _source_of(context_chunks: Sequence[DocumentChunk]) -> str | None:
+    if context_chunks and context_chunks[0].metadata:
+        return context_chunks[0].metadata.get("filename") or context_chunks[0].metadata.get("document_id")
+    return None
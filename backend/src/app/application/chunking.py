@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import bisect
+import re
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+from app.domain import Chunker, ExtractedPage, TextChunk
+
+# A sentence runs to terminal punctuation followed by whitespace, a blank line, or the end of the text.
+_SENTENCE = re.compile(r"\S.*?(?:[.!?]+[\"')\]]*(?=\s)|\n[ \t]*\n|$)", re.S)
+_WORD = re.compile(r"\S+")
+_TERMINATORS = tuple(".!?\"')]")
+# Text without sentence punctuation (tables, some OCR output) is not carried across pages forever.
+_MAX_TAIL_CHARS = 2000
+
+
+def iter_chunks(chunker: Chunker, pages: Iterable[ExtractedPage]) -> Iterator[TextChunk]:
+    """Run ``chunker`` over already-available pages."""
+    session = chunker.session()
+    for page in pages:
+        yield from session.feed(page)
+    yield from session.flush()
+
+
+class _PageSpans:
+    """Maps document character offsets back to the page they came from."""
+
+    def __init__(self) -> None:
+        self._starts: list[int] = []
+        self._numbers: list[int] = []
+
+    def add(self, offset: int, number: int) -> None:
+        self._starts.append(offset)
+        self._numbers.append(number)
+
+    def page_at(self, offset: int) -> int:
+        index = bisect.bisect_right(self._starts, offset) - 1
+        return self._numbers[max(index, 0)] if self._numbers else 0
+
+
+class CharacterChunker:
+    """Fixed-size character windows; pages are joined with newlines like ``extract_text`` output."""
+
+    def __init__(self, chunk_size: int = 800, overlap: int = 100) -> None:
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+
+    @property
+    def fingerprint(self) -> str:
+        return f"chars:size={self.chunk_size}:overlap={self.overlap}"
+
+    def session(self) -> _CharacterSession:
+        return _CharacterSession(self.chunk_size, self.overlap)
+
+
+class _CharacterSession:
+    def __init__(self, chunk_size: int, overlap: int) -> None:
+        self.chunk_size = chunk_size
+        # Ensure forward progress even if overlap is accidentally large
+        self.step = max(chunk_size - overlap, 1)
+        self._buffer = ""
+        self._buffer_start = 0
+        self._started = False
+        self._pages = _PageSpans()
+
+    def feed(self, page: ExtractedPage) -> list[TextChunk]:
+        if self._started:
+            self._buffer += "\n"
+        self._started = True
+        self._pages.add(self._buffer_start + len(self._buffer), page.number)
+        self._buffer += page.text
+        chunks: list[TextChunk] = []
+        # Only emit windows that cannot grow any further with later pages.
+        while len(self._buffer) > self.chunk_size:
+            chunk = self._chunk(self._buffer[: self.chunk_size], self._buffer_start)
+            if chunk is not None:
+                chunks.append(chunk)
+            self._buffer = self._buffer[self.step :]
+            self._buffer_start += self.step
+        return chunks
+
+    def flush(self) -> list[TextChunk]:
+        chunk = self._chunk(self._buffer, self._buffer_start)
+        self._buffer = ""
+        return [chunk] if chunk is not None else []
+
+    def _chunk(self, raw: str, offset: int) -> TextChunk | None:
+        text = raw.strip()
+        if not text:
+            return None
+        start = offset + len(raw) - len(raw.lstrip())
+        end = start + len(text)
+        return TextChunk(
+            text=text,
+            page_start=self._pages.page_at(start),
+            page_end=self._pages.page_at(end - 1),
+            char_start=start,
+            char_end=end,
+        )
+
+
+@dataclass
+class _Sentence:
+    text: str
+    start: int
+    end: int
+    tokens: int
+    paragraph_end: bool = False
+
+
+class SentenceChunker:
+    """
+    Packs whole sentences into chunks of at most ``max_tokens`` tokens.
+
+    Notes:
+    - ``count_tokens`` should be the embedding model's tokenizer, so chunks are never truncated
+      by the encoder.
+    - A chunk closes early at a paragraph break once it is ``paragraph_fill`` full; otherwise the
+      next chunk repeats up to ``overlap_tokens`` worth of trailing sentences.
+    - Sentences longer than ``max_tokens`` are split between words.
+    - A sentence that runs across a page break is held back until the next page arrives.
+    """
+
+    def __init__(
+        self,
+        count_tokens: Callable[[str], int],
+        *,
+        max_tokens: int = 254,
+        overlap_tokens: int = 32,
+        paragraph_fill: float = 0.75,
+    ) -> None:
+        self.count_tokens = count_tokens
+        self.max_tokens = max(max_tokens, 1)
+        self.overlap_tokens = min(max(overlap_tokens, 0), self.max_tokens // 2)
+        self.paragraph_fill = paragraph_fill
+
+    @property
+    def fingerprint(self) -> str:
+        return f"sentences:max_tokens={self.max_tokens}:overlap={self.overlap_tokens}:fill={self.paragraph_fill}"
+
+    def session(self) -> _SentenceSession:
+        return _SentenceSession(self)
+
+
+class _SentenceSession:
+    def __init__(self, chunker: SentenceChunker) -> None:
+        self.chunker = chunker
+        self._pages = _PageSpans()
+        self._length = 0
+        self._started = False
+        # Unfinished last sentence of the previous page: (document offset, raw text).
+        self._tail: tuple[int, str] | None = None
+        self._pending: list[_Sentence] = []
+        self._pending_tokens = 0
+
+    def feed(self, page: ExtractedPage) -> list[TextChunk]:
+        page_offset = self._length + 1 if self._started else 0
+        self._pages.add(page_offset, page.number)
+        if self._tail is not None:
+            base, text = self._tail[0], f"{self._tail[1]}\n{page.text}"
+        else:
+            base, text = page_offset, page.text
+        self._length = page_offset + len(page.text)
+        self._started = True
+        self._tail = None
+
+        sentences: list[_Sentence] = []
+        for match in _SENTENCE.finditer(text):
+            raw = match.group().rstrip()
+            paragraph_end = match.group().endswith("\n")
+            unfinished = not paragraph_end and not raw.endswith(_TERMINATORS) and len(raw) < _MAX_TAIL_CHARS
+            if match.end() == len(text) and unfinished:
+                self._tail = (base + match.start(), text[match.start() :])
+                break
+            sentences.extend(self._sentences(raw, base + match.start(), paragraph_end=paragraph_end))
+        return self._pack(sentences)
+
+    def flush(self) -> list[TextChunk]:
+        sentences: list[_Sentence] = []
+        if self._tail is not None:
+            offset, text = self._tail
+            self._tail = None
+            stripped = text.rstrip()
+            if stripped:
+                sentences = self._sentences(stripped, offset, paragraph_end=True)
+        chunks = self._pack(sentences)
+        if self._pending:
+            chunks.append(self._chunk(self._pending))
+            self._pending, self._pending_tokens = [], 0
+        return chunks
+
+    def _sentences(self, raw: str, offset: int, *, paragraph_end: bool) -> list[_Sentence]:
+        text = " ".join(raw.split())
+        tokens = self.chunker.count_tokens(text)
+        if tokens <= self.chunker.max_tokens:
+            return [_Sentence(text, offset, offset + len(raw), tokens, paragraph_end)]
+
+        # Too long for one chunk: split between words, using per-word token counts.
+        pieces: list[_Sentence] = []
+        words: list[re.Match[str]] = []
+        piece_tokens = 0
+        for word in _WORD.finditer(raw):
+            word_tokens = self.chunker.count_tokens(word.group())
+            if words and piece_tokens + word_tokens > self.chunker.max_tokens:
+                pieces.append(self._piece(words, offset, piece_tokens))
+                words, piece_tokens = [], 0
+            words.append(word)
+            piece_tokens += word_tokens
+        if words:
+            pieces.append(self._piece(words, offset, piece_tokens))
+        pieces[-1].paragraph_end = paragraph_end
+        return pieces
+
+    @staticmethod
+    def _piece(words: list[re.Match[str]], offset: int, tokens: int) -> _Sentence:
+        return _Sentence(
+            text=" ".join(word.group() for word in words),
+            start=offset + words[0].start(),
+            end=offset + words[-1].end(),
+            tokens=tokens,
+        )
+
+    def _pack(self, sentences: list[_Sentence]) -> list[TextChunk]:
+        chunks: list[TextChunk] = []
+        max_tokens = self.chunker.max_tokens
+        for sentence in sentences:
+            if self._pending and self._pending_tokens + sentence.tokens > max_tokens:
+                chunks.append(self._chunk(self._pending))
+                self._keep_overlap(room_for=sentence.tokens)
+            elif self._pending and self._pending[-1].paragraph_end and (
+                self._pending_tokens >= max_tokens * self.chunker.paragraph_fill
+            ):
+                chunks.append(self._chunk(self._pending))
+                self._pending, self._pending_tokens = [], 0
+            self._pending.append(sentence)
+            self._pending_tokens += sentence.tokens
+        return chunks
+
+    def _keep_overlap(self, *, room_for: int) -> None:
+        budget = min(self.chunker.overlap_tokens, self.chunker.max_tokens - room_for)
+        kept: list[_Sentence] = []
+        kept_tokens = 0
+        for sentence in reversed(self._pending[1:]):
+            if kept_tokens + sentence.tokens > budget:
+                break
+            kept.insert(0, sentence)
+            kept_tokens += sentence.tokens
+        self._pending, self._pending_tokens = kept, kept_tokens
+
+    def _chunk(self, sentences: list[_Sentence]) -> TextChunk:
+        parts: list[str] = []
+        for index, sentence in enumerate(sentences):
+            if index:
+                parts.append("\n\n" if sentences[index - 1].paragraph_end else " ")
+            parts.append(sentence.text)
+        start, end = sentences[0].start, sentences[-1].end
+        return TextChunk(
+            text="".join(parts),
+            page_start=self._pages.page_at(start),
+            page_end=self._pages.page_at(end - 1),
+            char_start=start,
+            char_end=end,
+        )
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from pathlib import Path
+from typing import BinaryIO
+
+from app.application.spooling import spool_to_disk
+from app.application.upload_document import UploadDocumentUseCase, UploadProgress, UploadResult
+from app.domain import IngestionJob, JobStore
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionJobQueue:
+    """
+    Accepts uploads immediately and ingests them in the background.
+
+    Payloads are streamed to ``spool_dir`` (rejecting those over ``max_upload_bytes``) and jobs are
+    persisted in ``store``, so queued work (and work interrupted by a restart) resumes when the
+    application starts again. ``workers`` jobs run concurrently; each reports per-stage progress back
+    to the store.
+
+    Claimed jobs are leased for ``lease_seconds`` and renewed every third of that while they run.
+    Several processes can share one store: each only takes back jobs whose lease has run out.
+    """
+
+    def __init__(
+        self,
+        *,
+        use_case: UploadDocumentUseCase,
+        store: JobStore,
+        spool_dir: str,
+        workers: int = 1,
+        poll_interval: float = 1.0,
+        max_upload_bytes: int | None = None,
+        lease_seconds: float = 60.0,
+    ) -> None:
+        self.use_case = use_case
+        self.store = store
+        self.spool_dir = Path(spool_dir)
+        self.workers = max(workers, 1)
+        self.poll_interval = poll_interval
+        self.max_upload_bytes = max_upload_bytes
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._wakeup = asyncio.Event()
+        self._worker_tasks: list[asyncio.Task[None]] = []
+        self._running: dict[str, asyncio.Task[UploadResult]] = {}
+        self._closing = False
+
+    async def start(self) -> None:
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        await self._requeue_expired()
+        loop = asyncio.get_running_loop()
+        self._worker_tasks = [
+            loop.create_task(self._work(), name=f"ingestion-worker-{index}") for index in range(self.workers)
+        ]
+        self._worker_tasks.append(loop.create_task(self._heartbeat(), name="ingestion-heartbeat"))
+
+    async def submit(self, *, filename: str, source: BinaryIO) -> IngestionJob:
+        """Spool ``source`` and queue it; raises ``UploadTooLargeError`` past ``max_upload_bytes``."""
+        job_id = uuid.uuid4().hex
+        spooled = await asyncio.to_thread(
+            spool_to_disk, source, self.spool_dir / f"{job_id}.upload", max_bytes=self.max_upload_bytes
+        )
+        job = await asyncio.to_thread(
+            self.store.create,
+            IngestionJob(id=job_id, filename=filename, payload_path=spooled.path, content_digest=spooled.sha256),
+        )
+        self._wakeup.set()
+        logger.info("Queued ingestion job %s for filename=%s (%d bytes)", job_id, filename, spooled.size)
+        return job
+
+    async def get(self, job_id: str) -> IngestionJob | None:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def cancel(self, job_id: str) -> IngestionJob | None:
+        job = await asyncio.to_thread(self.store.request_cancel, job_id)
+        if job is None:
+            return None
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        elif job.status == "cancelled":
+            await asyncio.to_thread(_remove, job.payload_path)
+        return job
+
+    async def close(self) -> None:
+        self._closing = True
+        for task in [*self._running.values(), *self._worker_tasks]:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    async def _work(self) -> None:
+        while not self._closing:
+            job = await asyncio.to_thread(self.store.claim_next, self.owner)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _heartbeat(self) -> None:
+        while not self._closing:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await asyncio.to_thread(self.store.renew_leases, self.owner)
+                await self._requeue_expired()
+            except Exception:  # noqa: BLE001 - retried on the next beat
+                logger.exception("Could not renew ingestion job leases")
+
+    async def _requeue_expired(self) -> None:
+        resumed = await asyncio.to_thread(self.store.requeue_interrupted)
+        if resumed:
+            logger.info("Re-queued %d ingestion jobs whose worker stopped renewing its lease", resumed)
+            self._wakeup.set()
+
+    async def _run(self, job: IngestionJob) -> None:
+        logger.info("Starting ingestion job %s for filename=%s (attempt %d)", job.id, job.filename, job.attempts)
+        task = asyncio.get_running_loop().create_task(self._ingest(job))
+        self._running[job.id] = task
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                # The worker itself is being cancelled (shutdown); stop the ingestion too.
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            if self._closing:
+                # Interrupted by shutdown: run it again on the next start.
+                await asyncio.to_thread(self.store.requeue, job.id)
+                raise
+            await asyncio.to_thread(self.store.finish, job.id, status="cancelled")
+            logger.info("Cancelled ingestion job %s", job.id)
+        except Exception as exc:  # noqa: BLE001 - recorded on the job
+            logger.exception("Ingestion job %s failed", job.id)
+            await asyncio.to_thread(self.store.finish, job.id, status="failed", error=str(exc) or type(exc).__name__)
+        else:
+            await asyncio.to_thread(
+                self.store.finish,
+                job.id,
+                status="succeeded",
+                document_id=result.document_id,
+                duplicate=result.duplicate,
+            )
+            logger.info("Finished ingestion job %s: document_id=%s", job.id, result.document_id)
+        finally:
+            self._running.pop(job.id, None)
+        await asyncio.to_thread(_remove, job.payload_path)
+
+    async def _ingest(self, job: IngestionJob) -> UploadResult:
+        current = asyncio.current_task()
+
+        async def on_progress(progress: UploadProgress) -> None:
+            cancel_requested = await asyncio.to_thread(
+                self.store.update_progress,
+                job.id,
+                stage=progress.stage,
+                pages_extracted=progress.pages_extracted,
+                chunks_embedded=progress.chunks_embedded,
+                chunks_stored=progress.chunks_stored,
+            )
+            # Cancellation may have been requested through another process sharing the store.
+            if cancel_requested and current is not None:
+                current.cancel()
+
+        return await self.use_case.embed_and_store(
+            filename=job.filename,
+            source=job.payload_path,
+            digest=job.content_digest,
+            on_progress=on_progress,
+            retry=job.attempts > 1,
+        )
+
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
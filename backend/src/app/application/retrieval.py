@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from app.domain import QueryResult
+
+
+def reciprocal_rank_fusion(
+    result_lists: Sequence[Sequence[QueryResult]], *, limit: int, k: int = 60
+) -> list[QueryResult]:
+    """
+    Merge ranked lists by summing ``1 / (k + rank)`` per chunk id.
+
+    Only ranks matter, so dense distances and BM25 scores can be fused without calibration.
+    The returned scores are the fused RRF scores (higher is better).
+    """
+    fused: dict[str, float] = {}
+    first_seen: dict[str, QueryResult] = {}
+    for results in result_lists:
+        for rank, result in enumerate(results, start=1):
+            chunk_id = result.chunk.id
+            fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (k + rank)
+            first_seen.setdefault(chunk_id, result)
+    ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [QueryResult(chunk=first_seen[chunk_id].chunk, score=score) for chunk_id, score in ranked]
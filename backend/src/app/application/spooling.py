@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from app.domain import DocumentSource
+
+_BLOCK_BYTES = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+
+    def __init__(self, limit_bytes: int) -> None:
+        super().__init__(f"Upload exceeds the size limit of {limit_bytes} bytes.")
+        self.limit_bytes = limit_bytes
+
+
+@dataclass
+class SpooledFile:
+    path: str
+    size: int
+    sha256: str
+
+
+def spool_to_disk(source: BinaryIO, target: str | os.PathLike[str], *, max_bytes: int | None = None) -> SpooledFile:
+    """
+    Copy ``source`` to ``target`` in fixed-size blocks, hashing it on the way.
+
+    Memory use is one block regardless of the upload size. The file is written next to ``target`` and
+    renamed into place, so ``target`` never holds a truncated copy; nothing is left behind when the
+    copy fails or exceeds ``max_bytes``.
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            while block := source.read(_BLOCK_BYTES):
+                size += len(block)
+                if max_bytes is not None and size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                digest.update(block)
+                handle.write(block)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return SpooledFile(path=str(target), size=size, sha256=digest.hexdigest())
+
+
+def sha256_of(source: DocumentSource) -> str:
+    """SHA-256 of a document's bytes, reading paths and file objects block by block."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(source).hexdigest()
+    digest = hashlib.sha256()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as handle:
+            while block := handle.read(_BLOCK_BYTES):
+                digest.update(block)
+        return digest.hexdigest()
+    start = source.tell()
+    while block := source.read(_BLOCK_BYTES):
+        digest.update(block)
+    # Extraction reads the same file object next.
+    source.seek(start)
+    return digest.hexdigest()
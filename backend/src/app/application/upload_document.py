@@ -1,13 +1,109 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
-from typing import Iterable
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable
 
-from app.domain import DocumentChunk, EmbeddingService, TextExtractorService, VectorStore
+import numpy as np
+
+from app.application.chunking import CharacterChunker, iter_chunks
+from app.application.spooling import sha256_of
+from app.core.executors import ExecutorPools, run_in_pool, stream_in_pool
+from app.domain import (
+    AnswerCache,
+    Chunker,
+    DocumentChunk,
+    DocumentSource,
+    EmbeddingService,
+    ExtractedPage,
+    IngestionRecord,
+    IngestionRegistry,
+    LexicalIndex,
+    TextChunk,
+    TextExtractorService,
+    VectorStore,
+)
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class UploadResult:
+    document_id: str
+    duplicate: bool = False
+    chunk_count: int = 0
+
+
+@dataclass
+class UploadProgress:
+    stage: str = "extracting"
+    pages_extracted: int = 0
+    chunks_embedded: int = 0
+    chunks_stored: int = 0
+
+
+ProgressCallback = Callable[[UploadProgress], Awaitable[None]]
+
+
+@dataclass
+class PreparedUpload:
+    """An upload that passed the duplicate check and is being ingested."""
+
+    document_id: str
+    filename: str
+    source: DocumentSource
+    content_key: str
+    replacing: bool = False
+    # Document the filename pointed at before; released once the new version is recorded.
+    superseded: str | None = None
+    progress: UploadProgress = field(default_factory=UploadProgress)
+    extraction_paths: Counter[str] = field(default_factory=Counter)
+    # Whether the upload still holds its filename's lock (released by ``complete`` or ``abort``).
+    holds_name: bool = field(default=True, repr=False)
+
+
+@dataclass
+class ChunkBatch:
+    upload: PreparedUpload
+    chunks: list[TextChunk]
+    # Index of the first chunk within the document (chunk ids are ``<document_id>::chunk-<index>``).
+    offset: int
+    embeddings: np.ndarray | None = None
+
+
+class _NameLocks:
+    """Per-filename asyncio locks, dropped again once nobody holds or waits for them."""
+
+    def __init__(self) -> None:
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._users: Counter[str] = Counter()
+
+    async def acquire(self, name: str) -> None:
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        self._users[name] += 1
+        try:
+            await lock.acquire()
+        except BaseException:
+            self._forget(name)
+            raise
+
+    def release(self, name: str) -> None:
+        self._locks[name].release()
+        self._forget(name)
+
+    def _forget(self, name: str) -> None:
+        self._users[name] -= 1
+        if not self._users[name]:
+            del self._users[name], self._locks[name]
+
+
+def _fingerprint(component: object) -> str:
+    return getattr(component, "fingerprint", None) or type(component).__qualname__
+
+
 class UploadDocumentUseCase:
     """Use case: extract text from an uploaded document, chunk it, and store embeddings."""
 
@@ -19,74 +115,285 @@ class UploadDocumentUseCase:
         vector_store: VectorStore,
         chunk_size: int = 800,
         overlap: int = 100,
+        embed_batch_size: int = 64,
+        chunker: Chunker | None = None,
+        registry: IngestionRegistry | None = None,
+        lexical_index: LexicalIndex | None = None,
+        answer_cache: AnswerCache | None = None,
+        executors: ExecutorPools | None = None,
     ) -> None:
         self.text_extractor = text_extractor
         self.embedder = embedder
         self.vector_store = vector_store
         self.chunk_size = chunk_size
         self.overlap = overlap
+        self.chunker = chunker or CharacterChunker(chunk_size, overlap)
+        self.embed_batch_size = max(embed_batch_size, 1)
+        self.registry = registry
+        self.lexical_index = lexical_index
+        self.answer_cache = answer_cache
+        self.executors = executors
+        self._names = _NameLocks()
+
+    @property
+    def pipeline_fingerprint(self) -> str:
+        """Everything besides the bytes that determines what ends up in the vector store."""
+        return "|".join(
+            (
+                _fingerprint(self.text_extractor),
+                _fingerprint(self.chunker),
+                _fingerprint(self.embedder),
+            )
+        )
 
-    def chunk_text(self, text: str) -> Iterable[str]:
+    def content_key(self, digest: str) -> str:
+        """Registry key for a document whose bytes have SHA-256 ``digest``."""
+        return hashlib.sha256(f"{digest}|{self.pipeline_fingerprint}".encode()).hexdigest()
+
+    def chunk_text(self, text: str) -> list[str]:
         if not text:
             return []
-        chunks: list[str] = []
-        length = len(text)
-        start = 0
-        # Ensure forward progress even if overlap is accidentally large
-        step = max(self.chunk_size - self.overlap, 1)
-
-        while start < length:
-            end = min(start + self.chunk_size, length)
-            chunks.append(text[start:end].strip())
-            if end == length:
-                break
-            start += step
-        return [c for c in chunks if c]
-
-    def embed_and_store(
+        return [chunk.text for chunk in iter_chunks(self.chunker, [ExtractedPage(number=1, text=text)])]
+
+    async def embed_and_store(
         self,
         *,
         filename: str,
-        data: bytes,
-    ) -> str:
-        logger.info("Starting upload pipeline for filename=%s", filename)
+        source: DocumentSource,
+        digest: str | None = None,
+        on_progress: ProgressCallback | None = None,
+        retry: bool = False,
+    ) -> UploadResult:
+        """
+        Ingest ``source`` under ``filename``.
 
-        text = self.text_extractor.extract_text(data)
-        if not text:
-            logger.warning("No text extracted for filename=%s; skipping.", filename)
-            return filename
+        Pass a path for large documents so they are never loaded into memory, plus its SHA-256
+        ``digest`` when already known (e.g. computed while spooling). ``on_progress`` is awaited after
+        every page and stored batch. Set ``retry`` when re-running an interrupted ingestion so chunks
+        left by the earlier attempt are dropped first.
+        """
+        upload = await self.prepare(filename=filename, source=source, digest=digest, retry=retry)
+        if isinstance(upload, UploadResult):
+            return upload
+
+        try:
+            async for batch in self.iter_batches(upload, on_progress=on_progress):
+                await _report(upload, "embedding", on_progress)
+                await self.embed_batch(batch)
+                await self.store_batch(batch)
+                await _report(upload, "extracting", on_progress)
+        except (Exception, asyncio.CancelledError):
+            await self.abort(upload)
+            raise
+        await _report(upload, "finalizing", on_progress)
+        return await self.complete(upload)
 
-        chunks = list(self.chunk_text(text))
-        if not chunks:
-            logger.warning("No chunks generated for filename=%s; skipping.", filename)
-            return filename
+    # The stages below are what ``embed_and_store`` runs in sequence; the bulk pipeline runs them
+    # concurrently across documents.
 
-        logger.info("Generated %d chunks for filename=%s", len(chunks), filename)
+    async def prepare(
+        self, *, filename: str, source: DocumentSource, digest: str | None = None, retry: bool = False
+    ) -> PreparedUpload | UploadResult:
+        """
+        Check the registry; returns the existing document's result for duplicate content.
 
-        embeddings = self.embedder.embed(chunks)
-        logger.info("Computed embeddings for %d chunks for filename=%s", len(embeddings), filename)
+        Uploads of the same filename (job queue and bulk runs alike) would write the same chunk ids, so
+        they run one at a time: a returned ``PreparedUpload`` holds the name until ``complete`` or ``abort``.
+        """
+        await self._names.acquire(filename)
+        try:
+            prepared = await self._prepare(filename=filename, source=source, digest=digest, retry=retry)
+        except BaseException:
+            self._names.release(filename)
+            raise
+        if isinstance(prepared, UploadResult):
+            self._names.release(filename)
+        return prepared
 
+    async def _prepare(
+        self, *, filename: str, source: DocumentSource, digest: str | None, retry: bool
+    ) -> PreparedUpload | UploadResult:
+        logger.info("Starting upload pipeline for filename=%s", filename)
         doc_id = filename
-        chunk_models: list[DocumentChunk] = []
-        if len(embeddings) < len(chunks):
+        content_key = self.content_key(digest or await asyncio.to_thread(sha256_of, source))
+        replacing = retry
+        superseded = None
+        if self.registry is not None:
+            current = self.registry.resolve(filename)
+            existing = self.registry.find_by_content(content_key)
+            if existing is not None:
+                if current != existing.document_id:
+                    self.registry.add_alias(filename, existing.document_id)
+                    await self._release(current)
+                logger.info(
+                    "Content already ingested as document_id=%s; aliasing filename=%s without re-embedding.",
+                    existing.document_id,
+                    filename,
+                )
+                return UploadResult(document_id=existing.document_id, duplicate=True, chunk_count=existing.chunk_count)
+            if any(name != filename for name in self.registry.referrers(filename)):
+                # Renamed duplicates still serve the content stored under this name, so the new
+                # version gets its own id and the old one stays until nothing refers to it.
+                doc_id = f"{filename}@{content_key[:12]}"
+            else:
+                # Same name, new content: drop the previous version's chunks before re-ingesting.
+                replacing = replacing or current == doc_id
+            if current is not None and current != doc_id:
+                superseded = current
+        if replacing:
+            await self._discard(doc_id)
+        return PreparedUpload(
+            document_id=doc_id,
+            filename=filename,
+            source=source,
+            content_key=content_key,
+            replacing=replacing,
+            superseded=superseded,
+        )
+
+    async def iter_batches(
+        self, upload: PreparedUpload, *, on_progress: ProgressCallback | None = None
+    ) -> AsyncIterator[ChunkBatch]:
+        """Extract and chunk pages as they stream in, yielding full batches while OCR continues."""
+        ocr_pool = self.executors.ocr if self.executors else None
+        # Chunking tokenizes every page with the embedding model's tokenizer; keep it off the event loop.
+        chunk_pool = self.executors.embedding if self.executors else None
+        session = self.chunker.session()
+        pending: list[TextChunk] = []
+        emitted = 0
+
+        async for page in stream_in_pool(ocr_pool, self.text_extractor.iter_pages, upload.source):
+            upload.progress.pages_extracted += 1
+            upload.extraction_paths[(page.metadata or {}).get("extraction", "unknown")] += 1
+            pending.extend(await run_in_pool(chunk_pool, session.feed, page))
+            await _report(upload, "extracting", on_progress)
+            while len(pending) >= self.embed_batch_size:
+                batch, pending = pending[: self.embed_batch_size], pending[self.embed_batch_size :]
+                yield ChunkBatch(upload=upload, chunks=batch, offset=emitted)
+                emitted += len(batch)
+        pending.extend(await run_in_pool(chunk_pool, session.flush))
+        if pending:
+            yield ChunkBatch(upload=upload, chunks=pending, offset=emitted)
+
+    async def embed_batch(self, batch: ChunkBatch) -> ChunkBatch:
+        embedding_pool = self.executors.embedding if self.executors else None
+        batch.embeddings = await run_in_pool(embedding_pool, self.embedder.embed, [chunk.text for chunk in batch.chunks])
+        batch.upload.progress.chunks_embedded += len(batch.chunks)
+        logger.info("Computed embeddings for %d chunks for filename=%s", len(batch.embeddings), batch.upload.filename)
+        return batch
+
+    async def store_batch(self, batch: ChunkBatch) -> int:
+        embedding_pool = self.executors.embedding if self.executors else None
+        upload = batch.upload
+        embeddings = batch.embeddings
+        if embeddings is None or len(embeddings) < len(batch.chunks):
             logger.error(
                 "Embedding count %d is less than chunk count %d for filename=%s; aborting store.",
-                len(embeddings),
-                len(chunks),
-                filename,
+                0 if embeddings is None else len(embeddings),
+                len(batch.chunks),
+                upload.filename,
             )
-            return doc_id
+            return 0
 
-        for idx, chunk in enumerate(chunks):
+        chunk_models: list[DocumentChunk] = []
+        for idx, chunk in enumerate(batch.chunks, start=batch.offset):
             chunk_models.append(
                 DocumentChunk(
-                    id=f"{doc_id}::chunk-{idx}",
-                    content=chunk,
-                    metadata={"filename": filename, "chunk": str(idx)},
-                    embedding=list(embeddings[idx]),
+                    id=f"{upload.document_id}::chunk-{idx}",
+                    content=chunk.text,
+                    metadata={
+                        "filename": upload.filename,
+                        "document_id": upload.document_id,
+                        "chunk": str(idx),
+                        "page_start": str(chunk.page_start),
+                        "page_end": str(chunk.page_end),
+                        "char_start": str(chunk.char_start),
+                        "char_end": str(chunk.char_end),
+                    },
+                    embedding=embeddings[idx - batch.offset],
+                )
+            )
+
+        await run_in_pool(embedding_pool, self.vector_store.add_documents, chunk_models)
+        if self.lexical_index is not None:
+            await run_in_pool(embedding_pool, self.lexical_index.add, chunk_models)
+        upload.progress.chunks_stored += len(chunk_models)
+        return len(chunk_models)
+
+    async def complete(self, upload: PreparedUpload) -> UploadResult:
+        try:
+            return await self._complete(upload)
+        finally:
+            self._release_name(upload)
+
+    async def _complete(self, upload: PreparedUpload) -> UploadResult:
+        doc_id = upload.document_id
+        stored = upload.progress.chunks_stored
+        if self.answer_cache is not None:
+            # Cached answers may quote the previous version of this document or miss the new one.
+            self.answer_cache.invalidate_document(doc_id)
+
+        if not stored:
+            logger.warning(
+                "No chunks generated for filename=%s (%d pages); skipping.", upload.filename, upload.progress.pages_extracted
+            )
+            if upload.replacing and self.registry is not None:
+                # The previous version's chunks were discarded in ``prepare``.
+                self.registry.remove(doc_id)
+            return UploadResult(document_id=doc_id)
+
+        if self.registry is not None:
+            self.registry.record(
+                IngestionRecord(
+                    content_key=upload.content_key, document_id=doc_id, filename=upload.filename, chunk_count=stored
                 )
             )
+            await self._release(upload.superseded)
+
+        logger.info(
+            "Stored %d chunks from %d pages for filename=%s (extraction paths: %s)",
+            stored,
+            upload.progress.pages_extracted,
+            upload.filename,
+            dict(upload.extraction_paths),
+        )
+        return UploadResult(document_id=doc_id, chunk_count=stored)
+
+    async def abort(self, upload: PreparedUpload) -> None:
+        """Undo a failed or cancelled ingestion so no partial document is left behind."""
+        logger.info(
+            "Ingestion of filename=%s stopped; discarding %d stored chunks.", upload.filename, upload.progress.chunks_stored
+        )
+        try:
+            await self._discard(upload.document_id)
+            if upload.replacing and self.registry is not None:
+                self.registry.remove(upload.document_id)
+        finally:
+            self._release_name(upload)
+
+    def _release_name(self, upload: PreparedUpload) -> None:
+        if upload.holds_name:
+            upload.holds_name = False
+            self._names.release(upload.filename)
+
+    async def _release(self, doc_id: str | None) -> None:
+        """Delete a document that no filename or alias resolves to any more."""
+        if doc_id is None or self.registry is None or self.registry.referrers(doc_id):
+            return
+        logger.info("No name refers to document_id=%s any more; deleting its chunks.", doc_id)
+        await self._discard(doc_id)
+        self.registry.remove(doc_id)
+        if self.answer_cache is not None:
+            self.answer_cache.invalidate_document(doc_id)
+
+    async def _discard(self, doc_id: str) -> None:
+        embedding_pool = self.executors.embedding if self.executors else None
+        await run_in_pool(embedding_pool, self.vector_store.delete_document, doc_id)
+        if self.lexical_index is not None:
+            await run_in_pool(embedding_pool, self.lexical_index.delete_document, doc_id)
+
 
-        self.vector_store.add_documents(chunk_models)
-        logger.info("Stored %d chunks for filename=%s", len(chunk_models), filename)
-        return doc_id
+async def _report(upload: PreparedUpload, stage: str, on_progress: ProgressCallback | None) -> None:
+    upload.progress.stage = stage
+    if on_progress is not None:
+        await on_progress(upload.progress)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import os
+
+from app.application.chunking import CharacterChunker, SentenceChunker
+from app.core.config import Settings
+from app.core.metrics import MetricsRegistry
+from app.domain import Chunker, RagService, TextExtractorService, VectorStore
+from app.infrastructure import (
+    ChromaVectorStore,
+    InstrumentedEmbeddingService,
+    InstrumentedRagService,
+    InstrumentedTextExtractor,
+    InstrumentedVectorStore,
+    LangChainRagService,
+    MmapVectorStore,
+    ModelServerClient,
+    OcrPageCache,
+    PdfTextLayerExtractor,
+    RemoteEmbeddingService,
+    RemoteRagService,
+    SentenceTransformerEmbeddingService,
+    SqliteBm25Index,
+    SqliteIngestionRegistry,
+    TesseractTextExtractor,
+)
+from app.infrastructure.inference import set_torch_threads
+
+
+def build_text_extractor(settings: Settings, metrics: MetricsRegistry | None = None) -> TextExtractorService:
+    ocr_extractor = TesseractTextExtractor(
+        dpi=settings.ocr_dpi,
+        lang=settings.ocr_lang,
+        workers=settings.ocr_workers,
+        pages_per_task=settings.ocr_pages_per_task,
+        cache=(
+            OcrPageCache(
+                os.path.join(settings.data_dir, "ocr-cache"),
+                max_bytes=settings.ocr_cache_max_mb * 1024 * 1024,
+            )
+            if settings.ocr_cache_enabled
+            else None
+        ),
+    )
+    extractor: TextExtractorService = ocr_extractor
+    if settings.text_layer_enabled:
+        extractor = PdfTextLayerExtractor(ocr=ocr_extractor, min_chars_per_page=settings.text_layer_min_chars)
+    return InstrumentedTextExtractor(extractor, metrics) if metrics is not None else extractor
+
+
+def build_embedding_service(
+    settings: Settings, metrics: MetricsRegistry | None = None, *, in_process: bool = False
+) -> SentenceTransformerEmbeddingService:
+    """Connects to ``KB_MODEL_SERVER_URL`` when set, unless ``in_process`` (the model server itself)."""
+    embedder: SentenceTransformerEmbeddingService | RemoteEmbeddingService
+    if settings.model_server_url and not in_process:
+        client = ModelServerClient(settings.model_server_url, timeout=settings.model_server_timeout_seconds)
+        embedder = RemoteEmbeddingService(client, ready_timeout=settings.model_server_timeout_seconds)
+    else:
+        _configure_torch_threads(settings)
+        embedder = SentenceTransformerEmbeddingService(
+            settings.embedding_model,
+            normalize=settings.embedding_normalize,
+            backend=settings.embedding_backend,
+            threads=settings.embedding_threads,
+            onnx_quantization=settings.onnx_quantization,
+            export_dir=onnx_export_dir(settings),
+        )
+    # The wrapper forwards max_tokens, count_tokens and fingerprint to the model service.
+    return InstrumentedEmbeddingService(embedder, metrics) if metrics is not None else embedder  # type: ignore[return-value]
+
+
+def build_vector_store(
+    settings: Settings, embedder: SentenceTransformerEmbeddingService, metrics: MetricsRegistry | None = None
+) -> VectorStore:
+    store: VectorStore
+    if settings.vector_backend == "mmap":
+        store = MmapVectorStore(
+            directory=os.path.join(settings.data_dir, "vectors", settings.chroma_collection_name),
+            embedder=embedder,
+            ivf_lists=settings.mmap_ivf_lists,
+            ivf_probe=settings.mmap_ivf_probe,
+            ivf_min_rows=settings.mmap_ivf_min_rows,
+            quantization=settings.mmap_quantization,
+            rerank_factor=settings.mmap_rerank_factor,
+        )
+    else:
+        store = ChromaVectorStore(
+            embedder=embedder,
+            host=settings.chroma_host,
+            port=settings.chroma_port,
+            collection_name=settings.chroma_collection_name,
+        )
+    return InstrumentedVectorStore(store, metrics) if metrics is not None else store
+
+
+def build_rag_service(
+    settings: Settings, metrics: MetricsRegistry | None = None, *, in_process: bool = False
+) -> RagService:
+    """Connects to ``KB_MODEL_SERVER_URL`` when set, unless ``in_process`` (the model server itself)."""
+    if settings.model_server_url and not in_process:
+        client = ModelServerClient(settings.model_server_url, timeout=settings.model_server_timeout_seconds)
+        remote = RemoteRagService(client, ready_timeout=settings.model_server_timeout_seconds)
+        return InstrumentedRagService(remote, metrics) if metrics is not None else remote
+    _configure_torch_threads(settings)
+    rag_service = LangChainRagService(
+        model_name=settings.rag_model_name,
+        max_new_tokens=settings.rag_max_new_tokens,
+        temperature=settings.rag_temperature,
+        max_batch_size=settings.rag_max_batch_size,
+        max_batch_wait_ms=settings.rag_max_batch_wait_ms,
+        context_max_tokens=settings.rag_context_max_tokens,
+        metrics=metrics,
+        backend=settings.rag_backend,
+        threads=settings.generation_threads,
+        export_dir=onnx_export_dir(settings),
+    )
+    return InstrumentedRagService(rag_service, metrics) if metrics is not None else rag_service
+
+
+def onnx_export_dir(settings: Settings) -> str:
+    return settings.onnx_export_dir or os.path.join(settings.data_dir, "onnx")
+
+
+def _configure_torch_threads(settings: Settings) -> None:
+    # One intra-op pool serves both models, so it is sized for the more demanding one.
+    threads = [count for count in (settings.embedding_threads, settings.generation_threads) if count]
+    if threads:
+        set_torch_threads(max(threads))
+
+
+def build_chunker(settings: Settings, embedder: SentenceTransformerEmbeddingService) -> Chunker:
+    if settings.chunker == "sentence":
+        return SentenceChunker(
+            embedder.count_tokens,
+            max_tokens=settings.chunk_max_tokens or embedder.max_tokens,
+            overlap_tokens=settings.chunk_overlap_tokens,
+        )
+    return CharacterChunker(chunk_size=800, overlap=100)
+
+
+def build_ingestion_registry(settings: Settings) -> SqliteIngestionRegistry:
+    return SqliteIngestionRegistry(
+        settings.ingestion_registry_path or os.path.join(settings.data_dir, "ingestion.sqlite3")
+    )
+
+
+def build_lexical_index(settings: Settings) -> SqliteBm25Index | None:
+    if not settings.hybrid_search_enabled:
+        return None
+    return SqliteBm25Index(settings.bm25_index_path or os.path.join(settings.data_dir, "bm25.sqlite3"))
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from fastapi import Request
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -13,17 +15,105 @@ class Settings(BaseSettings):
 
     # Storage / vector config
     data_dir: str = "./data"
+    ingestion_registry_path: str | None = None  # defaults to <data_dir>/ingestion.sqlite3
+    # Uploads are queued and ingested in the background (payloads spooled under <data_dir>/uploads)
+    job_store_path: str | None = None  # defaults to <data_dir>/jobs.sqlite3
+    ingestion_workers: int = 1
+    job_lease_seconds: float = 60.0
+    max_upload_mb: int = 512  # per uploaded file, single or bulk; larger uploads get 413
+    # Bulk uploads (POST /upload/bulk and the kb-bulk-ingest CLI) pipeline extraction, embedding and storage
+    bulk_extract_concurrency: int = 2  # documents extracted at once; keep within the OCR pool limits
+    bulk_embed_concurrency: int = 1
+    bulk_queue_size: int = 4  # chunk batches buffered between stages
+    vector_backend: Literal["chroma", "mmap"] = "chroma"
+    # In-process mmap backend (stored under <data_dir>/vectors/<collection>)
+    mmap_ivf_lists: int = 0  # 0 keeps exact search only
+    mmap_ivf_probe: int = 8
+    mmap_ivf_min_rows: int = 50_000
+    # Compact codes scanned before re-scoring limit * rerank_factor candidates at full precision
+    mmap_quantization: Literal["none", "int8", "binary"] = "none"
+    mmap_rerank_factor: int = 8
     chroma_host: str = "chroma"
     chroma_port: int = 8000
     chroma_collection_name: str = "documents"
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_normalize: bool = False
     rag_model_name: str = "microsoft/Phi-3-mini-4k-instruct"
+    # Out-of-process models: `kb-model-server` loads the embedding model and LLM once and batches requests
+    # from every API worker. Set the same URL (unix:///path/to.sock or http://127.0.0.1:8100) for both.
+    model_server_url: str | None = None  # unset: each API process loads its own models
+    model_server_timeout_seconds: float = 300.0  # per request, and for the server to finish loading
+    # Concurrent chat questions are embedded together in micro-batches
+    embedding_batching_enabled: bool = True
+    embedding_batch_max_size: int = 32
+    embedding_batch_max_wait_ms: float = 5.0
+    # Chunking: "sentence" packs whole sentences up to the embedding model's token limit,
+    # "characters" keeps the fixed 800/100 character windows
+    chunker: Literal["sentence", "characters"] = "sentence"
+    chunk_max_tokens: int | None = None  # defaults to the embedding model's max sequence length
+    chunk_overlap_tokens: int = 32
     rag_top_k: int = 5
+    # Hybrid retrieval: BM25 keyword hits are fused with dense hits by reciprocal rank
+    hybrid_search_enabled: bool = True
+    bm25_index_path: str | None = None  # defaults to <data_dir>/bm25.sqlite3
+    rrf_k: int = 60
+    # Answer cache in front of /chat; a similarity threshold > 0 also reuses answers for near-duplicate questions
+    answer_cache_enabled: bool = True
+    answer_cache_max_entries: int = 1024
+    answer_cache_max_mb: int = 64
+    answer_cache_ttl_seconds: float = 3600.0
+    answer_cache_similarity_threshold: float = 0.0
     rag_max_new_tokens: int = 256
     rag_temperature: float = 0.0
+    # Concurrent /chat prompts are decoded together in batches of up to this size (1 disables batching)
+    rag_max_batch_size: int = 8
+    rag_max_batch_wait_ms: float = 20.0
+    # Retrieved chunks are de-duplicated and packed into at most this many prompt tokens
+    rag_context_max_tokens: int = 2048
+
+    # OCR
+    ocr_dpi: int = 200
+    ocr_lang: str = "eng"
+    ocr_workers: int | None = None  # processes for page OCR; defaults to the CPU count
+    ocr_pages_per_task: int = 1
+    ocr_cache_enabled: bool = True
+    ocr_cache_max_mb: int = 256  # stored under <data_dir>/ocr-cache
+    # Use the PDF's embedded text layer and OCR only pages below this many non-whitespace chars
+    text_layer_enabled: bool = True
+    text_layer_min_chars: int = 64
+
+    # Execution pools (OCR may run in processes; model-backed stages share in-process weights)
+    ocr_pool_kind: Literal["thread", "process"] = "thread"
+    ocr_pool_workers: int = 2
+    ocr_pool_queue: int = 8
+    embedding_pool_workers: int = 2
+    embedding_pool_queue: int = 32
+    generation_pool_workers: int = 1
+    generation_pool_queue: int = 16
+
+    # CPU inference backends ("-int8": dynamically quantized linear layers; "onnx": ONNX Runtime, needs the
+    # [onnx] extra). Compare embeddings against fp32 with `kb-embedding-parity` before switching.
+    embedding_backend: Literal["torch", "torch-int8", "onnx", "onnx-int8"] = "torch"
+    rag_backend: Literal["torch", "torch-int8", "onnx"] = "torch"
+    onnx_quantization: Literal["avx2", "avx512", "avx512_vnni", "arm64"] = "avx2"  # int8 kernels for onnx-int8
+    onnx_export_dir: str | None = None  # exported models are cached here; defaults to <data_dir>/onnx
+    # Intra-op threads per model call; keep pool workers x threads within the cores. ONNX models get
+    # a pool each, PyTorch models share one per process (the larger of the two values)
+    embedding_threads: int | None = None
+    generation_threads: int | None = None
+
+    # Startup: models load concurrently in the background while /health and /ready already answer;
+    # GET /ready returns 503 until every component that is not lazy has loaded
+    preload_blocking: bool = False  # finish loading before accepting traffic (the old behaviour)
+    lazy_components: list[Literal["embedding", "vector_store", "generation"]] = []  # loaded on first use
+    model_warmup_enabled: bool = True  # run one small inference after loading each model
+    component_wait_seconds: float = 10.0  # how long a request waits for a loading component before 503
 
     # API / CORS
     cors_origins: list[str] = ["*"]
+    # Observability: GET /metrics (Prometheus text format) and optional Server-Timing response headers
+    metrics_enabled: bool = True
+    timing_headers_enabled: bool = False
 
 
 def get_settings() -> Settings:
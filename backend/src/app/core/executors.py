@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Iterable, Literal, TypeVar
+
+from app.core.config import Settings
+from app.core.metrics import LATENCY_BUCKETS, Histogram
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PoolKind = Literal["thread", "process"]
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when a pool already has as many tasks in flight as it is allowed to queue."""
+
+    def __init__(self, pool_name: str, limit: int) -> None:
+        super().__init__(f"Executor pool '{pool_name}' is saturated ({limit} tasks in flight).")
+        self.pool_name = pool_name
+        self.limit = limit
+
+
+class BoundedExecutor:
+    """
+    Thread or process pool with its own admission limit.
+
+    At most ``max_workers`` tasks run concurrently and at most ``max_queue`` more wait
+    for a worker. Further submissions fail fast with ``ExecutorSaturatedError`` instead
+    of piling up behind a slow stage. Thread pools run tasks in the caller's context
+    (so per-request timings follow the work) and record how long each task waited.
+    """
+
+    def __init__(self, name: str, *, max_workers: int, max_queue: int, kind: PoolKind = "thread") -> None:
+        if max_workers < 1:
+            raise ValueError(f"Executor pool '{name}' needs at least one worker.")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max(max_queue, 0)
+        self._in_flight = 0
+        self.queue_wait_histogram = Histogram(
+            "executor_queue_wait_seconds",
+            buckets=LATENCY_BUCKETS,
+            description="Time a task waited for a pool worker.",
+            labels={"pool": name},
+        )
+        self._executor: Executor
+        if kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+
+    @property
+    def limit(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def run(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        # Only touched from the event loop thread, so a plain counter is enough.
+        if self._in_flight >= self.limit:
+            raise ExecutorSaturatedError(self.name, self.limit)
+        self._in_flight += 1
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        if self.kind == "thread":
+            call = self._in_context(call)
+        try:
+            future = self._executor.submit(call)
+        except BaseException:
+            self._in_flight -= 1
+            raise
+        # Free the slot when the task ends, not when the caller stops waiting: a cancelled caller (e.g. a
+        # disconnected client) leaves behind a task that is still running, or queued, on the pool.
+        future.add_done_callback(lambda _: _call_soon(loop, self._release_slot))
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _release_slot(self) -> None:
+        self._in_flight -= 1
+
+    async def stream(
+        self, fn: Callable[..., Iterable[T]], /, *args: Any, buffer: int = 4, **kwargs: Any
+    ) -> AsyncIterator[T]:
+        """
+        Iterate a blocking generator on this pool and yield its items on the event loop.
+
+        The producer runs at most ``buffer`` items ahead of the consumer. Process pools cannot
+        ship generators, so there the iterable is materialized in the worker first.
+        """
+        if self.kind == "process":
+            for item in await self.run(_materialize, fn, args, kwargs):
+                yield item
+            return
+
+        if self._in_flight >= self.limit:
+            raise ExecutorSaturatedError(self.name, self.limit)
+        self._in_flight += 1
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[tuple[bool, Any]] = asyncio.Queue()
+        slots = threading.Semaphore(max(buffer, 1))
+        stop = threading.Event()
+
+        def _produce() -> None:
+            try:
+                iterator = iter(fn(*args, **kwargs))
+            except BaseException as exc:  # noqa: BLE001 - re-raised on the consumer side
+                loop.call_soon_threadsafe(queue.put_nowait, (True, exc))
+                return
+            try:
+                for item in iterator:
+                    while not slots.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if stop.is_set():
+                        return
+                    loop.call_soon_threadsafe(queue.put_nowait, (False, item))
+            except BaseException as exc:  # noqa: BLE001 - re-raised on the consumer side
+                loop.call_soon_threadsafe(queue.put_nowait, (True, exc))
+                return
+            finally:
+                # Let generators release their resources (temp files, worker futures) promptly.
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+            loop.call_soon_threadsafe(queue.put_nowait, (True, None))
+
+        def _release(_: asyncio.Future) -> None:
+            self._in_flight -= 1
+
+        producer = loop.run_in_executor(self._executor, self._in_context(_produce))
+        producer.add_done_callback(_release)
+        try:
+            while True:
+                done, payload = await queue.get()
+                if done:
+                    if payload is not None:
+                        raise payload
+                    return
+                slots.release()
+                yield payload
+        finally:
+            stop.set()
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _in_context(self, fn: Callable[[], T]) -> Callable[[], T]:
+        context = contextvars.copy_context()
+        submitted = time.perf_counter()
+
+        def _call() -> T:
+            self.queue_wait_histogram.observe(time.perf_counter() - submitted)
+            return context.run(fn)
+
+        return _call
+
+
+@dataclass
+class ExecutorPools:
+    """Dedicated pools for the OCR, embedding and generation stages."""
+
+    ocr: BoundedExecutor
+    embedding: BoundedExecutor
+    generation: BoundedExecutor
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> ExecutorPools:
+        pools = cls(
+            ocr=BoundedExecutor(
+                "ocr",
+                kind=settings.ocr_pool_kind,
+                max_workers=settings.ocr_pool_workers,
+                max_queue=settings.ocr_pool_queue,
+            ),
+            embedding=BoundedExecutor(
+                "embedding",
+                kind="thread",
+                max_workers=settings.embedding_pool_workers,
+                max_queue=settings.embedding_pool_queue,
+            ),
+            generation=BoundedExecutor(
+                "generation",
+                kind="thread",
+                # Batched generation needs enough waiting callers to fill a batch. Blocking and streaming
+                # callers only wait on the scheduler, which runs one decode at a time.
+                max_workers=max(settings.generation_pool_workers, settings.rag_max_batch_size),
+                max_queue=settings.generation_pool_queue,
+            ),
+        )
+        for pool in pools.all():
+            logger.info(
+                "Executor pool %s: kind=%s workers=%d queue=%d", pool.name, pool.kind, pool.max_workers, pool.max_queue
+            )
+        return pools
+
+    def all(self) -> tuple[BoundedExecutor, ...]:
+        return (self.ocr, self.embedding, self.generation)
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        for pool in self.all():
+            pool.shutdown(wait=wait)
+
+
+def _materialize(fn: Callable[..., Iterable[T]], args: tuple, kwargs: dict) -> list[T]:
+    return list(fn(*args, **kwargs))
+
+
+def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[[], None]) -> None:
+    try:
+        loop.call_soon_threadsafe(callback)
+    except RuntimeError:
+        pass  # The loop has closed; nobody is left to admit tasks.
+
+
+async def stream_in_pool(
+    pool: BoundedExecutor | None, fn: Callable[..., Iterable[T]], /, *args: Any, **kwargs: Any
+) -> AsyncIterator[T]:
+    """Async counterpart of ``run_in_pool`` for blocking generators."""
+    if pool is None:
+        for item in fn(*args, **kwargs):
+            yield item
+        return
+    async for item in pool.stream(fn, *args, **kwargs):
+        yield item
+
+
+async def run_in_pool(pool: BoundedExecutor | None, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run ``fn`` on ``pool`` when one is configured, otherwise inline on the caller's thread."""
+    if pool is None:
+        return fn(*args, **kwargs)
+    return await pool.run(fn, *args, **kwargs)
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, Mapping, Sequence
+
+# Seconds; spans cache hits through CPU generation of a long answer.
+LATENCY_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# ``{stage: seconds}`` for the request being handled, when per-request timings are collected.
+_request_timings: ContextVar[dict[str, float] | None] = ContextVar("request_timings", default=None)
+
+GaugeCollector = Callable[[], Iterable[tuple[Mapping[str, str], float]]]
+
+
+@dataclass
+class Histogram:
+    """Cumulative histogram with fixed upper bounds, safe to observe from any thread."""
+
+    name: str
+    buckets: Sequence[float]
+    description: str = ""
+    labels: Mapping[str, str] = field(default_factory=dict)
+    counts: list[int] = field(init=False)
+    total: float = field(init=False, default=0.0)
+    count: int = field(init=False, default=0)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        self.buckets = sorted(self.buckets)
+        # One extra slot for observations above the largest bound (+Inf).
+        self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            cumulative: dict[str, int] = {}
+            running = 0
+            for bound, bucket_count in zip([*self.buckets, float("inf")], self.counts):
+                running += bucket_count
+                cumulative["+Inf" if bound == float("inf") else f"{bound:g}"] = running
+            return {"count": self.count, "sum": self.total, "buckets": cumulative}
+
+
+@dataclass
+class Counter:
+    """Monotonic counter, safe to increment from any thread."""
+
+    name: str
+    description: str = ""
+    labels: Mapping[str, str] = field(default_factory=dict)
+    value: float = field(init=False, default=0.0)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class MetricsRegistry:
+    """
+    The application's metrics, rendered in the Prometheus text exposition format.
+
+    Components either own their histograms and ``register`` them, or get them from ``histogram``
+    and ``counter``, which return the same instance for the same name and labels. Values that
+    already live elsewhere (cache statistics, queue depths) are read at scrape time through
+    ``add_gauge`` collectors. Every exported name is prefixed with ``namespace``.
+    """
+
+    def __init__(self, *, namespace: str = "kb") -> None:
+        self.namespace = namespace
+        self._histograms: dict[tuple[str, tuple[tuple[str, str], ...]], Histogram] = {}
+        self._counters: dict[tuple[str, tuple[tuple[str, str], ...]], Counter] = {}
+        self._gauges: dict[str, tuple[str, list[GaugeCollector]]] = {}
+        self._lock = threading.Lock()
+
+    def histogram(
+        self, name: str, *, buckets: Sequence[float] = LATENCY_BUCKETS, description: str = "", **labels: str
+    ) -> Histogram:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(name, buckets, description, labels)
+            return histogram
+
+    def counter(self, name: str, *, description: str = "", **labels: str) -> Counter:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = Counter(name, description, labels)
+            return counter
+
+    def register(self, histogram: Histogram) -> Histogram:
+        with self._lock:
+            self._histograms[(histogram.name, tuple(sorted(histogram.labels.items())))] = histogram
+        return histogram
+
+    def histograms(self, name: str) -> list[Histogram]:
+        """Every label set recorded under ``name``."""
+        with self._lock:
+            return [histogram for histogram in self._histograms.values() if histogram.name == name]
+
+    def add_gauge(self, name: str, collect: GaugeCollector, *, description: str = "") -> None:
+        """Export ``(labels, value)`` pairs returned by ``collect`` on every scrape."""
+        with self._lock:
+            _, collectors = self._gauges.setdefault(name, (description, []))
+            collectors.append(collect)
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Observe the block's duration as ``stage_duration_seconds{stage=...}`` and in the request timings."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe_stage(stage, elapsed)
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        self.histogram(
+            "stage_duration_seconds", description="Time spent in each pipeline stage.", stage=stage
+        ).observe(seconds)
+        record_timing(stage, seconds)
+
+    def render(self) -> str:
+        with self._lock:
+            histograms = list(self._histograms.values())
+            counters = list(self._counters.values())
+            gauges = [(name, description, list(collectors)) for name, (description, collectors) in self._gauges.items()]
+
+        lines: list[str] = []
+        for name, group in _group(histograms):
+            full_name = f"{self.namespace}_{name}"
+            lines.extend(_header(full_name, group[0].description, "histogram"))
+            for histogram in group:
+                snapshot = histogram.snapshot()
+                for bound, count in snapshot["buckets"].items():  # type: ignore[union-attr]
+                    lines.append(f"{full_name}_bucket{_labels({**histogram.labels, 'le': bound})} {count}")
+                lines.append(f"{full_name}_sum{_labels(histogram.labels)} {_number(snapshot['sum'])}")
+                lines.append(f"{full_name}_count{_labels(histogram.labels)} {snapshot['count']}")
+        for name, group in _group(counters):
+            full_name = f"{self.namespace}_{name}_total"
+            lines.extend(_header(full_name, group[0].description, "counter"))
+            lines.extend(f"{full_name}{_labels(counter.labels)} {_number(counter.value)}" for counter in group)
+        for name, description, collectors in gauges:
+            full_name = f"{self.namespace}_{name}"
+            lines.extend(_header(full_name, description, "gauge"))
+            for collect in collectors:
+                lines.extend(f"{full_name}{_labels(labels)} {_number(value)}" for labels, value in collect())
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def collect_timings() -> Iterator[dict[str, float]]:
+    """Collect stage durations recorded (on this task, its child tasks and pool threads) inside the block."""
+    timings: dict[str, float] = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def record_timing(stage: str, seconds: float) -> None:
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+def format_server_timing(timings: Mapping[str, float]) -> str:
+    """Render timings as a ``Server-Timing`` header value (durations in milliseconds)."""
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items())
+
+
+def _group(metrics: Sequence[Histogram] | Sequence[Counter]) -> list[tuple[str, list]]:
+    groups: dict[str, list] = {}
+    for metric in metrics:
+        groups.setdefault(metric.name, []).append(metric)
+    return sorted(groups.items())
+
+
+def _header(name: str, description: str, kind: str) -> list[str]:
+    lines = [f"# HELP {name} {description}"] if description else []
+    lines.append(f"# TYPE {name} {kind}")
+    return lines
+
+
+def _labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: object) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
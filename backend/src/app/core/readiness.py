@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Generic, Iterable, Literal, TypeVar, cast
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ComponentStatus = Literal["pending", "deferred", "loading", "ready", "failed"]
+
+
+class ComponentNotReadyError(RuntimeError):
+    """Raised when a request needs components that are still loading (or failed to load)."""
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.names = sorted(names)
+        super().__init__(f"Not ready yet: {', '.join(self.names)}.")
+
+
+class LazyComponent(Generic[T]):
+    """
+    Builds a component with ``factory`` exactly once, on first use or when preloaded.
+
+    Loading is thread-safe; concurrent callers wait for the same build. After building, the
+    component's ``warmup()`` (when it has one and ``warmup`` is set) runs a small inference so the
+    first real request does not pay for lazy kernel and cache initialisation. A failed load is
+    retried on the next use. ``deferred`` components are skipped by ``ReadinessTracker.preload``.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T], *, warmup: bool = True, deferred: bool = False) -> None:
+        self.name = name
+        self.factory = factory
+        self.warmup = warmup
+        self.deferred = deferred
+        self.load_seconds: float | None = None
+        self.warmup_seconds: float | None = None
+        self.error: str | None = None
+        self._instance: T | None = None
+        self._loading = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+    @property
+    def status(self) -> ComponentStatus:
+        if self._instance is not None:
+            return "ready"
+        if self._loading:
+            return "loading"
+        if self.error is not None:
+            return "failed"
+        return "deferred" if self.deferred else "pending"
+
+    def get(self) -> T:
+        instance = self._instance
+        if instance is not None:
+            return instance
+        with self._lock:
+            if self._instance is None:
+                # Stays "loading" through warmup, until the instance is published as ready.
+                self._loading = True
+                try:
+                    self._instance = self._load()
+                finally:
+                    self._loading = False
+            return self._instance
+
+    def proxy(self) -> T:
+        """Stand-in that forwards attribute access to the component, loading it on first access."""
+        return cast(T, _LazyProxy(self))
+
+    def close(self) -> None:
+        """Close the component if it was ever loaded; never loads it just to close it."""
+        close = getattr(self._instance, "close", None)
+        if close is not None:
+            close()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "status": self.status,
+            "load_seconds": _rounded(self.load_seconds),
+            "warmup_seconds": _rounded(self.warmup_seconds),
+            "error": self.error,
+        }
+
+    def _load(self) -> T:
+        logger.info("Loading component %s", self.name)
+        start = time.perf_counter()
+        try:
+            instance = self.factory()
+        except Exception as exc:
+            self.error = str(exc) or type(exc).__name__
+            logger.exception("Loading component %s failed", self.name)
+            raise
+        self.load_seconds = time.perf_counter() - start
+        self.error = None
+
+        warmup = getattr(instance, "warmup", None) if self.warmup else None
+        if warmup is not None:
+            start = time.perf_counter()
+            try:
+                warmup()
+            except Exception:  # noqa: BLE001 - a cold but working component is still usable
+                logger.warning("Warmup of component %s failed", self.name, exc_info=True)
+            self.warmup_seconds = time.perf_counter() - start
+        logger.info(
+            "Component %s ready (load %.2fs, warmup %.2fs)", self.name, self.load_seconds, self.warmup_seconds or 0.0
+        )
+        return instance
+
+
+class _LazyProxy:
+    def __init__(self, component: LazyComponent[Any]) -> None:
+        self._component = component
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self._component.get(), name)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._component.name}: {self._component.status}>"
+
+
+class ReadinessTracker:
+    """
+    Loads ``LazyComponent``s concurrently in background threads and reports their state.
+
+    The application counts as ready once every non-deferred component has loaded; deferred ones
+    load when a request first needs them (see ``wait_for``).
+    """
+
+    def __init__(self) -> None:
+        self.components: dict[str, LazyComponent[Any]] = {}
+        self._loads: dict[str, asyncio.Future[Any]] = {}
+
+    def add(self, component: LazyComponent[T]) -> LazyComponent[T]:
+        self.components[component.name] = component
+        return component
+
+    @property
+    def ready(self) -> bool:
+        return all(
+            component.loaded or (component.deferred and component.error is None)
+            for component in self.components.values()
+        )
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {name: component.snapshot() for name, component in self.components.items()}
+
+    def load(self, names: Iterable[str]) -> list[asyncio.Future[Any]]:
+        """Start loading ``names`` in background threads (no-op for loaded or loading components)."""
+        futures = []
+        for name in names:
+            component = self.components[name]
+            future = self._loads.get(name)
+            if future is None or (future.done() and not component.loaded):
+                future = asyncio.ensure_future(asyncio.to_thread(component.get))
+                # Failures are reported through the component's state and /ready.
+                future.add_done_callback(lambda done: done.cancelled() or done.exception())
+                self._loads[name] = future
+            futures.append(future)
+        return futures
+
+    async def preload(self) -> None:
+        """Load every non-deferred component concurrently; failures are recorded, not raised."""
+        start = time.perf_counter()
+        names = [name for name, component in self.components.items() if not component.deferred]
+        await asyncio.gather(*self.load(names), return_exceptions=True)
+        logger.info("Preloaded %s in %.2fs; ready=%s", ", ".join(names) or "nothing", time.perf_counter() - start, self.ready)
+
+    async def wait_for(self, names: Iterable[str], *, timeout: float | None = None) -> None:
+        """
+        Load ``names`` if needed and wait up to ``timeout`` seconds for them.
+
+        Raises ``ComponentNotReadyError`` if any is still loading afterwards or failed to load.
+        """
+        names = [name for name in names if not self.components[name].loaded]
+        if not names:
+            return
+        futures = self.load(names)
+        await asyncio.wait(futures, timeout=timeout)
+        pending = [name for name in names if not self.components[name].loaded]
+        if pending:
+            raise ComponentNotReadyError(pending)
+
+    def close(self) -> None:
+        for component in self.components.values():
+            component.close()
+
+
+def _rounded(seconds: float | None) -> float | None:
+    return round(seconds, 3) if seconds is not None else None
@@ -1,15 +1,50 @@
 """Domain layer: entities, repositories, and services."""
 
-from app.domain.entities import DocumentChunk, QueryResult, StoredDocument
-from app.domain.repositories import DocumentStore, VectorStore
-from app.domain.services import EmbeddingService, RagService, TextExtractorService
+from app.domain.entities import (
+    CachedAnswer,
+    DocumentChunk,
+    ExtractedPage,
+    IngestionJob,
+    IngestionRecord,
+    QueryResult,
+    StoredDocument,
+    TextChunk,
+)
+from app.domain.repositories import (
+    AnswerCache,
+    DocumentStore,
+    IngestionRegistry,
+    JobStore,
+    LexicalIndex,
+    VectorStore,
+)
+from app.domain.services import (
+    Chunker,
+    ChunkingSession,
+    DocumentSource,
+    EmbeddingService,
+    RagService,
+    TextExtractorService,
+)
 
 __all__ = [
+    "CachedAnswer",
     "DocumentChunk",
+    "ExtractedPage",
+    "IngestionJob",
+    "IngestionRecord",
     "QueryResult",
     "StoredDocument",
+    "TextChunk",
+    "AnswerCache",
     "DocumentStore",
+    "IngestionRegistry",
+    "JobStore",
+    "LexicalIndex",
     "VectorStore",
+    "Chunker",
+    "ChunkingSession",
+    "DocumentSource",
     "TextExtractorService",
     "EmbeddingService",
     "RagService",
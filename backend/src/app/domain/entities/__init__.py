@@ -1,3 +1,16 @@
-from .documents import DocumentChunk, QueryResult, StoredDocument
+from .answers import CachedAnswer
+from .documents import DocumentChunk, ExtractedPage, QueryResult, StoredDocument, TextChunk
+from .ingestion import IngestionRecord
+from .jobs import IngestionJob, JobStatus
 
-__all__ = ["DocumentChunk", "QueryResult", "StoredDocument"]
+__all__ = [
+    "CachedAnswer",
+    "DocumentChunk",
+    "ExtractedPage",
+    "IngestionJob",
+    "IngestionRecord",
+    "JobStatus",
+    "QueryResult",
+    "StoredDocument",
+    "TextChunk",
+]
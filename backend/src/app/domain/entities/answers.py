@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .documents import DocumentChunk
+
+
+@dataclass
+class CachedAnswer:
+    answer: str
+    source: str | None
+    context: list[DocumentChunk]
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
+
 
 @dataclass
 class StoredDocument:
@@ -15,7 +17,25 @@ class DocumentChunk:
     id: str
     content: str
     metadata: dict[str, str] | None = None
-    embedding: list[float] | None = None
+    embedding: np.ndarray | None = None
+
+
+@dataclass
+class ExtractedPage:
+    number: int
+    text: str
+    metadata: dict[str, str] | None = None
+
+
+@dataclass
+class TextChunk:
+    """A chunk of document text with its position (pages are 1-based, character offsets 0-based)."""
+
+    text: str
+    page_start: int
+    page_end: int
+    char_start: int
+    char_end: int
 
 
 @dataclass
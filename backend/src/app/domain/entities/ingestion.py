@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class IngestionRecord:
+    content_key: str
+    document_id: str
+    filename: str
+    chunk_count: int = 0
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+_FINISHED: frozenset[str] = frozenset({"succeeded", "failed", "cancelled"})
+
+
+@dataclass
+class IngestionJob:
+    id: str
+    filename: str
+    payload_path: str
+    content_digest: str | None = None  # SHA-256 of the payload, computed while spooling
+    status: JobStatus = "queued"
+    stage: str = "queued"
+    pages_extracted: int = 0
+    chunks_embedded: int = 0
+    chunks_stored: int = 0
+    document_id: str | None = None
+    duplicate: bool = False
+    error: str | None = None
+    attempts: int = 0
+    cancel_requested: bool = False
+    created_at: str | None = None
+    updated_at: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _FINISHED
@@ -1,4 +1,8 @@
+from .answer_cache import AnswerCache
 from .document_store import DocumentStore
+from .ingestion_registry import IngestionRegistry
+from .job_store import JobStore
+from .lexical_index import LexicalIndex
 from .vector_store import VectorStore
 
-__all__ = ["DocumentStore", "VectorStore"]
+__all__ = ["AnswerCache", "DocumentStore", "IngestionRegistry", "JobStore", "LexicalIndex", "VectorStore"]
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Protocol
+
+import numpy as np
+
+from app.domain.entities import CachedAnswer
+
+
+class AnswerCache(Protocol):
+    """Cache of generated answers keyed by question and document scope (``None`` = all documents)."""
+
+    def get(self, question: str, *, scope: str | None, embedding: np.ndarray | None = None) -> CachedAnswer | None:
+        """Return a cached answer for ``question``; ``embedding`` enables near-duplicate matches."""
+        ...
+
+    def put(
+        self,
+        question: str,
+        answer: CachedAnswer,
+        *,
+        scope: str | None,
+        embedding: np.ndarray | None = None,
+    ) -> None:
+        ...
+
+    def invalidate_document(self, document_id: str) -> int:
+        """Drop answers that may depend on ``document_id``. Returns the number of entries removed."""
+        ...
+
+    def clear(self) -> None:
+        """Drop every cached answer."""
+        ...
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Protocol
+
+from app.domain.entities import IngestionRecord
+
+
+class IngestionRegistry(Protocol):
+    """Content-addressed index of documents that have already been ingested."""
+
+    def find_by_content(self, content_key: str) -> IngestionRecord | None:
+        ...
+
+    def resolve(self, name: str) -> str | None:
+        """Return the document id a filename, alias or document id currently points at, if known."""
+        ...
+
+    def referrers(self, document_id: str) -> list[str]:
+        """Names that resolve to ``document_id``; with none left, its chunks are no longer reachable."""
+        ...
+
+    def record(self, record: IngestionRecord) -> None:
+        """Register ``record`` (replacing a previous one with the same document id) and point its filename at it."""
+        ...
+
+    def add_alias(self, alias: str, document_id: str) -> None:
+        """Point ``alias`` at ``document_id``, moving it off whatever it referred to before."""
+        ...
+
+    def remove(self, document_id: str) -> None:
+        """Forget ``document_id`` and its aliases (its chunks are no longer stored)."""
+        ...
+
+    def generation(self) -> int:
+        """Counter advanced by every ``record`` and ``remove``, in any process sharing the registry."""
+        ...
+
+    def changed_since(self, generation: int) -> list[str] | None:
+        """Documents recorded or removed after ``generation``; ``None`` once that is too far back to tell."""
+        ...
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Protocol
+
+from app.domain.entities import IngestionJob
+
+
+class JobStore(Protocol):
+    """Durable queue of ingestion jobs and their progress."""
+
+    def create(self, job: IngestionJob) -> IngestionJob:
+        ...
+
+    def get(self, job_id: str) -> IngestionJob | None:
+        ...
+
+    def claim_next(self, owner: str) -> IngestionJob | None:
+        """Atomically move the oldest queued job to ``running``, leased to ``owner``, and return it."""
+        ...
+
+    def update_progress(
+        self,
+        job_id: str,
+        *,
+        stage: str,
+        pages_extracted: int,
+        chunks_embedded: int,
+        chunks_stored: int,
+    ) -> bool:
+        """Record progress; returns whether cancellation has been requested for the job."""
+        ...
+
+    def finish(
+        self,
+        job_id: str,
+        *,
+        status: str,
+        document_id: str | None = None,
+        duplicate: bool = False,
+        error: str | None = None,
+    ) -> None:
+        ...
+
+    def request_cancel(self, job_id: str) -> IngestionJob | None:
+        """Cancel a queued job outright, or flag a running one; returns the updated job."""
+        ...
+
+    def requeue(self, job_id: str) -> None:
+        ...
+
+    def renew_leases(self, owner: str) -> None:
+        """Extend the lease on every job ``owner`` is running; call well within the lease length."""
+        ...
+
+    def requeue_interrupted(self) -> int:
+        """Return ``running`` jobs whose lease has expired (their worker died) to the queue."""
+        ...
+
+    def count_by_status(self) -> dict[str, int]:
+        ...
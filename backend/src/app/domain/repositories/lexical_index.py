@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import Iterable, Protocol
+
+from app.domain.entities import DocumentChunk, QueryResult
+
+
+class LexicalIndex(Protocol):
+    """Sparse keyword index kept alongside the vector store for exact-term retrieval."""
+
+    def add(self, chunks: Iterable[DocumentChunk]) -> None:
+        ...
+
+    def search(self, text: str, limit: int = 5, *, where: dict[str, str] | None = None) -> list[QueryResult]:
+        """Return the best keyword matches; higher scores are better."""
+        ...
+
+    def delete_document(self, document_id: str) -> None:
+        ...
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Iterable, Protocol
 
+import numpy as np
+
 from app.domain.entities import DocumentChunk, QueryResult
 
 
@@ -11,5 +13,21 @@ class VectorStore(Protocol):
     def add_documents(self, chunks: Iterable[DocumentChunk]) -> None:
         ...
 
-    def query(self, text: str, limit: int = 5) -> list[QueryResult]:
+    def query(
+        self,
+        text: str,
+        limit: int = 5,
+        *,
+        where: dict[str, str] | None = None,
+        embedding: np.ndarray | None = None,
+    ) -> list[QueryResult]:
+        """
+        Return the ``limit`` nearest chunks whose metadata matches every ``where`` key/value pair.
+
+        ``embedding`` skips embedding ``text`` when the caller already has the query vector.
+        """
+        ...
+
+    def delete_document(self, document_id: str) -> None:
+        """Remove every chunk stored for ``document_id``."""
         ...
@@ -1,5 +1,6 @@
+from .chunker import Chunker, ChunkingSession
 from .embedding_service import EmbeddingService
 from .rag_service import RagService
-from .text_extractor import TextExtractorService
+from .text_extractor import DocumentSource, TextExtractorService
 
-__all__ = ["TextExtractorService", "EmbeddingService", "RagService"]
+__all__ = ["Chunker", "ChunkingSession", "DocumentSource", "TextExtractorService", "EmbeddingService", "RagService"]
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Protocol
+
+from app.domain.entities import ExtractedPage, TextChunk
+
+
+class ChunkingSession(Protocol):
+    """Chunking state for one document; pages are fed in order as they are extracted."""
+
+    def feed(self, page: ExtractedPage) -> list[TextChunk]:
+        """Return the chunks that can no longer change once ``page`` has been seen."""
+        ...
+
+    def flush(self) -> list[TextChunk]:
+        """Return the remaining chunks at the end of the document."""
+        ...
+
+
+class Chunker(Protocol):
+    """Splits streamed page text into chunks for embedding."""
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifies the settings that shape the chunks (part of the ingestion content key)."""
+        ...
+
+    def session(self) -> ChunkingSession:
+        ...
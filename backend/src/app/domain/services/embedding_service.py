@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from typing import Protocol, Sequence
 
+import numpy as np
+
 
 class EmbeddingService(Protocol):
     """Service that turns text into vector embeddings."""
 
-    def embed(self, texts: Sequence[str]) -> list[list[float]]:
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return a C-contiguous float32 array of shape ``(len(texts), dim)``."""
         ...
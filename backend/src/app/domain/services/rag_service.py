@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Protocol, Sequence
+from typing import Iterator, Protocol, Sequence
 
 from app.domain.entities import DocumentChunk
 
@@ -16,3 +16,13 @@ class RagService(Protocol):
         chat_history: Sequence[tuple[str, str]] | None = None,
     ) -> str:
         ...
+
+    def stream_answer(
+        self,
+        *,
+        question: str,
+        context: Sequence[DocumentChunk],
+        chat_history: Sequence[tuple[str, str]] | None = None,
+    ) -> Iterator[str]:
+        """Yield the answer incrementally as the model decodes it."""
+        ...
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
-from typing import Protocol
+import os
+from typing import BinaryIO, Iterator, Protocol, Union
+
+from app.domain.entities import ExtractedPage
+
+# Raw bytes, a path to the document on disk, or a readable binary file object positioned at the start.
+DocumentSource = Union[bytes, str, "os.PathLike[str]", BinaryIO]
 
 
 class TextExtractorService(Protocol):
     """Service that extracts raw text from a document payload."""
 
-    def extract_text(self, data: bytes) -> str:
+    def extract_text(self, source: DocumentSource) -> str:
+        ...
+
+    def iter_pages(self, source: DocumentSource) -> Iterator[ExtractedPage]:
+        """Yield page texts in document order as soon as each page is ready."""
         ...
@@ -1,13 +1,45 @@
-"""Infrastructure adapters (vector stores, storage, models, text extraction)."""
+"""Infrastructure adapters (vector stores, lexical index, caches, job queue, storage, models (PyTorch, int8, ONNX Runtime), model server clients, text extraction, instrumentation)."""
 
-from app.infrastructure.embeddings import SentenceTransformerEmbeddingService
+from app.infrastructure.cache import InMemoryAnswerCache
+from app.infrastructure.embeddings import MicroBatchingEmbedder, SentenceTransformerEmbeddingService
+from app.infrastructure.instrumentation import (
+    InstrumentedEmbeddingService,
+    InstrumentedRagService,
+    InstrumentedTextExtractor,
+    InstrumentedVectorStore,
+)
+from app.infrastructure.jobs import SqliteJobStore
+from app.infrastructure.lexical import SqliteBm25Index
+from app.infrastructure.model_server import (
+    ModelServerClient,
+    ModelServerError,
+    RemoteEmbeddingService,
+    RemoteRagService,
+)
 from app.infrastructure.rag import LangChainRagService
-from app.infrastructure.text_extraction import TesseractTextExtractor
-from app.infrastructure.vectorstores import ChromaVectorStore
+from app.infrastructure.registry import SqliteIngestionRegistry
+from app.infrastructure.text_extraction import OcrPageCache, PdfTextLayerExtractor, TesseractTextExtractor
+from app.infrastructure.vectorstores import ChromaVectorStore, MmapVectorStore
 
 __all__ = [
     "ChromaVectorStore",
+    "InMemoryAnswerCache",
+    "InstrumentedEmbeddingService",
+    "InstrumentedRagService",
+    "InstrumentedTextExtractor",
+    "InstrumentedVectorStore",
+    "MicroBatchingEmbedder",
+    "MmapVectorStore",
+    "ModelServerClient",
+    "ModelServerError",
+    "OcrPageCache",
+    "PdfTextLayerExtractor",
     "TesseractTextExtractor",
     "SentenceTransformerEmbeddingService",
     "LangChainRagService",
+    "RemoteEmbeddingService",
+    "RemoteRagService",
+    "SqliteBm25Index",
+    "SqliteIngestionRegistry",
+    "SqliteJobStore",
 ]
@@ -0,0 +1,5 @@
+"""Answer cache implementations."""
+
+from .answer_cache import InMemoryAnswerCache
+
+__all__ = ["InMemoryAnswerCache"]
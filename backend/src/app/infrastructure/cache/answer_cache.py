@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable
+
+import numpy as np
+
+from app.domain.entities import CachedAnswer
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_question(question: str) -> str:
+    """Case-fold, collapse whitespace and drop trailing punctuation so trivial rewordings share a key."""
+    return " ".join(question.casefold().split()).rstrip(" ?!.")
+
+
+@dataclass
+class _Entry:
+    scope: str | None
+    answer: CachedAnswer
+    embedding: np.ndarray | None
+    document_ids: frozenset[str]
+    size: int
+    expires_at: float
+
+
+class InMemoryAnswerCache:
+    """
+    Process-local LRU cache of chat answers keyed by normalized question text plus document scope.
+
+    Notes:
+    - Entries expire after ``ttl_seconds``; the least recently used ones are evicted once the cache
+      holds more than ``max_entries`` answers or ``max_bytes`` of answer and context text.
+    - With ``similarity_threshold`` set (cosine, 0-1), an exact miss falls back to the most similar
+      cached question in the same scope, provided the caller passes the question embedding.
+    - ``invalidate_document`` drops answers scoped to or built from a document, plus every
+      unscoped answer, because a corpus-wide search may now rank the new content first. Ingestion in
+      other processes reaches this cache through ``ChatUseCase``, which replays the registry's change log.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 3600.0,
+        similarity_threshold: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(max_entries, 1)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold or None
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str | None, str], _Entry] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, question: str, *, scope: str | None, embedding: np.ndarray | None = None) -> CachedAnswer | None:
+        key = (scope, normalize_question(question))
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.answer
+
+            similar_key = self._most_similar(scope, embedding, now) if self.similarity_threshold else None
+            if similar_key is not None:
+                self._entries.move_to_end(similar_key)
+                self.similar_hits += 1
+                return self._entries[similar_key].answer
+
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        question: str,
+        answer: CachedAnswer,
+        *,
+        scope: str | None,
+        embedding: np.ndarray | None = None,
+    ) -> None:
+        # Chunk embeddings are not needed to replay an answer and would dominate the entry size.
+        answer = replace(answer, context=[replace(chunk, embedding=None) for chunk in answer.context])
+        normalized = _unit(embedding) if embedding is not None and self.similarity_threshold else None
+        size = len(answer.answer) + sum(len(chunk.content) for chunk in answer.context)
+        size += normalized.nbytes if normalized is not None else 0
+        if size > self.max_bytes:
+            return
+
+        key = (scope, normalize_question(question))
+        entry = _Entry(
+            scope=scope,
+            answer=answer,
+            embedding=normalized,
+            document_ids=frozenset(
+                chunk.metadata["document_id"] for chunk in answer.context if (chunk.metadata or {}).get("document_id")
+            ),
+            size=size,
+            expires_at=self._clock() + self.ttl_seconds,
+        )
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_document(self, document_id: str) -> int:
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if entry.scope is None or entry.scope == document_id or document_id in entry.document_ids
+            ]
+            for key in stale:
+                self._remove(key)
+        if stale:
+            logger.info("Invalidated %d cached answers after ingesting %s", len(stale), document_id)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.similar_hits + self.misses
+        return (self.hits + self.similar_hits) / total if total else 0.0
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hit_rate,
+            }
+
+    def _most_similar(
+        self, scope: str | None, embedding: np.ndarray | None, now: float
+    ) -> tuple[str | None, str] | None:
+        if embedding is None:
+            return None
+        candidates = [
+            (key, entry)
+            for key, entry in self._entries.items()
+            if entry.scope == scope and entry.embedding is not None and entry.expires_at > now
+        ]
+        if not candidates:
+            return None
+        similarities = np.vstack([entry.embedding for _, entry in candidates]) @ _unit(embedding)
+        best = int(np.argmax(similarities))
+        return candidates[best][0] if similarities[best] >= self.similarity_threshold else None
+
+    def _remove(self, key: tuple[str | None, str]) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
@@ -1,5 +1,6 @@
 """Embedding service implementations."""
 
+from .micro_batching import MicroBatchingEmbedder
 from .sentence_transformers import SentenceTransformerEmbeddingService
 
-__all__ = ["SentenceTransformerEmbeddingService"]
+__all__ = ["MicroBatchingEmbedder", "SentenceTransformerEmbeddingService"]
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+from typing import Any, Sequence
+
+import numpy as np
+
+from app.core.executors import BoundedExecutor, run_in_pool
+from app.core.metrics import Histogram, record_timing
+from app.domain.services import EmbeddingService
+
+
+class MicroBatchingEmbedder:
+    """
+    Coalesces concurrent single-text embedding requests into one ``EmbeddingService.embed`` call.
+
+    A batch is dispatched once ``max_batch_size`` texts are waiting or the oldest one has waited
+    ``max_wait_ms``. Batches run on ``pool`` (when given), so collection of the next batch overlaps
+    encoding of the current one.
+    """
+
+    def __init__(
+        self,
+        embedder: EmbeddingService,
+        *,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        pool: BoundedExecutor | None = None,
+    ) -> None:
+        self.embedder = embedder
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_wait = max(max_wait_ms, 0.0) / 1000
+        self.pool = pool
+        self.batch_size_histogram = Histogram(
+            "embedding_batch_size",
+            buckets=[1, 2, 4, 8, 16, 32, 64, 128],
+            description="Texts per micro-batched embedding call.",
+        )
+        self.queue_wait_histogram = Histogram(
+            "embedding_queue_wait_seconds",
+            buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25],
+            description="Time a query waited for its micro-batch to be dispatched.",
+        )
+        self._queue: asyncio.Queue[tuple[str, float, asyncio.Future[Any]]] | None = None
+        self._worker: asyncio.Task[None] | None = None
+        self._inflight: set[asyncio.Task[None]] = set()
+        self._dim = 0  # width of the last batch, for shaping empty results
+
+    async def embed_one(self, text: str) -> np.ndarray:
+        queue = self._ensure_worker()
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        enqueued_at = time.perf_counter()
+        await queue.put((text, enqueued_at, future))
+        try:
+            return await future
+        finally:
+            record_timing("query_embedding", time.perf_counter() - enqueued_at)
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self._dim), dtype=np.float32)
+        return np.vstack(await asyncio.gather(*(self.embed_one(text) for text in texts)))
+
+    def stats(self) -> dict[str, object]:
+        return {
+            self.batch_size_histogram.name: self.batch_size_histogram.snapshot(),
+            self.queue_wait_histogram.name: self.queue_wait_histogram.snapshot(),
+        }
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, *self._inflight, return_exceptions=True)
+            self._worker = None
+            self._queue = None
+
+    def _ensure_worker(self) -> asyncio.Queue[tuple[str, float, asyncio.Future[Any]]]:
+        if self._queue is None or self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            # Batches serve many requests, so the worker must not inherit the first caller's context.
+            self._worker = contextvars.Context().run(
+                asyncio.get_running_loop().create_task, self._collect(self._queue)
+            )
+        return self._queue
+
+    async def _collect(self, queue: asyncio.Queue[tuple[str, float, asyncio.Future[Any]]]) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = loop.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: list[tuple[str, float, asyncio.Future[Any]]]) -> None:
+        dispatched_at = time.perf_counter()
+        for _, enqueued_at, _ in batch:
+            self.queue_wait_histogram.observe(dispatched_at - enqueued_at)
+        self.batch_size_histogram.observe(len(batch))
+
+        try:
+            vectors = await run_in_pool(self.pool, self.embedder.embed, [text for text, _, _ in batch])
+        except Exception as exc:  # noqa: BLE001 - propagated to every waiting caller
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        if len(vectors) < len(batch):
+            error = RuntimeError(f"Embedder returned {len(vectors)} vectors for a batch of {len(batch)} texts.")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        self._dim = vectors.shape[1]
+        for (_, _, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
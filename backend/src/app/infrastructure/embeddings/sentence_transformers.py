@@ -1,25 +1,123 @@
 from __future__ import annotations
 
-from typing import Sequence
+import copy
+import logging
+import os
+import threading
+from typing import Literal, Sequence
 
+import numpy as np
 import torch
 
 from sentence_transformers import SentenceTransformer
 
 from app.domain.services import EmbeddingService
+from app.infrastructure.inference import ONNX_INSTALL_HINT, export_directory, onnx_session_options, quantize_linear_int8
+
+logger = logging.getLogger(__name__)
+
+EmbeddingBackend = Literal["torch", "torch-int8", "onnx", "onnx-int8"]
 
 
 class SentenceTransformerEmbeddingService(EmbeddingService):
-    """Embedding service using a SentenceTransformers model."""
-
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2") -> None:
-        device = "cpu"
-        if torch.cuda.is_available():
-            device = "cuda"
-        elif torch.backends.mps.is_available():
-            device = "mps"
-        self.model = SentenceTransformer(model_name, device=device)
-
-    def embed(self, texts: Sequence[str]) -> list[list[float]]:
-        embeddings = self.model.encode(list(texts), convert_to_numpy=False, show_progress_bar=False)
-        return [list(map(float, emb)) for emb in embeddings]
+    """
+    Embedding service using a SentenceTransformers model.
+
+    ``backend`` selects how it runs: eager PyTorch (``torch``), PyTorch with int8 linear layers
+    (``torch-int8``), or ONNX Runtime in fp32 (``onnx``) or int8 (``onnx-int8``, kernels for
+    ``onnx_quantization``). ONNX weights are exported (and quantized) once under ``export_dir``. All but
+    ``torch`` run on the CPU and change vectors slightly; check them with ``kb-embedding-parity``.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        *,
+        normalize: bool = False,
+        backend: EmbeddingBackend = "torch",
+        threads: int | None = None,
+        onnx_quantization: str = "avx2",
+        export_dir: str = "./data/onnx",
+    ) -> None:
+        self.model_name = model_name
+        self.normalize = normalize
+        self.backend = backend
+        logger.info("Loading embedding model %s with backend=%s", model_name, backend)
+        if backend == "torch":
+            self.model = SentenceTransformer(model_name, device=_device())
+        elif backend == "torch-int8":
+            self.model = quantize_linear_int8(SentenceTransformer(model_name, device="cpu"))
+        else:
+            self.model = _load_onnx(
+                model_name,
+                quantization=onnx_quantization if backend == "onnx-int8" else None,
+                threads=threads,
+                export_dir=export_dir,
+            )
+        # ``encode`` reconfigures the model's tokenizer on every call, so using it from another thread at
+        # the same time can fail with "Already borrowed". Token counting uses copies of its own instead.
+        self._counting_template = copy.deepcopy(self.model.tokenizer)
+        self._counting = threading.local()
+
+    @property
+    def fingerprint(self) -> str:
+        fingerprint = f"sentence-transformers:{self.model_name}:normalize={self.normalize}"
+        # Other backends produce slightly different vectors; the default keeps existing content keys.
+        return fingerprint if self.backend == "torch" else f"{fingerprint}:backend={self.backend}"
+
+    @property
+    def max_tokens(self) -> int:
+        """Longest input (excluding special tokens) the model encodes without truncation."""
+        return int(self.model.max_seq_length) - 2
+
+    def count_tokens(self, text: str) -> int:
+        tokenizer = getattr(self._counting, "tokenizer", None)
+        if tokenizer is None:
+            tokenizer = self._counting.tokenizer = copy.deepcopy(self._counting_template)
+        return len(tokenizer(text, add_special_tokens=False)["input_ids"])
+
+    def warmup(self) -> None:
+        """Encode one short text so the first request does not pay for lazy initialisation."""
+        self.embed(["warmup"])
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        embeddings = self.model.encode(
+            list(texts),
+            convert_to_numpy=True,
+            normalize_embeddings=self.normalize,
+            show_progress_bar=False,
+        )
+        return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+
+def _device() -> str:
+    if torch.cuda.is_available():
+        return "cuda"
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def _load_onnx(
+    model_name: str, *, quantization: str | None, threads: int | None, export_dir: str
+) -> SentenceTransformer:
+    try:
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+    except ImportError as exc:
+        raise RuntimeError(f"{ONNX_INSTALL_HINT} (and sentence-transformers>=3.2)") from exc
+    model_kwargs = {"provider": "CPUExecutionProvider", "session_options": onnx_session_options(threads)}
+    directory = export_directory(export_dir, model_name, "onnx")
+    if not os.path.exists(os.path.join(directory, "onnx", "model.onnx")):
+        # Uses the ONNX weights published with the model, or exports them; either way, later starts load the copy.
+        logger.info("Exporting %s to ONNX under %s", model_name, directory)
+        SentenceTransformer(model_name, device="cpu", backend="onnx").save(directory)
+    file_name = "onnx/model.onnx"
+    if quantization is not None:
+        file_name = f"onnx/model_qint8_{quantization}.onnx"
+        if not os.path.exists(os.path.join(directory, file_name)):
+            logger.info("Quantizing the ONNX export of %s to int8 (%s)", model_name, quantization)
+            exported = SentenceTransformer(directory, device="cpu", backend="onnx")
+            export_dynamic_quantized_onnx_model(exported, quantization, directory)
+    return SentenceTransformer(
+        directory, device="cpu", backend="onnx", model_kwargs={**model_kwargs, "file_name": file_name}
+    )
@@ -0,0 +1,17 @@
+"""CPU inference helpers shared by the model adapters (int8 quantization, ONNX Runtime, threads)."""
+
+from .cpu import (
+    ONNX_INSTALL_HINT,
+    export_directory,
+    onnx_session_options,
+    quantize_linear_int8,
+    set_torch_threads,
+)
+
+__all__ = [
+    "ONNX_INSTALL_HINT",
+    "export_directory",
+    "onnx_session_options",
+    "quantize_linear_int8",
+    "set_torch_threads",
+]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+from typing import Any, TypeVar
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+ONNX_INSTALL_HINT = "The onnx backends need ONNX Runtime and Optimum: pip install 'knowledge-base-rag-backend[onnx]'"
+
+ModuleT = TypeVar("ModuleT", bound=torch.nn.Module)
+
+
+def quantize_linear_int8(model: ModuleT) -> ModuleT:
+    """Swap the ``nn.Linear`` layers for dynamically quantized int8 ones, in place (CPU only)."""
+    model.eval()
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def set_torch_threads(threads: int | None) -> None:
+    """Size PyTorch's intra-op pool; it is shared by every model in the process."""
+    if threads and torch.get_num_threads() != threads:
+        logger.info("Using %d PyTorch intra-op threads", threads)
+        torch.set_num_threads(threads)
+
+
+def onnx_session_options(threads: int | None) -> Any:
+    """Session options for one ONNX Runtime model; each session owns its own intra-op pool."""
+    try:
+        import onnxruntime
+    except ImportError as exc:
+        raise RuntimeError(ONNX_INSTALL_HINT) from exc
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        options.intra_op_num_threads = threads
+    # Requests run in parallel on pool threads already; parallel graph branches would oversubscribe.
+    options.inter_op_num_threads = 1
+    return options
+
+
+def export_directory(root: str, model_name: str, variant: str) -> str:
+    """Where an exported model is cached, e.g. ``<root>/sentence-transformers--all-MiniLM-L6-v2/onnx-int8``."""
+    return os.path.join(root, re.sub(r"[^\w.-]+", "--", model_name), variant)
@@ -0,0 +1,15 @@
+"""Metric-recording wrappers around the domain service and repository protocols."""
+
+from .instrumented import (
+    InstrumentedEmbeddingService,
+    InstrumentedRagService,
+    InstrumentedTextExtractor,
+    InstrumentedVectorStore,
+)
+
+__all__ = [
+    "InstrumentedEmbeddingService",
+    "InstrumentedRagService",
+    "InstrumentedTextExtractor",
+    "InstrumentedVectorStore",
+]
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import time
+from contextlib import nullcontext
+from typing import Any, ContextManager, Iterable, Iterator, Sequence
+
+import numpy as np
+
+from app.core.metrics import MetricsRegistry
+from app.domain.entities import DocumentChunk, ExtractedPage, QueryResult
+from app.domain.repositories import VectorStore
+from app.domain.services import DocumentSource, EmbeddingService, RagService, TextExtractorService
+
+_TOKENS_PER_SECOND_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class _Instrumented:
+    """Base for wrappers; attributes other than the protocol methods come from the wrapped object."""
+
+    def __init__(self, inner: Any, metrics: MetricsRegistry | None) -> None:
+        self.inner = inner
+        self.metrics = metrics
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes missing on the wrapper: fingerprint, count_tokens, close, stats, ...
+        if name in ("inner", "metrics") or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def __getstate__(self) -> dict:
+        # Process pools pickle the wrapper; metrics recorded in workers would never reach /metrics.
+        return {"inner": self.inner, "metrics": None}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+
+    def _time(self, stage: str) -> ContextManager[None]:
+        return self.metrics.time(stage) if self.metrics is not None else nullcontext()
+
+    def _count(self, name: str, amount: float, *, description: str = "", **labels: str) -> None:
+        if self.metrics is not None:
+            self.metrics.counter(name, description=description, **labels).inc(amount)
+
+
+class InstrumentedTextExtractor(_Instrumented, TextExtractorService):
+    """Records per-page and per-document extraction time and pages by extraction path."""
+
+    def extract_text(self, source: DocumentSource) -> str:
+        return "\n".join(page.text for page in self.iter_pages(source))
+
+    def iter_pages(self, source: DocumentSource) -> Iterator[ExtractedPage]:
+        pages = iter(self.inner.iter_pages(source))
+        elapsed = 0.0
+        try:
+            while True:
+                # Only time spent producing pages counts, not time the consumer holds each one.
+                start = time.perf_counter()
+                try:
+                    page = next(pages)
+                except StopIteration:
+                    break
+                took = time.perf_counter() - start
+                elapsed += took
+                if self.metrics is not None:
+                    self.metrics.observe_stage("extract_page", took)
+                self._count(
+                    "pages_extracted",
+                    1,
+                    description="Pages extracted, by extraction path.",
+                    extraction=(page.metadata or {}).get("extraction", "unknown"),
+                )
+                yield page
+        finally:
+            close = getattr(pages, "close", None)
+            if close is not None:
+                close()
+            if self.metrics is not None:
+                self.metrics.observe_stage("extraction", elapsed)
+
+
+class InstrumentedEmbeddingService(_Instrumented, EmbeddingService):
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        with self._time("embedding"):
+            vectors = self.inner.embed(texts)
+        self._count("embedded_texts", len(texts), description="Texts embedded.")
+        return vectors
+
+
+class InstrumentedVectorStore(_Instrumented, VectorStore):
+    def add_documents(self, chunks: Iterable[DocumentChunk]) -> None:
+        chunks = list(chunks)
+        with self._time("vector_upsert"):
+            self.inner.add_documents(chunks)
+        self._count("chunks_stored", len(chunks), description="Chunks written to the vector store.")
+
+    def query(
+        self,
+        text: str,
+        limit: int = 5,
+        *,
+        where: dict[str, str] | None = None,
+        embedding: np.ndarray | None = None,
+    ) -> list[QueryResult]:
+        with self._time("vector_search"):
+            return self.inner.query(text, limit, where=where, embedding=embedding)
+
+    def delete_document(self, document_id: str) -> None:
+        with self._time("vector_delete"):
+            self.inner.delete_document(document_id)
+
+
+class InstrumentedRagService(_Instrumented, RagService):
+    """
+    Records generation time, time to first streamed token, generated tokens and tokens/sec.
+
+    Tokens are counted with the wrapped service's ``count_tokens`` when it has one.
+    """
+
+    def generate_answer(
+        self,
+        *,
+        question: str,
+        context: Sequence[DocumentChunk],
+        chat_history: Sequence[tuple[str, str]] | None = None,
+    ) -> str:
+        start = time.perf_counter()
+        with self._time("generation"):
+            answer = self.inner.generate_answer(question=question, context=context, chat_history=chat_history)
+        self._record_tokens(answer, time.perf_counter() - start)
+        return answer
+
+    def stream_answer(
+        self,
+        *,
+        question: str,
+        context: Sequence[DocumentChunk],
+        chat_history: Sequence[tuple[str, str]] | None = None,
+    ) -> Iterator[str]:
+        start = time.perf_counter()
+        parts: list[str] = []
+        try:
+            for text in self.inner.stream_answer(question=question, context=context, chat_history=chat_history):
+                if not parts and self.metrics is not None:
+                    self.metrics.observe_stage("time_to_first_token", time.perf_counter() - start)
+                parts.append(text)
+                yield text
+        finally:
+            elapsed = time.perf_counter() - start
+            if self.metrics is not None:
+                self.metrics.observe_stage("generation", elapsed)
+            self._record_tokens("".join(parts), elapsed)
+
+    def _record_tokens(self, answer: str, seconds: float) -> None:
+        count_tokens = getattr(self.inner, "count_tokens", None)
+        if self.metrics is None or count_tokens is None or not answer:
+            return
+        tokens = count_tokens(answer)
+        self._count("generated_tokens", tokens, description="Tokens generated by the RAG model.")
+        if seconds > 0:
+            self.metrics.histogram(
+                "generation_tokens_per_second",
+                buckets=_TOKENS_PER_SECOND_BUCKETS,
+                description="Decoding throughput per answer.",
+            ).observe(tokens / seconds)
@@ -0,0 +1,5 @@
+"""Ingestion job store implementations."""
+
+from .sqlite_job_store import SqliteJobStore
+
+__all__ = ["SqliteJobStore"]
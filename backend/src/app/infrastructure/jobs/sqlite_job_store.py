@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+
+from app.domain.entities import IngestionJob
+from app.domain.repositories import JobStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingestion_jobs (
+    id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    payload_path TEXT NOT NULL,
+    content_digest TEXT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    stage TEXT NOT NULL DEFAULT 'queued',
+    pages_extracted INTEGER NOT NULL DEFAULT 0,
+    chunks_embedded INTEGER NOT NULL DEFAULT 0,
+    chunks_stored INTEGER NOT NULL DEFAULT 0,
+    document_id TEXT,
+    duplicate INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    lease_expires_at TEXT,
+    created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+    updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+CREATE INDEX IF NOT EXISTS ingestion_jobs_status ON ingestion_jobs (status, created_at);
+"""
+
+_COLUMNS = (
+    "id, filename, payload_path, status, stage, pages_extracted, chunks_embedded, chunks_stored, "
+    "document_id, duplicate, error, attempts, cancel_requested, created_at, updated_at, content_digest"
+)
+_NOW = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+# Takes the lease length as a modifier parameter, e.g. "+60.0 seconds".
+_LEASE_END = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now', ?)"
+
+
+class SqliteJobStore(JobStore):
+    """
+    SQLite-backed job queue; rows survive restarts and can be claimed from several processes.
+
+    A claimed job is leased to its owner for ``lease_seconds``. The owner renews the lease while the job
+    runs, so only jobs whose worker died (and stopped renewing) are ever taken back.
+    """
+
+    def __init__(self, path: str, *, lease_seconds: float = 60.0) -> None:
+        self.lease_seconds = lease_seconds
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(ingestion_jobs)")}
+        if "content_digest" not in columns:
+            # Stores created before uploads were hashed while spooling.
+            self._conn.execute("ALTER TABLE ingestion_jobs ADD COLUMN content_digest TEXT")
+        if "owner" not in columns:
+            # Stores created before claims were leased; their running jobs count as expired.
+            self._conn.execute("ALTER TABLE ingestion_jobs ADD COLUMN owner TEXT")
+            self._conn.execute("ALTER TABLE ingestion_jobs ADD COLUMN lease_expires_at TEXT")
+
+    def create(self, job: IngestionJob) -> IngestionJob:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO ingestion_jobs (id, filename, payload_path, content_digest) VALUES (?, ?, ?, ?)",
+                (job.id, job.filename, job.payload_path, job.content_digest),
+            )
+            return self._get(job.id)  # type: ignore[return-value]
+
+    def get(self, job_id: str) -> IngestionJob | None:
+        with self._lock:
+            return self._get(job_id)
+
+    def claim_next(self, owner: str) -> IngestionJob | None:
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                "SELECT id FROM ingestion_jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                f"UPDATE ingestion_jobs SET status = 'running', stage = 'starting', attempts = attempts + 1, "
+                f"owner = ?, lease_expires_at = {_LEASE_END}, updated_at = {_NOW} WHERE id = ?",
+                (owner, f"+{self.lease_seconds} seconds", row[0]),
+            )
+            return self._get(row[0])
+
+    def update_progress(
+        self,
+        job_id: str,
+        *,
+        stage: str,
+        pages_extracted: int,
+        chunks_embedded: int,
+        chunks_stored: int,
+    ) -> bool:
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE ingestion_jobs SET stage = ?, pages_extracted = ?, chunks_embedded = ?, chunks_stored = ?, "
+                f"updated_at = {_NOW} WHERE id = ?",
+                (stage, pages_extracted, chunks_embedded, chunks_stored, job_id),
+            )
+            row = self._conn.execute("SELECT cancel_requested FROM ingestion_jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def finish(
+        self,
+        job_id: str,
+        *,
+        status: str,
+        document_id: str | None = None,
+        duplicate: bool = False,
+        error: str | None = None,
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE ingestion_jobs SET status = ?, stage = ?, document_id = ?, duplicate = ?, error = ?, "
+                f"updated_at = {_NOW} WHERE id = ?",
+                (status, status, document_id, int(duplicate), error, job_id),
+            )
+
+    def request_cancel(self, job_id: str) -> IngestionJob | None:
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                f"UPDATE ingestion_jobs SET status = 'cancelled', stage = 'cancelled', updated_at = {_NOW} "
+                "WHERE id = ? AND status = 'queued'",
+                (job_id,),
+            )
+            self._conn.execute(
+                f"UPDATE ingestion_jobs SET cancel_requested = 1, updated_at = {_NOW} "
+                "WHERE id = ? AND status = 'running'",
+                (job_id,),
+            )
+            return self._get(job_id)
+
+    def requeue(self, job_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE ingestion_jobs SET status = 'queued', stage = 'queued', updated_at = {_NOW} "
+                "WHERE id = ? AND status = 'running'",
+                (job_id,),
+            )
+
+    def renew_leases(self, owner: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE ingestion_jobs SET lease_expires_at = {_LEASE_END} WHERE owner = ? AND status = 'running'",
+                (f"+{self.lease_seconds} seconds", owner),
+            )
+
+    def requeue_interrupted(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE ingestion_jobs SET status = CASE WHEN cancel_requested THEN 'cancelled' ELSE 'queued' END, "
+                f"stage = CASE WHEN cancel_requested THEN 'cancelled' ELSE 'queued' END, updated_at = {_NOW} "
+                f"WHERE status = 'running' AND (lease_expires_at IS NULL OR lease_expires_at < {_NOW})"
+            )
+            return cursor.rowcount
+
+    def count_by_status(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM ingestion_jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _get(self, job_id: str) -> IngestionJob | None:
+        row = self._conn.execute(f"SELECT {_COLUMNS} FROM ingestion_jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return IngestionJob(
+            id=row[0],
+            filename=row[1],
+            payload_path=row[2],
+            status=row[3],
+            stage=row[4],
+            pages_extracted=row[5],
+            chunks_embedded=row[6],
+            chunks_stored=row[7],
+            document_id=row[8],
+            duplicate=bool(row[9]),
+            error=row[10],
+            attempts=row[11],
+            cancel_requested=bool(row[12]),
+            created_at=row[13],
+            updated_at=row[14],
+            content_digest=row[15],
+        )
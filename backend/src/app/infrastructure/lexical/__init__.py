@@ -0,0 +1,5 @@
+"""Lexical (keyword) index implementations."""
+
+from .bm25 import SqliteBm25Index, tokenize
+
+__all__ = ["SqliteBm25Index", "tokenize"]
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, List
+
+from app.domain.entities import DocumentChunk, QueryResult
+from app.domain.repositories import LexicalIndex
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bm25_chunks (
+    id INTEGER PRIMARY KEY,
+    chunk_id TEXT NOT NULL UNIQUE,
+    document_id TEXT,
+    content TEXT NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bm25_chunks_document_id ON bm25_chunks (document_id);
+-- Holds the output of ``tokenize`` (space-separated); the extra token characters keep compound
+-- identifiers such as "err-1042" whole, exactly as ``tokenize`` emitted them.
+CREATE VIRTUAL TABLE IF NOT EXISTS bm25_terms USING fts5(terms, tokenize = "unicode61 tokenchars '-_./:'");
+CREATE VIRTUAL TABLE IF NOT EXISTS bm25_vocab USING fts5vocab(bm25_terms, row);
+"""
+
+# Tables of the earlier pure-Python index; their chunks are moved into FTS5 on first open.
+_LEGACY_TABLES = ("bm25_postings", "bm25_docs", "bm25_stats")
+
+# Terms in fewer chunks than this are always scored: ranking their matches is cheap anyway.
+_PRUNE_MIN_DOC_FREQ = 1000
+
+# Keeps identifiers such as "ERR-1042", "v2.3.1" or "part_no_77" together as one token.
+_TOKEN_RE = re.compile(r"[0-9a-z]+(?:[-_./:][0-9a-z]+)*")
+_PART_RE = re.compile(r"[0-9a-z]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens; compound identifiers also emit their parts so partial matches still score."""
+    tokens: list[str] = []
+    for match in _TOKEN_RE.finditer(text.lower()):
+        token = match.group(0)
+        tokens.append(token)
+        parts = _PART_RE.findall(token)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+class SqliteBm25Index(LexicalIndex):
+    """
+    Okapi BM25 (k1=1.2, b=0.75) over an SQLite FTS5 full-text index.
+
+    Notes:
+    - Chunks are indexed as they are stored, so the index never needs a rebuild.
+    - Matching and ranking run inside SQLite, so common query terms cost no Python work per posting.
+    - Each thread uses its own connection; searches run concurrently and writers are serialised by
+      SQLite itself, which also keeps worker processes sharing the file consistent.
+    """
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        self._migrate_legacy(conn)
+
+    def add(self, chunks: Iterable[DocumentChunk]) -> None:
+        chunk_list = list(chunks)
+        if not chunk_list:
+            return
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._insert(conn, chunk_list)
+
+    def delete_document(self, document_id: str) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "DELETE FROM bm25_terms WHERE rowid IN (SELECT id FROM bm25_chunks WHERE document_id = ?)",
+                (document_id,),
+            )
+            conn.execute("DELETE FROM bm25_chunks WHERE document_id = ?", (document_id,))
+
+    def search(self, text: str, limit: int = 5, *, where: dict[str, str] | None = None) -> List[QueryResult]:
+        terms = list(dict.fromkeys(tokenize(text)))
+        if not terms or limit <= 0:
+            return []
+        conn = self._conn()
+        terms = _selective_terms(conn, terms)
+        if not terms:
+            return []
+        filter_sql, filter_params = _filter_clause(where)
+        # Quoted, so FTS5 reads every token literally (tokens never contain a double quote).
+        match = " OR ".join(f'"{term}"' for term in terms)
+        rows = conn.execute(
+            "SELECT d.chunk_id, d.content, d.metadata, bm25(bm25_terms) AS rank FROM bm25_terms "
+            f"JOIN bm25_chunks d ON d.id = bm25_terms.rowid WHERE bm25_terms MATCH ?{filter_sql} "
+            "ORDER BY rank LIMIT ?",
+            (match, *filter_params, limit),
+        ).fetchall()
+        # FTS5 reports BM25 negated (lower is better).
+        return [
+            QueryResult(chunk=DocumentChunk(id=chunk_id, content=content, metadata=json.loads(metadata)), score=-rank)
+            for chunk_id, content, metadata, rank in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30.0)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, chunks: list[DocumentChunk]) -> None:
+        placeholders = ",".join("?" for _ in chunks)
+        chunk_ids = [chunk.id for chunk in chunks]
+        conn.execute(
+            f"DELETE FROM bm25_terms WHERE rowid IN (SELECT id FROM bm25_chunks WHERE chunk_id IN ({placeholders}))",
+            chunk_ids,
+        )
+        conn.execute(f"DELETE FROM bm25_chunks WHERE chunk_id IN ({placeholders})", chunk_ids)
+        for chunk in chunks:
+            cursor = conn.execute(
+                "INSERT INTO bm25_chunks (chunk_id, document_id, content, metadata) VALUES (?, ?, ?, ?)",
+                (chunk.id, (chunk.metadata or {}).get("document_id"), chunk.content, json.dumps(chunk.metadata or {})),
+            )
+            terms = " ".join(tokenize(chunk.content))
+            conn.execute("INSERT INTO bm25_terms (rowid, terms) VALUES (?, ?)", (cursor.lastrowid, terms))
+
+    def _migrate_legacy(self, conn: sqlite3.Connection) -> None:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            legacy = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'bm25_docs'").fetchone()
+            if legacy is None:
+                return
+            chunks = [
+                DocumentChunk(id=chunk_id, content=content, metadata=json.loads(metadata))
+                for chunk_id, content, metadata in conn.execute("SELECT chunk_id, content, metadata FROM bm25_docs")
+            ]
+            if chunks:
+                self._insert(conn, chunks)
+            for table in _LEGACY_TABLES:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            logger.info("Moved %d chunks from the legacy BM25 tables into FTS5", len(chunks))
+
+
+def _selective_terms(conn: sqlite3.Connection, terms: list[str]) -> list[str]:
+    """
+    Drop terms that occur in no chunk, or in at least half of a large index. FTS5 gives the latter an
+    IDF of ~0, so they barely move the ranking, but scoring every chunk that contains one dominates
+    query time. The rarest term is kept when all of them are that common.
+    """
+    (n_chunks,) = conn.execute("SELECT count(*) FROM bm25_chunks").fetchone()
+    placeholders = ",".join("?" for _ in terms)
+    doc_freq = dict(conn.execute(f"SELECT term, doc FROM bm25_vocab WHERE term IN ({placeholders})", terms).fetchall())
+    present = [term for term in terms if doc_freq.get(term)]
+    selective = [
+        term for term in present if doc_freq[term] < _PRUNE_MIN_DOC_FREQ or doc_freq[term] * 2 < n_chunks
+    ]
+    if selective or not present:
+        return selective
+    return [min(present, key=doc_freq.__getitem__)]
+
+
+def _filter_clause(where: dict[str, str] | None) -> tuple[str, list[str]]:
+    if not where:
+        return "", []
+    clauses: list[str] = []
+    params: list[str] = []
+    for key, value in where.items():
+        if key == "document_id":
+            clauses.append("d.document_id = ?")
+        else:
+            clauses.append("json_extract(d.metadata, ?) = ?")
+            params.append(f"$.{key}")
+        params.append(value)
+    return " AND " + " AND ".join(clauses), params
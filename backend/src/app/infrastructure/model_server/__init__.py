@@ -0,0 +1,12 @@
+"""Clients for the out-of-process model server (``kb-model-server``)."""
+
+from .client import ModelServerClient, ModelServerError, parse_model_server_url
+from .remote import RemoteEmbeddingService, RemoteRagService
+
+__all__ = [
+    "ModelServerClient",
+    "ModelServerError",
+    "RemoteEmbeddingService",
+    "RemoteRagService",
+    "parse_model_server_url",
+]
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import http.client
+import json
+import logging
+import socket
+import threading
+import time
+from typing import Any, Iterator
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Raised by a kept-alive connection the server has since closed; safe to retry on a fresh one.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class ModelServerError(RuntimeError):
+    """The model server is unreachable or answered with an error status."""
+
+    def __init__(self, message: str, *, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def parse_model_server_url(url: str) -> tuple[str | None, str, int]:
+    """Split ``unix:///path/to.sock`` or ``http://host:port`` into ``(socket_path, host, port)``."""
+    parts = urlsplit(url)
+    if parts.scheme == "unix":
+        path = f"{parts.netloc}{parts.path}"
+        if not path:
+            raise ValueError(f"Model server URL {url!r} has no socket path.")
+        return path, "localhost", 0
+    if parts.scheme == "http" and parts.hostname:
+        return None, parts.hostname, parts.port or 80
+    raise ValueError(f"Model server URL {url!r} must look like unix:///path/to.sock or http://host:port.")
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, *, timeout: float) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class ModelServerClient:
+    """
+    Blocking HTTP/1.1 client for ``kb-model-server``.
+
+    Each thread keeps its own keep-alive connection, so pool threads send requests concurrently
+    and the server can batch them (together with those of other API workers).
+    """
+
+    def __init__(self, url: str, *, timeout: float = 300.0) -> None:
+        self.url = url
+        self.timeout = timeout
+        self.socket_path, self.host, self.port = parse_model_server_url(url)
+        self._local = threading.local()
+        self._connections: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def get_json(self, path: str) -> Any:
+        return json.loads(self._request("GET", path).read())
+
+    def post_json(self, path: str, payload: dict[str, Any]) -> Any:
+        return json.loads(self._request("POST", path, payload).read())
+
+    def post(self, path: str, payload: dict[str, Any]) -> http.client.HTTPResponse:
+        """Send a request and return the response with its body unread (the caller must consume it)."""
+        return self._request("POST", path, payload)
+
+    def stream_lines(self, path: str, payload: dict[str, Any]) -> Iterator[Any]:
+        """POST ``payload`` and yield the JSON objects of a newline-delimited response as they arrive."""
+        response = self._request("POST", path, payload)
+        finished = False
+        try:
+            for line in response:
+                if line.strip():
+                    yield json.loads(line)
+            finished = True
+        finally:
+            if not finished:
+                # Stopped mid-stream: the connection cannot be reused, and closing it tells the
+                # server to stop generating.
+                self._discard_connection()
+
+    def wait_ready(self, timeout: float) -> None:
+        """Poll ``/ready`` until the server has loaded its models."""
+        deadline = time.monotonic() + timeout
+        last_error = "no response"
+        while True:
+            try:
+                response = self._request("GET", "/ready", check=False)
+                body = response.read()
+                if response.status == 200:
+                    return
+                last_error = body.decode(errors="replace")
+            except ModelServerError as exc:
+                last_error = str(exc)
+            if time.monotonic() >= deadline:
+                raise ModelServerError(f"Model server at {self.url} not ready after {timeout:.0f}s: {last_error}")
+            time.sleep(1.0)
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+
+    def _request(
+        self, method: str, path: str, payload: dict[str, Any] | None = None, *, check: bool = True
+    ) -> http.client.HTTPResponse:
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                break
+            except _STALE_CONNECTION_ERRORS as exc:
+                self._discard_connection()
+                if attempt:
+                    raise ModelServerError(f"Model server at {self.url} closed the connection: {exc}") from exc
+            except OSError as exc:
+                self._discard_connection()
+                raise ModelServerError(f"Model server at {self.url} is unreachable: {exc}") from exc
+        if check and response.status >= 400:
+            detail = response.read().decode(errors="replace")
+            try:
+                detail = json.loads(detail).get("detail", detail)
+            except (ValueError, AttributeError):
+                pass
+            raise ModelServerError(f"Model server returned {response.status}: {detail}", status=response.status)
+        return response
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            if self.socket_path is not None:
+                connection = _UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+            else:
+                connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _discard_connection(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            return
+        self._local.connection = None
+        connection.close()
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
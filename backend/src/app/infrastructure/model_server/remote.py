@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Iterator, Sequence
+
+import numpy as np
+from transformers import AutoTokenizer
+
+from app.domain import DocumentChunk, EmbeddingService, RagService
+from app.infrastructure.model_server.client import ModelServerClient, ModelServerError
+
+
+class _LocalTokenizer:
+    """Counts tokens in-process: chunking calls it per sentence, far too often for a round trip."""
+
+    def __init__(self, model_name: str) -> None:
+        self.model_name = model_name
+        self._tokenizer: Any = None
+        self._lock = threading.Lock()
+
+    def count(self, text: str) -> int:
+        if self._tokenizer is None:
+            with self._lock:
+                if self._tokenizer is None:
+                    self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        return len(self._tokenizer(text, add_special_tokens=False)["input_ids"])
+
+
+class RemoteEmbeddingService(EmbeddingService):
+    """
+    ``EmbeddingService`` backed by ``kb-model-server``.
+
+    Waits for the server to finish loading, then takes the model name, token limit and fingerprint
+    from it, so content keys match those of the same model loaded in-process. Vectors travel as raw
+    float32 bytes.
+    """
+
+    def __init__(self, client: ModelServerClient, *, ready_timeout: float = 300.0) -> None:
+        self.client = client
+        client.wait_ready(ready_timeout)
+        info = client.get_json("/info")["embedding"]
+        self.model_name: str = info["model_name"]
+        self._fingerprint: str = info["fingerprint"]
+        self._max_tokens = int(info["max_tokens"])
+        self._tokenizer = _LocalTokenizer(self.model_name)
+
+    @property
+    def fingerprint(self) -> str:
+        return self._fingerprint
+
+    @property
+    def max_tokens(self) -> int:
+        return self._max_tokens
+
+    def count_tokens(self, text: str) -> int:
+        return self._tokenizer.count(text)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        response = self.client.post("/embed", {"texts": list(texts)})
+        rows, dim = (int(value) for value in response.getheader("X-Embedding-Shape", "0,0").split(","))
+        vectors = np.empty((rows, dim), dtype=np.float32)
+        # Read straight into the result array instead of copying the body.
+        view = memoryview(vectors.reshape(-1).view(np.uint8))
+        filled = 0
+        while filled < len(view):
+            read = response.readinto(view[filled:])
+            if not read:
+                raise ModelServerError(f"Model server sent {filled} of {len(view)} embedding bytes.")
+            filled += read
+        response.read()
+        return vectors
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class RemoteRagService(RagService):
+    """``RagService`` backed by ``kb-model-server``; prompts are built and batched on the server."""
+
+    def __init__(self, client: ModelServerClient, *, ready_timeout: float = 300.0) -> None:
+        self.client = client
+        client.wait_ready(ready_timeout)
+        self.model_name: str = client.get_json("/info")["generation"]["model_name"]
+        self._tokenizer = _LocalTokenizer(self.model_name)
+
+    def generate_answer(
+        self,
+        *,
+        question: str,
+        context: Sequence[DocumentChunk],
+        chat_history: Sequence[tuple[str, str]] | None = None,
+    ) -> str:
+        return self.client.post_json("/generate", _generation_payload(question, context, chat_history))["answer"]
+
+    def stream_answer(
+        self,
+        *,
+        question: str,
+        context: Sequence[DocumentChunk],
+        chat_history: Sequence[tuple[str, str]] | None = None,
+    ) -> Iterator[str]:
+        for event in self.client.stream_lines("/generate/stream", _generation_payload(question, context, chat_history)):
+            if "error" in event:
+                raise ModelServerError(f"Generation failed on the model server: {event['error']}")
+            yield event["text"]
+
+    def count_tokens(self, text: str) -> int:
+        return self._tokenizer.count(text)
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def _generation_payload(
+    question: str, context: Sequence[DocumentChunk], chat_history: Sequence[tuple[str, str]] | None
+) -> dict[str, Any]:
+    return {
+        "question": question,
+        # Embeddings are not needed to build the prompt.
+        "context": [{"id": chunk.id, "content": chunk.content, "metadata": chunk.metadata} for chunk in context],
+        "chat_history": [list(turn) for turn in chat_history] if chat_history else None,
+    }
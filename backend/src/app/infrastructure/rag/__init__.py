@@ -1,3 +1,5 @@
+from .context_builder import BuiltContext, TokenBudgetContextBuilder
+from .generation_scheduler import BatchingGenerationScheduler
 from .langchain_rag_service import LangChainRagService
 
-__all__ = ["LangChainRagService"]
+__all__ = ["BatchingGenerationScheduler", "BuiltContext", "LangChainRagService", "TokenBudgetContextBuilder"]
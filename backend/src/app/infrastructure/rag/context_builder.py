@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Callable, Sequence
+
+from app.domain import DocumentChunk
+
+_SHINGLE_SIZE = 3
+
+
+@dataclass
+class BuiltContext:
+    chunks: list[DocumentChunk]
+    token_count: int
+    dropped: int = 0
+    trimmed: int = 0
+
+
+class TokenBudgetContextBuilder:
+    """
+    Selects retrieved chunks, in score order, until a token budget is spent.
+
+    Notes:
+    - Near-duplicate chunks (word-shingle Jaccard >= ``duplicate_threshold``) are dropped.
+    - Text a chunk shares with an already selected neighbour (the chunker's character overlap)
+      is trimmed, so it is not paid for twice.
+    - The first chunk that does not fit is cut to the remaining budget when at least
+      ``min_chunk_tokens`` are left; everything after it is dropped.
+    """
+
+    def __init__(
+        self,
+        count_tokens: Callable[[str], int],
+        *,
+        max_tokens: int = 2048,
+        duplicate_threshold: float = 0.8,
+        min_overlap_chars: int = 20,
+        min_chunk_tokens: int = 32,
+    ) -> None:
+        self.count_tokens = count_tokens
+        self.max_tokens = max_tokens
+        self.duplicate_threshold = duplicate_threshold
+        self.min_overlap_chars = min_overlap_chars
+        self.min_chunk_tokens = min_chunk_tokens
+
+    def build(self, chunks: Sequence[DocumentChunk], *, max_tokens: int | None = None) -> BuiltContext:
+        budget = self.max_tokens if max_tokens is None else min(max_tokens, self.max_tokens)
+        selected: list[DocumentChunk] = []
+        selected_shingles: list[set[tuple[str, ...]]] = []
+        used = dropped = trimmed = 0
+
+        for index, chunk in enumerate(chunks):
+            content = chunk.content.strip()
+            if not content:
+                continue
+            shingles = _shingles(content)
+            if any(_jaccard(shingles, other) >= self.duplicate_threshold for other in selected_shingles):
+                dropped += 1
+                continue
+            for other in selected:
+                content = self._trim_overlap(content, other.content)
+            if not content:
+                dropped += 1
+                continue
+            was_trimmed = len(content) < len(chunk.content.strip())
+
+            tokens = self.count_tokens(content)
+            remaining = budget - used
+            if tokens > remaining:
+                if remaining >= self.min_chunk_tokens:
+                    content = self._truncate(content, remaining)
+                    tokens = self.count_tokens(content)
+                    selected.append(replace(chunk, content=content))
+                    used += tokens
+                    trimmed += 1
+                    dropped += len(chunks) - index - 1
+                else:
+                    dropped += len(chunks) - index
+                break
+
+            selected.append(replace(chunk, content=content) if content != chunk.content else chunk)
+            selected_shingles.append(shingles)
+            used += tokens
+            trimmed += was_trimmed
+
+        return BuiltContext(chunks=selected, token_count=used, dropped=dropped, trimmed=trimmed)
+
+    def _trim_overlap(self, content: str, other: str) -> str:
+        """Remove a prefix or suffix of ``content`` that ``other`` already ends or starts with."""
+        head = _overlap(other, content, self.min_overlap_chars)
+        if head:
+            content = content[head:].lstrip()
+        tail = _overlap(content, other, self.min_overlap_chars)
+        if tail:
+            content = content[:-tail].rstrip()
+        return content
+
+    def _truncate(self, content: str, max_tokens: int) -> str:
+        # Binary search on characters; token counts grow monotonically with prefix length.
+        low, high = 0, len(content)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.count_tokens(content[:middle]) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        cut = content[:low]
+        # Prefer ending on a word boundary.
+        space = cut.rfind(" ")
+        return cut[:space] if space > len(cut) // 2 else cut
+
+
+def _overlap(left: str, right: str, min_chars: int) -> int:
+    """Length of the longest suffix of ``left`` that is also a prefix of ``right`` (0 if below ``min_chars``)."""
+    for size in range(min(len(left), len(right)), min_chars - 1, -1):
+        if left.endswith(right[:size]):
+            return size
+    return 0
+
+
+def _shingles(text: str) -> set[tuple[str, ...]]:
+    words = text.lower().split()
+    if len(words) < _SHINGLE_SIZE:
+        return {tuple(words)}
+    return {tuple(words[i : i + _SHINGLE_SIZE]) for i in range(len(words) - _SHINGLE_SIZE + 1)}
+
+
+def _jaccard(left: set[tuple[str, ...]], right: set[tuple[str, ...]]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
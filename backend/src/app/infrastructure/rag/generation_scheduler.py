@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+import torch
+from transformers import StoppingCriteria, StoppingCriteriaList
+
+logger = logging.getLogger(__name__)
+
+_SHUTDOWN = object()
+_END = object()
+
+
+@dataclass
+class _Request:
+    prompt: str
+    future: Future[str] = field(default_factory=Future)
+    # Decoded text pieces for streaming callers, then ``_END`` or the exception that stopped generation.
+    pieces: queue.Queue[Any] | None = None
+    cancelled: threading.Event = field(default_factory=threading.Event)
+
+
+class BatchingGenerationScheduler:
+    """
+    Gathers prompts from concurrent callers into padded batches for a single ``model.generate`` call.
+
+    A batch is dispatched once ``max_batch_size`` prompts are waiting or the oldest one has waited
+    ``max_wait_ms``. Callers block in ``generate`` until their own completion is decoded, or iterate
+    ``stream`` to receive it piece by piece, so either can be used from the generation executor pool
+    as a drop-in for a per-request pipeline call. Streaming and blocking prompts share batches.
+    """
+
+    def __init__(
+        self,
+        *,
+        model: Any,
+        tokenizer: Any,
+        generation_kwargs: dict[str, Any],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 20.0,
+    ) -> None:
+        self.model = model
+        self.tokenizer = tokenizer
+        self.generation_kwargs = generation_kwargs
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_wait = max(max_wait_ms, 0.0) / 1000
+        self.is_encoder_decoder = bool(getattr(model.config, "is_encoder_decoder", False))
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="generation-scheduler", daemon=True)
+        self._worker.start()
+
+    def generate(self, prompt: str) -> str:
+        request = _Request(prompt)
+        self._queue.put(request)
+        return request.future.result()
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield the completion as it is decoded; closing the iterator drops the prompt from its batch."""
+        request = _Request(prompt, pieces=queue.Queue())
+        self._queue.put(request)
+        try:
+            while (piece := request.pieces.get()) is not _END:
+                if isinstance(piece, BaseException):
+                    raise piece
+                yield piece
+        finally:
+            request.cancelled.set()
+
+    def close(self) -> None:
+        self._queue.put(_SHUTDOWN)
+        self._worker.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _SHUTDOWN:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _SHUTDOWN:
+                    self._queue.put(_SHUTDOWN)
+                    break
+                batch.append(item)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: list[_Request]) -> None:
+        batch = [request for request in batch if not request.cancelled.is_set()]
+        if not batch:
+            return
+        streamer = _BatchStreamer(self.tokenizer, batch) if any(r.pieces is not None for r in batch) else None
+        started = time.perf_counter()
+        try:
+            outputs = self._generate_batch(batch, streamer)
+        except Exception as exc:  # noqa: BLE001 - propagated to every waiting caller
+            logger.exception("Batched generation failed for %d prompts", len(batch))
+            if streamer is not None:
+                streamer.fail(exc)
+            for request in batch:
+                request.future.set_exception(exc)
+            return
+        logger.info("Generated batch of %d prompts in %.2fs", len(batch), time.perf_counter() - started)
+        for request, output in zip(batch, outputs):
+            request.future.set_result(output)
+
+    @torch.inference_mode()
+    def _generate_batch(self, batch: list[_Request], streamer: _BatchStreamer | None) -> list[str]:
+        inputs = self._encode([request.prompt for request in batch])
+        output_ids = self.model.generate(
+            **inputs,
+            **self.generation_kwargs,
+            pad_token_id=self.tokenizer.pad_token_id,
+            streamer=streamer,
+            stopping_criteria=StoppingCriteriaList([_StopCancelled(batch)]),
+        )
+        if not self.is_encoder_decoder:
+            # Causal models echo the (padded) prompt; keep only the newly generated tokens.
+            output_ids = output_ids[:, inputs["input_ids"].shape[1] :]
+        return [text.strip() for text in self.tokenizer.batch_decode(output_ids, skip_special_tokens=True)]
+
+    def _encode(self, prompts: list[str]) -> dict[str, torch.Tensor]:
+        """
+        Tokenize and pad ``prompts`` here rather than through the tokenizer, whose padding side is shared
+        state: decoder-only models continue from the last position, so their prompts are left-padded.
+        """
+        encoded = self.tokenizer(prompts)["input_ids"]
+        width = max(len(ids) for ids in encoded)
+        pad_id = self.tokenizer.pad_token_id if self.tokenizer.pad_token_id is not None else 0
+        input_ids = torch.full((len(encoded), width), pad_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(encoded), width), dtype=torch.long)
+        for row, ids in enumerate(encoded):
+            start = 0 if self.is_encoder_decoder else width - len(ids)
+            input_ids[row, start : start + len(ids)] = torch.tensor(ids, dtype=torch.long)
+            attention_mask[row, start : start + len(ids)] = 1
+        return {"input_ids": input_ids.to(self.model.device), "attention_mask": attention_mask.to(self.model.device)}
+
+
+class _StopCancelled(StoppingCriteria):
+    """Finishes the rows whose streaming caller has gone away; the batch stops once none is left."""
+
+    def __init__(self, batch: list[_Request]) -> None:
+        self.batch = batch
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs: Any) -> torch.BoolTensor:
+        return torch.tensor([request.cancelled.is_set() for request in self.batch], device=input_ids.device)
+
+
+class _BatchStreamer:
+    """
+    ``model.generate`` streamer for a whole batch: routes each row's newly decoded text to its caller
+    and ends a row's stream at its EOS token rather than when the longest row finishes.
+    """
+
+    def __init__(self, tokenizer: Any, batch: list[_Request]) -> None:
+        self.tokenizer = tokenizer
+        self.batch = batch
+        eos = tokenizer.eos_token_id
+        self.eos_ids = set(eos) if isinstance(eos, list) else {eos}
+        self.tokens: list[list[int]] = [[] for _ in batch]
+        self.sent = [0] * len(batch)
+        self.ended = [request.pieces is None for request in batch]
+        self._prompt_skipped = False
+
+    def put(self, value: torch.Tensor) -> None:
+        if not self._prompt_skipped:
+            # The first call carries the prompt (or the decoder start tokens), not generated text.
+            self._prompt_skipped = True
+            return
+        for row, token in enumerate(value.reshape(len(self.batch), -1)[:, -1].tolist()):
+            if self.ended[row]:
+                continue
+            if token in self.eos_ids:
+                self._end(row)
+                continue
+            self.tokens[row].append(token)
+            self._send(row)
+
+    def end(self) -> None:
+        for row in range(len(self.batch)):
+            if not self.ended[row]:
+                self._end(row)
+
+    def fail(self, exc: BaseException) -> None:
+        for row, request in enumerate(self.batch):
+            if not self.ended[row]:
+                self.ended[row] = True
+                request.pieces.put(exc)
+
+    def _send(self, row: int) -> None:
+        text = self.tokenizer.decode(self.tokens[row], skip_special_tokens=True)
+        # A trailing replacement character is an incomplete multi-byte sequence; wait for the next token.
+        if text.endswith("\ufffd"):
+            return
+        if len(text) > self.sent[row]:
+            self.batch[row].pieces.put(text[self.sent[row] :])
+            self.sent[row] = len(text)
+
+    def _end(self, row: int) -> None:
+        self.ended[row] = True
+        self.batch[row].pieces.put(_END)
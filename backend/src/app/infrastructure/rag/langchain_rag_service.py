@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import logging
-from typing import Sequence
+import os
+import threading
+import time
+from typing import Any, Iterator, Literal, Sequence
 
 import torch
 from langchain_community.llms.huggingface_pipeline import HuggingFacePipeline
@@ -10,13 +13,28 @@ from transformers import (
     AutoModelForCausalLM,
     AutoModelForSeq2SeqLM,
     AutoTokenizer,
+    StoppingCriteria,
+    StoppingCriteriaList,
+    TextIteratorStreamer,
     pipeline,
 )
 
+from app.core.metrics import MetricsRegistry
 from app.domain import DocumentChunk, RagService
+from app.infrastructure.inference import ONNX_INSTALL_HINT, export_directory, onnx_session_options, quantize_linear_int8
+from app.infrastructure.rag.context_builder import TokenBudgetContextBuilder
+from app.infrastructure.rag.generation_scheduler import BatchingGenerationScheduler
 
 logger = logging.getLogger(__name__)
 
+RagBackend = Literal["torch", "torch-int8", "onnx"]
+
+_PROMPT_TEMPLATE = (
+    "You are a helpful assistant. Use the provided context to answer the question. "
+    "If the answer is not in the context, say you do not know.\n\n"
+    "Context:\n{context}\n\nQuestion: {question}\nAnswer:"
+)
+
 
 def _device_map() -> str | None:
     """Prefer GPU when available; let HF/Accelerate decide placement."""
@@ -27,8 +45,23 @@ def _device_map() -> str | None:
     return None
 
 
+class _StopOnEvent(StoppingCriteria):
+    """Stops ``generate`` early once the streaming consumer has gone away."""
+
+    def __init__(self, event: threading.Event) -> None:
+        self.event = event
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs: Any) -> bool:
+        return self.event.is_set()
+
+
 class LangChainRagService(RagService):
-    """RAG answer generation using a HuggingFace text2text model via LangChain."""
+    """
+    RAG answer generation using a HuggingFace text2text model via LangChain.
+
+    ``backend`` selects eager PyTorch (``torch``), PyTorch with int8 linear layers on the CPU
+    (``torch-int8``), or an ONNX Runtime export of the model (``onnx``, cached under ``export_dir``).
+    """
 
     def __init__(
         self,
@@ -36,17 +69,43 @@ class LangChainRagService(RagService):
         model_name: str = "google/flan-t5-small",
         max_new_tokens: int = 256,
         temperature: float = 0.0,
+        max_batch_size: int = 1,
+        max_batch_wait_ms: float = 20.0,
+        context_max_tokens: int = 2048,
+        metrics: MetricsRegistry | None = None,
+        backend: RagBackend = "torch",
+        threads: int | None = None,
+        export_dir: str = "./data/onnx",
     ) -> None:
-        device_map = _device_map()
-        logger.info("Loading RAG model %s with device_map=%s", model_name, device_map)
-        self.llm = HuggingFacePipeline(
-            pipeline=_build_generation_pipeline(
-                model_name=model_name,
-                device_map=device_map,
-                max_new_tokens=max_new_tokens,
-                temperature=temperature,
-            )
+        self.metrics = metrics
+        device_map = _device_map() if backend == "torch" else None
+        logger.info("Loading RAG model %s with backend=%s device_map=%s", model_name, backend, device_map)
+        self.pipeline = _build_generation_pipeline(
+            model_name=model_name,
+            device_map=device_map,
+            max_new_tokens=max_new_tokens,
+            temperature=temperature,
+            backend=backend,
+            threads=threads,
+            export_dir=export_dir,
         )
+        self.llm = HuggingFacePipeline(pipeline=self.pipeline)
+        self.context_builder = TokenBudgetContextBuilder(self.count_tokens, max_tokens=context_max_tokens)
+        self.context_window = _context_window(self.pipeline)
+        # Causal models share the window between the prompt and the generated tokens.
+        self.reserved_tokens = 0 if getattr(self.pipeline.model.config, "is_encoder_decoder", False) else max_new_tokens
+        self.generation_kwargs: dict[str, Any] = {"max_new_tokens": max_new_tokens, "do_sample": temperature > 0}
+        if temperature > 0:
+            self.generation_kwargs["temperature"] = temperature
+        self.scheduler: BatchingGenerationScheduler | None = None
+        if max_batch_size > 1:
+            self.scheduler = BatchingGenerationScheduler(
+                model=self.pipeline.model,
+                tokenizer=self.pipeline.tokenizer,
+                generation_kwargs=self.generation_kwargs,
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_batch_wait_ms,
+            )
 
     def generate_answer(
         self,
@@ -56,20 +115,110 @@ class LangChainRagService(RagService):
         chat_history: Sequence[tuple[str, str]] | None = None,
     ) -> str:
         _ = chat_history  # Reserved for future use
-        context_text = "\n\n".join(
-            f"[{idx + 1}] {chunk.content}" for idx, chunk in enumerate(context) if chunk.content
-        )
+        prompt = self._build_prompt(question=question, context=context)
+        if self.scheduler is not None:
+            return self.scheduler.generate(prompt)
+        return self.llm.invoke(prompt)
+
+    def stream_answer(
+        self,
+        *,
+        question: str,
+        context: Sequence[DocumentChunk],
+        chat_history: Sequence[tuple[str, str]] | None = None,
+    ) -> Iterator[str]:
+        _ = chat_history  # Reserved for future use
+        prompt = self._build_prompt(question=question, context=context)
+        if self.scheduler is not None:
+            # Streams share decoding batches with other requests instead of running their own generate.
+            yield from self.scheduler.stream(prompt)
+            return
+        tokenizer = self.pipeline.tokenizer
+        model = self.pipeline.model
+
+        inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
+        streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+        stop = threading.Event()
+        errors: list[BaseException] = []
+        generation_kwargs = {
+            **inputs,
+            **self.generation_kwargs,
+            "pad_token_id": tokenizer.pad_token_id,
+            "streamer": streamer,
+            "stopping_criteria": StoppingCriteriaList([_StopOnEvent(stop)]),
+        }
+
+        def _generate() -> None:
+            try:
+                model.generate(**generation_kwargs)
+            except BaseException as exc:  # noqa: BLE001 - re-raised on the consuming thread
+                errors.append(exc)
+                streamer.end()
+
+        generation = threading.Thread(target=_generate, daemon=True)
+        generation.start()
+        try:
+            for text in streamer:
+                if text:
+                    yield text
+        finally:
+            stop.set()
+            generation.join()
+        if errors:
+            raise errors[0]
+
+    def warmup(self) -> None:
+        """Decode a single token so CUDA kernels and allocator pools exist before the first request."""
+        tokenizer = self.pipeline.tokenizer
+        model = self.pipeline.model
+        inputs = tokenizer("Hello", return_tensors="pt").to(model.device)
+        with torch.inference_mode():
+            model.generate(**inputs, max_new_tokens=1, pad_token_id=tokenizer.pad_token_id)
+
+    def close(self) -> None:
+        if self.scheduler is not None:
+            self.scheduler.close()
+
+    def _build_prompt(self, *, question: str, context: Sequence[DocumentChunk]) -> str:
+        start = time.perf_counter()
+        window_budget = None
+        if self.context_window is not None:
+            frame_tokens = self.count_tokens(_PROMPT_TEMPLATE.format(context="", question=question))
+            window_budget = max(self.context_window - self.reserved_tokens - frame_tokens, 0)
+        built = self.context_builder.build(context, max_tokens=window_budget)
+
+        context_text = "\n\n".join(f"[{idx + 1}] {chunk.content}" for idx, chunk in enumerate(built.chunks))
         if not context_text:
             context_text = "No relevant context was retrieved."
 
-        prompt = (
-            "You are a helpful assistant. Use the provided context to answer the question. "
-            "If the answer is not in the context, say you do not know.\n\n"
-            f"Context:\n{context_text}\n\nQuestion: {question}\nAnswer:"
+        prompt = _PROMPT_TEMPLATE.format(context=context_text, question=question)
+        prompt_tokens = self.count_tokens(prompt)
+        if self.metrics is not None:
+            self.metrics.observe_stage("prompt_build", time.perf_counter() - start)
+            self.metrics.counter("prompt_tokens", description="Prompt tokens sent to the RAG model.").inc(prompt_tokens)
+        logger.info(
+            "[rag] prompt tokens=%d (context tokens=%d, chunks kept=%d dropped=%d trimmed=%d)",
+            prompt_tokens,
+            built.token_count,
+            len(built.chunks),
+            built.dropped,
+            built.trimmed,
         )
-        logger.info(f"[rag] prompt: {prompt}")
+        logger.debug("[rag] prompt: %s", prompt)
+        return prompt
 
-        return self.llm.invoke(prompt)
+    def count_tokens(self, text: str) -> int:
+        return len(self.pipeline.tokenizer(text, add_special_tokens=False)["input_ids"])
+
+
+def _context_window(generation_pipeline: Any) -> int | None:
+    """Maximum input length of the model, when the config or tokenizer states one."""
+    window = getattr(generation_pipeline.model.config, "max_position_embeddings", None)
+    if window:
+        return int(window)
+    limit = getattr(generation_pipeline.tokenizer, "model_max_length", None)
+    # Tokenizers without a limit report a huge sentinel value.
+    return int(limit) if limit and limit < 1_000_000 else None
 
 
 def _build_generation_pipeline(
@@ -78,6 +227,9 @@ def _build_generation_pipeline(
     device_map: str | None,
     max_new_tokens: int,
     temperature: float,
+    backend: RagBackend = "torch",
+    threads: int | None = None,
+    export_dir: str = "./data/onnx",
 ):
     """Create a HF pipeline that supports both seq2seq (e.g., FLAN) and causal (e.g., LLaMA) models."""
     tokenizer = AutoTokenizer.from_pretrained(model_name)
@@ -90,11 +242,20 @@ def _build_generation_pipeline(
         "do_sample": temperature > 0,
     }
 
-    if config.is_encoder_decoder:
+    if backend == "onnx":
+        model = _load_onnx_model(
+            model_name, encoder_decoder=config.is_encoder_decoder, threads=threads, export_dir=export_dir
+        )
+    elif config.is_encoder_decoder:
         model = AutoModelForSeq2SeqLM.from_pretrained(model_name, **model_kwargs)
-        task = "text2text-generation"
     else:
         model = AutoModelForCausalLM.from_pretrained(model_name, **model_kwargs)
+    if backend == "torch-int8":
+        model = quantize_linear_int8(model)
+
+    if config.is_encoder_decoder:
+        task = "text2text-generation"
+    else:
         task = "text-generation"
         # Many chat LLMs have no pad token; align it to EOS for batching/safety.
         if tokenizer.pad_token is None and tokenizer.eos_token is not None:
@@ -109,3 +270,20 @@ def _build_generation_pipeline(
         tokenizer=tokenizer,
         **pipeline_kwargs,
     )
+
+
+def _load_onnx_model(model_name: str, *, encoder_decoder: bool, threads: int | None, export_dir: str) -> Any:
+    """Load the ONNX export of ``model_name``, exporting it on first use (this can take minutes)."""
+    try:
+        from optimum.onnxruntime import ORTModelForCausalLM, ORTModelForSeq2SeqLM
+    except ImportError as exc:
+        raise RuntimeError(ONNX_INSTALL_HINT) from exc
+    model_class = ORTModelForSeq2SeqLM if encoder_decoder else ORTModelForCausalLM
+    options = {"provider": "CPUExecutionProvider", "session_options": onnx_session_options(threads)}
+    directory = export_directory(export_dir, model_name, "onnx")
+    if os.path.exists(os.path.join(directory, "config.json")):
+        return model_class.from_pretrained(directory, **options)
+    logger.info("Exporting %s to ONNX under %s", model_name, directory)
+    model = model_class.from_pretrained(model_name, export=True, **options)
+    model.save_pretrained(directory)
+    return model
@@ -0,0 +1,5 @@
+"""Ingestion registry implementations."""
+
+from .sqlite_registry import SqliteIngestionRegistry
+
+__all__ = ["SqliteIngestionRegistry"]
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+
+from app.domain.entities import IngestionRecord
+from app.domain.repositories import IngestionRegistry
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested_documents (
+    document_id TEXT PRIMARY KEY,
+    content_key TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    chunk_count INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS ingested_documents_content_key ON ingested_documents (content_key);
+CREATE TABLE IF NOT EXISTS document_aliases (
+    alias TEXT PRIMARY KEY,
+    document_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS document_changes (
+    generation INTEGER PRIMARY KEY AUTOINCREMENT,
+    document_id TEXT NOT NULL
+);
+"""
+
+# Recent changes kept for ``changed_since``; a reader further behind than this starts over.
+_CHANGE_LOG_SIZE = 10_000
+
+
+class SqliteIngestionRegistry(IngestionRegistry):
+    """SQLite-backed ingestion registry; safe to share between threads and worker processes."""
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def find_by_content(self, content_key: str) -> IngestionRecord | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_key, document_id, filename, chunk_count FROM ingested_documents "
+                "WHERE content_key = ? ORDER BY created_at LIMIT 1",
+                (content_key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return IngestionRecord(content_key=row[0], document_id=row[1], filename=row[2], chunk_count=row[3])
+
+    def resolve(self, name: str) -> str | None:
+        with self._lock:
+            # An alias wins over a document stored under the same id: the name has moved to other content,
+            # and the old document is only kept for the aliases that still point at it.
+            row = self._conn.execute("SELECT document_id FROM document_aliases WHERE alias = ?", (name,)).fetchone()
+            if row is None:
+                row = self._conn.execute(
+                    "SELECT document_id FROM ingested_documents WHERE document_id = ?", (name,)
+                ).fetchone()
+        return row[0] if row else None
+
+    def referrers(self, document_id: str) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT alias FROM document_aliases WHERE document_id = ? "
+                "UNION SELECT document_id FROM ingested_documents WHERE document_id = ? "
+                "AND document_id NOT IN (SELECT alias FROM document_aliases)",
+                (document_id, document_id),
+            ).fetchall()
+        return sorted(row[0] for row in rows)
+
+    def record(self, record: IngestionRecord) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ingested_documents (document_id, content_key, filename, chunk_count) "
+                "VALUES (?, ?, ?, ?)",
+                (record.document_id, record.content_key, record.filename, record.chunk_count),
+            )
+            self._bind(record.filename, record.document_id)
+            self._log_change(record.document_id)
+
+    def add_alias(self, alias: str, document_id: str) -> None:
+        with self._lock, self._conn:
+            self._bind(alias, document_id)
+
+    def remove(self, document_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM document_aliases WHERE document_id = ?", (document_id,))
+            self._conn.execute("DELETE FROM ingested_documents WHERE document_id = ?", (document_id,))
+            self._log_change(document_id)
+
+    def generation(self) -> int:
+        with self._lock:
+            (generation,) = self._conn.execute("SELECT coalesce(max(generation), 0) FROM document_changes").fetchone()
+        return generation
+
+    def changed_since(self, generation: int) -> list[str] | None:
+        with self._lock:
+            (oldest,) = self._conn.execute("SELECT min(generation) FROM document_changes").fetchone()
+            if oldest is not None and oldest > generation + 1:
+                return None
+            rows = self._conn.execute(
+                "SELECT DISTINCT document_id FROM document_changes WHERE generation > ?", (generation,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _bind(self, name: str, document_id: str) -> None:
+        if name == document_id:
+            # A document's own id resolves to it unless an alias says otherwise.
+            self._conn.execute("DELETE FROM document_aliases WHERE alias = ?", (name,))
+        else:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO document_aliases (alias, document_id) VALUES (?, ?)", (name, document_id)
+            )
+
+    def _log_change(self, document_id: str) -> None:
+        cursor = self._conn.execute("INSERT INTO document_changes (document_id) VALUES (?)", (document_id,))
+        self._conn.execute("DELETE FROM document_changes WHERE generation <= ?", (cursor.lastrowid - _CHANGE_LOG_SIZE,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
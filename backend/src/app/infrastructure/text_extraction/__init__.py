@@ -1,5 +1,7 @@
 """Text extraction implementations."""
 
+from .page_cache import OcrPageCache
+from .pdf_text_layer import PdfTextLayerExtractor
 from .tesseract_extractor import TesseractTextExtractor
 
-__all__ = ["TesseractTextExtractor"]
+__all__ = ["OcrPageCache", "PdfTextLayerExtractor", "TesseractTextExtractor"]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+class OcrPageCache:
+    """
+    On-disk cache of OCR output keyed by the rendered page image plus OCR settings.
+
+    Notes:
+    - Entries are plain text files, so worker processes can read and write the same cache.
+    - Recency is tracked through file mtimes; ``evict`` trims least-recently-used entries
+      once the directory grows past ``max_bytes``.
+    - Hit/miss counters are per process; workers report their lookups back via ``record``.
+    """
+
+    def __init__(self, directory: str, *, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(image: Image.Image, *, dpi: int, lang: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]}:dpi={dpi}:lang={lang}|".encode())
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # Evicted by another process between the read and the touch.
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent readers never see a partial entry.
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp_path, path)
+
+    def record(self, *, hits: int = 0, misses: int = 0) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def evict(self) -> int:
+        """Delete least-recently-used entries until the cache fits in ``max_bytes``. Returns bytes freed."""
+        entries: list[tuple[float, int, Path]] = []
+        total = 0
+        for path in self.directory.glob("*/*.txt"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return 0
+
+        freed = 0
+        # Trim to 90% so eviction does not run again on the very next page.
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in sorted(entries):
+            if total - freed <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            freed += size
+        logger.info("Evicted %d bytes from OCR page cache (hit rate %.2f)", freed, self.hit_rate)
+        return freed
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.txt"
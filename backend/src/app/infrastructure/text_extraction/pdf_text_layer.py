@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import logging
+import subprocess
+from typing import Iterator
+
+from pdf2image import pdfinfo_from_path
+
+from app.domain.entities import ExtractedPage
+from app.domain.services import DocumentSource, TextExtractorService
+from app.infrastructure.text_extraction.sources import local_path
+from app.infrastructure.text_extraction.tesseract_extractor import TesseractTextExtractor
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_TEXT_LAYER = "text_layer"
+EXTRACTION_OCR = "ocr"
+
+
+class PdfTextLayerExtractor(TextExtractorService):
+    """
+    Reads the PDF's embedded text layer and only OCRs pages where it is missing or too sparse.
+
+    Notes:
+    - Uses poppler's ``pdftotext`` (installed alongside pdf2image), so no extra Python dependency.
+    - A page is OCR'd when its text layer has fewer than ``min_chars_per_page`` non-whitespace characters.
+    - Each yielded page records the path taken in ``metadata["extraction"]``.
+    """
+
+    def __init__(self, *, ocr: TesseractTextExtractor, min_chars_per_page: int = 64) -> None:
+        self.ocr = ocr
+        self.min_chars_per_page = min_chars_per_page
+
+    @property
+    def fingerprint(self) -> str:
+        return f"text-layer:min_chars={self.min_chars_per_page}+{self.ocr.fingerprint}"
+
+    def extract_text(self, source: DocumentSource) -> str:
+        return "\n".join(page.text for page in self.iter_pages(source))
+
+    def iter_pages(self, source: DocumentSource) -> Iterator[ExtractedPage]:
+        with local_path(source) as path:
+            yield from self.iter_pages_from_path(path)
+
+    def iter_pages_from_path(self, path: str) -> Iterator[ExtractedPage]:
+        page_count = int(pdfinfo_from_path(path)["Pages"])
+        layer = self._read_text_layer(path, page_count)
+        needs_ocr = [number for number, text in enumerate(layer, start=1) if not self._is_dense_enough(text)]
+        logger.info(
+            "Text layer covers %d/%d pages; OCR needed for %d pages",
+            page_count - len(needs_ocr),
+            page_count,
+            len(needs_ocr),
+        )
+
+        # The OCR iterator is lazy: OCR starts when the first sparse page is reached, and from then on a
+        # bounded number of page windows run ahead in parallel while later pages (of either kind) are yielded.
+        ocr_pages = self.ocr.iter_pages_from_path(path, needs_ocr) if needs_ocr else iter(())
+        pending_ocr = set(needs_ocr)
+        try:
+            for number, text in enumerate(layer, start=1):
+                if number in pending_ocr:
+                    page = next(ocr_pages)
+                    yield ExtractedPage(
+                        number=number,
+                        text=page.text,
+                        metadata={**(page.metadata or {}), "extraction": EXTRACTION_OCR},
+                    )
+                else:
+                    yield ExtractedPage(number=number, text=text, metadata={"extraction": EXTRACTION_TEXT_LAYER})
+        finally:
+            close = getattr(ocr_pages, "close", None)
+            if close is not None:
+                close()
+
+    def close(self) -> None:
+        self.ocr.close()
+
+    def _is_dense_enough(self, text: str) -> bool:
+        return sum(1 for char in text if not char.isspace()) >= self.min_chars_per_page
+
+    @staticmethod
+    def _read_text_layer(path: str, page_count: int) -> list[str]:
+        try:
+            completed = subprocess.run(
+                ["pdftotext", "-layout", "-enc", "UTF-8", path, "-"],
+                capture_output=True,
+                check=True,
+            )
+        except (OSError, subprocess.CalledProcessError) as exc:
+            logger.warning("pdftotext failed (%s); falling back to OCR for every page.", exc)
+            return [""] * page_count
+
+        # pdftotext terminates every page with a form feed.
+        pages = completed.stdout.decode("utf-8", errors="replace").split("\f")
+        pages = pages[:page_count]
+        pages.extend([""] * (page_count - len(pages)))
+        return pages
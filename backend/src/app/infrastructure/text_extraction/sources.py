@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from app.domain.services import DocumentSource
+
+_COPY_BLOCK_BYTES = 1024 * 1024
+
+
+@contextmanager
+def local_path(source: DocumentSource) -> Iterator[str]:
+    """
+    Yield a filesystem path for ``source``.
+
+    Paths are used in place; bytes and file objects are written to a temporary file (file objects
+    in fixed-size blocks) that is removed on exit.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        yield os.fspath(source)
+        return
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "document.pdf"
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            path.write_bytes(source)
+        else:
+            with path.open("wb") as handle:
+                shutil.copyfileobj(source, handle, _COPY_BLOCK_BYTES)
+        yield str(path)
@@ -1,13 +1,45 @@
 from __future__ import annotations
 
-import tempfile
-from pathlib import Path
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Iterable, Iterator
 
 import pytesseract
 from PIL import Image
-from pdf2image import convert_from_bytes
+from pdf2image import convert_from_path, pdfinfo_from_path
 
-from app.domain.services import TextExtractorService
+from app.domain.entities import ExtractedPage
+from app.domain.services import DocumentSource, TextExtractorService
+from app.infrastructure.text_extraction.page_cache import OcrPageCache
+from app.infrastructure.text_extraction.sources import local_path
+
+
+def _ocr_page_range(
+    path: str, first_page: int, last_page: int, dpi: int, lang: str, cache: OcrPageCache | None = None
+) -> list[tuple[str, bool]]:
+    """
+    Render and OCR ``first_page..last_page`` (1-based, inclusive). Runs inside worker processes.
+
+    Returns ``(text, cache_hit)`` per page.
+    """
+    images = convert_from_path(path, dpi=dpi, first_page=first_page, last_page=last_page, fmt="png")
+    results: list[tuple[str, bool]] = []
+    for image in images:
+        if not isinstance(image, Image.Image):
+            results.append(("", False))
+            continue
+        key = OcrPageCache.key_for(image, dpi=dpi, lang=lang) if cache is not None else None
+        cached = cache.get(key) if cache is not None and key is not None else None
+        if cached is not None:
+            results.append((cached, True))
+        else:
+            text = pytesseract.image_to_string(image, lang=lang)
+            if cache is not None and key is not None:
+                cache.put(key, text)
+            results.append((text, False))
+        image.close()
+    return results
 
 
 class TesseractTextExtractor(TextExtractorService):
@@ -16,19 +48,122 @@ class TesseractTextExtractor(TextExtractorService):
 
     Notes:
     - Requires Tesseract OCR to be installed and available in PATH.
-    - Uses pdf2image + PIL to render PDF pages for OCR. Best suited for small PDFs.
+    - Pages are rendered with pdf2image in small windows and OCR'd across a process pool,
+      so peak memory is bounded by ``workers * pages_per_task`` rendered pages.
+    - With a ``cache``, pages whose rendered image was OCR'd before skip Tesseract entirely.
     """
 
-    def __init__(self, *, dpi: int = 200, lang: str = "eng") -> None:
+    def __init__(
+        self,
+        *,
+        dpi: int = 200,
+        lang: str = "eng",
+        workers: int | None = None,
+        pages_per_task: int = 1,
+        max_pending_tasks: int | None = None,
+        cache: OcrPageCache | None = None,
+    ) -> None:
         self.dpi = dpi
         self.lang = lang
+        self.workers = max(workers if workers is not None else (os.cpu_count() or 1), 1)
+        self.pages_per_task = max(pages_per_task, 1)
+        # Tasks submitted ahead of the page currently being yielded.
+        self.max_pending_tasks = max(max_pending_tasks or self.workers * 2, 1)
+        self.cache = cache
+        self._executor: Executor | None = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Settings that change the extracted text (parallelism settings do not)."""
+        return f"tesseract:dpi={self.dpi}:lang={self.lang}"
+
+    def __getstate__(self) -> dict:
+        # The process pool cannot cross process boundaries; workers rebuild it lazily.
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
+
+    def extract_text(self, source: DocumentSource) -> str:
+        return "\n".join(page.text for page in self.iter_pages(source))
+
+    def iter_pages(self, source: DocumentSource) -> Iterator[ExtractedPage]:
+        with local_path(source) as path:
+            yield from self.iter_pages_from_path(path)
+
+    def iter_pages_from_path(self, path: str, page_numbers: Iterable[int] | None = None) -> Iterator[ExtractedPage]:
+        """OCR ``page_numbers`` (1-based; all pages when omitted) of the PDF at ``path`` in order."""
+        if page_numbers is None:
+            page_count = int(pdfinfo_from_path(path)["Pages"])
+            pages = list(range(1, page_count + 1))
+        else:
+            pages = sorted(set(page_numbers))
+        if not pages:
+            return
+
+        windows = _contiguous_windows(pages, self.pages_per_task)
+        try:
+            for first, results in self._ocr_windows(path, windows):
+                if self.cache is not None:
+                    hits = sum(1 for _, hit in results if hit)
+                    self.cache.record(hits=hits, misses=len(results) - hits)
+                for offset, (text, hit) in enumerate(results):
+                    metadata = {"ocr_cache": "hit" if hit else "miss"} if self.cache is not None else None
+                    yield ExtractedPage(number=first + offset, text=text, metadata=metadata)
+        finally:
+            if self.cache is not None:
+                self.cache.evict()
+
+    def _ocr_windows(
+        self, path: str, windows: list[tuple[int, int]]
+    ) -> Iterator[tuple[int, list[tuple[str, bool]]]]:
+        if self.workers == 1:
+            for first, last in windows:
+                yield first, _ocr_page_range(path, first, last, self.dpi, self.lang, self.cache)
+            return
+
+        executor = self._get_executor()
+        pending: deque[tuple[int, Future[list[tuple[str, bool]]]]] = deque()
+        remaining = iter(windows)
+
+        def _submit(window: tuple[int, int]) -> None:
+            first, last = window
+            pending.append((first, executor.submit(_ocr_page_range, path, first, last, self.dpi, self.lang, self.cache)))
+
+        try:
+            for window in remaining:
+                _submit(window)
+                if len(pending) >= self.max_pending_tasks:
+                    break
+            while pending:
+                first, future = pending.popleft()
+                next_window = next(remaining, None)
+                if next_window is not None:
+                    _submit(next_window)
+                yield first, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
 
-    def extract_text(self, data: bytes) -> str:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            images = convert_from_bytes(data, dpi=self.dpi, output_folder=tmpdir, fmt="png")
-            texts: list[str] = []
-            for image in images:
-                if isinstance(image, Image.Image):
-                    text = pytesseract.image_to_string(image, lang=self.lang)
-                    texts.append(text)
-            return "\n".join(texts)
+def _contiguous_windows(pages: list[int], size: int) -> list[tuple[int, int]]:
+    """Group sorted page numbers into contiguous ``(first, last)`` runs of at most ``size`` pages."""
+    windows: list[tuple[int, int]] = []
+    start = prev = pages[0]
+    for page in pages[1:]:
+        if page == prev + 1 and page - start < size:
+            prev = page
+            continue
+        windows.append((start, prev))
+        start = prev = page
+    windows.append((start, prev))
+    return windows
@@ -1,5 +1,6 @@
 """Concrete vector store implementations."""
 
 from .chroma import ChromaVectorStore
+from .mmap_store import MmapVectorStore
 
-__all__ = ["ChromaVectorStore"]
+__all__ = ["ChromaVectorStore", "MmapVectorStore"]
@@ -1,37 +1,49 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Optional
+from typing import Callable, Iterable, List, Optional, Sequence
 
 import chromadb
+import numpy as np
 from chromadb.api.models.Collection import Collection
-from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
 
 from app.domain.entities import DocumentChunk, QueryResult
 from app.domain.repositories import VectorStore
+from app.domain.services import EmbeddingService
 
 
 class ChromaVectorStore(VectorStore):
-    """Chroma-backed implementation of the VectorStore protocol."""
+    """
+    Chroma-backed implementation of the VectorStore protocol.
+
+    Chroma never embeds anything itself: stored chunks carry their embeddings and queries are
+    embedded with the app's ``EmbeddingService`` (or ``query_embedder``), so one model instance
+    serves both ingestion and retrieval.
+    """
 
     def __init__(
         self,
         *,
+        embedder: EmbeddingService | None = None,
+        query_embedder: Callable[[Sequence[str]], np.ndarray] | None = None,
         host: str | None = None,
         port: int | None = None,
         persist_dir: str | None = None,
         collection_name: str = "documents",
-        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
     ) -> None:
+        if query_embedder is None:
+            if embedder is None:
+                raise ValueError("ChromaVectorStore requires an embedder or a query_embedder.")
+            query_embedder = embedder.embed
+        self.query_embedder = query_embedder
         if host:
             self.client = chromadb.HttpClient(host=host, port=port or 8000)
         elif persist_dir:
             self.client = chromadb.PersistentClient(path=persist_dir)
         else:
             raise ValueError("ChromaVectorStore requires either host/port for server or persist_dir for local mode.")
-        embedding_function = SentenceTransformerEmbeddingFunction(model_name=embedding_model)
         self.collection: Collection = self.client.get_or_create_collection(
             name=collection_name,
-            embedding_function=embedding_function,
+            embedding_function=None,
         )
 
     def add_documents(self, chunks: Iterable[DocumentChunk]) -> None:
@@ -39,21 +51,34 @@ class ChromaVectorStore(VectorStore):
         if not chunk_list:
             return
 
-        embeddings: list[list[float]] = []
         ids = [chunk.id for chunk in chunk_list]
         documents = [chunk.content for chunk in chunk_list]
         metadatas = [chunk.metadata or {} for chunk in chunk_list]
 
-        for chunk in chunk_list:
-            if chunk.embedding is None:
-                return
-            embeddings.append(chunk.embedding)
+        if any(chunk.embedding is None for chunk in chunk_list):
+            return
+        # The HTTP client serializes plain lists; convert the whole batch once at this boundary.
+        embeddings = np.vstack([chunk.embedding for chunk in chunk_list]).astype(np.float32, copy=False).tolist()
 
         # Upsert to allow idempotent writes when the same chunk ids are provided.
         self.collection.upsert(ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings)
 
-    def query(self, text: str, limit: int = 5) -> List[QueryResult]:
-        results = self.collection.query(query_texts=[text], n_results=limit)
+    def query(
+        self,
+        text: str,
+        limit: int = 5,
+        *,
+        where: dict[str, str] | None = None,
+        embedding: np.ndarray | None = None,
+    ) -> List[QueryResult]:
+        if embedding is None:
+            embedding = self.query_embedder([text])[0]
+        query_embedding = np.asarray(embedding, dtype=np.float32).tolist()
+        results = self.collection.query(
+            query_embeddings=[query_embedding],
+            n_results=limit,
+            where=_where_clause(where),
+        )
 
         ids: list[str] = results.get("ids", [[]])[0] or []
         docs: list[str] = results.get("documents", [[]])[0] or []
@@ -70,3 +95,25 @@ class ChromaVectorStore(VectorStore):
             score = distances[idx] if idx < len(distances) and distances[idx] is not None else 0.0
             output.append(QueryResult(chunk=chunk, score=score))
         return output
+
+    def delete_document(self, document_id: str) -> None:
+        self.collection.delete(where={"document_id": document_id})
+        # Chunks stored before document_id metadata existed only carry the filename. Newer chunks keep
+        # their filename too (a new version may be stored as "<filename>@<key>"), so they must not match.
+        legacy = self.collection.get(where={"filename": document_id}, include=["metadatas"])
+        legacy_ids = [
+            chunk_id
+            for chunk_id, metadata in zip(legacy.get("ids") or [], legacy.get("metadatas") or [])
+            if "document_id" not in (metadata or {})
+        ]
+        if legacy_ids:
+            self.collection.delete(ids=legacy_ids)
+
+
+def _where_clause(where: dict[str, str] | None) -> dict | None:
+    """Translate an equality filter into Chroma's ``where`` syntax (multiple keys need ``$and``)."""
+    if not where:
+        return None
+    if len(where) == 1:
+        return dict(where)
+    return {"$and": [{key: value} for key, value in where.items()]}
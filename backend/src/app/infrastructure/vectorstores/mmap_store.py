@@ -0,0 +1,436 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Sequence
+
+import numpy as np
+
+from app.domain.entities import DocumentChunk, QueryResult
+from app.domain.repositories import VectorStore
+from app.domain.services import EmbeddingService
+from app.infrastructure.vectorstores.quantization import QuantizationKind, Quantizer, build_quantizer
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    row INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    document_id TEXT,
+    content TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS chunks_id ON chunks (id) WHERE deleted = 0;
+CREATE INDEX IF NOT EXISTS chunks_document_id ON chunks (document_id) WHERE deleted = 0;
+CREATE TABLE IF NOT EXISTS store_info (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+class _IvfIndex:
+    """Inverted-file index: k-means centroids plus the rows assigned to each list."""
+
+    def __init__(self, centroids: np.ndarray, assignments: np.ndarray) -> None:
+        self.centroids = centroids
+        self.lists: list[np.ndarray] = [np.flatnonzero(assignments == i) for i in range(len(centroids))]
+        self.size = len(assignments)
+
+    @classmethod
+    def train(cls, matrix: np.ndarray, n_lists: int, *, iterations: int = 10, seed: int = 0) -> _IvfIndex:
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(matrix), max(n_lists * 64, 10_000))
+        sample = np.asarray(matrix[np.sort(rng.choice(len(matrix), size=sample_size, replace=False))])
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for i in range(n_lists):
+                members = sample[labels == i]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    centroids[i] = centroid / (np.linalg.norm(centroid) or 1.0)
+        return cls(centroids, _assign(matrix, centroids))
+
+    def extend(self, matrix: np.ndarray) -> None:
+        """Assign rows appended since the index was built to their nearest list."""
+        if len(matrix) <= self.size:
+            return
+        labels = _assign(matrix[self.size :], self.centroids)
+        new_rows = np.arange(self.size, len(matrix))
+        for i in np.unique(labels):
+            self.lists[i] = np.concatenate([self.lists[i], new_rows[labels == i]])
+        self.size = len(matrix)
+
+    def candidates(self, query: np.ndarray, n_probe: int) -> np.ndarray:
+        probe = np.argsort(-(self.centroids @ query))[:n_probe]
+        return np.concatenate([self.lists[i] for i in probe])
+
+
+def _assign(matrix: np.ndarray, centroids: np.ndarray, batch: int = 65_536) -> np.ndarray:
+    labels = np.empty(len(matrix), dtype=np.int32)
+    for start in range(0, len(matrix), batch):
+        labels[start : start + batch] = np.argmax(matrix[start : start + batch] @ centroids.T, axis=1)
+    return labels
+
+
+class MmapVectorStore(VectorStore):
+    """
+    In-process vector store backed by a memory-mapped float32 matrix.
+
+    Notes:
+    - Vectors are L2-normalized on write and live in ``vectors.f32`` under ``directory``; chunk text and
+      metadata live in a SQLite file next to it. Scores are cosine distances (``1 - cosine``).
+    - Readers map the file read-only, so every worker process shares the same page-cache pages.
+      Writers serialize through a file lock and bump a generation counter that readers poll.
+    - Search is an exact matrix-vector product. With ``ivf_lists > 0`` and at least ``ivf_min_rows``
+      vectors, unfiltered searches only scan the ``ivf_probe`` closest k-means lists.
+    - With ``quantization`` set to ``int8`` or ``binary``, compact codes are stored next to the float32
+      vectors. Unfiltered searches scan the codes, shortlist ``limit * rerank_factor`` candidates and
+      re-score only those rows at full precision, so most float pages are never touched.
+    """
+
+    def __init__(
+        self,
+        *,
+        directory: str,
+        embedder: EmbeddingService | None = None,
+        query_embedder: Callable[[Sequence[str]], np.ndarray] | None = None,
+        ivf_lists: int = 0,
+        ivf_probe: int = 8,
+        ivf_min_rows: int = 50_000,
+        quantization: QuantizationKind = "none",
+        rerank_factor: int = 8,
+    ) -> None:
+        if query_embedder is None:
+            if embedder is None:
+                raise ValueError("MmapVectorStore requires an embedder or a query_embedder.")
+            query_embedder = embedder.embed
+        self.query_embedder = query_embedder
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ivf_lists = ivf_lists
+        self.ivf_probe = max(ivf_probe, 1)
+        self.ivf_min_rows = ivf_min_rows
+        self.quantization = quantization
+        self.rerank_factor = max(rerank_factor, 1)
+
+        self._vectors_path = self.directory / "vectors.f32"
+        self._codes_path = self.directory / f"codes.{quantization}"
+        self._lock_path = self.directory / ".lock"
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.directory / "chunks.sqlite3", check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+        self._generation = -1
+        self._matrix: np.ndarray | None = None
+        self._live: np.ndarray = np.zeros(0, dtype=bool)
+        self._ivf: _IvfIndex | None = None
+        self._quantizer: Quantizer | None = None
+        self._codes: np.ndarray | None = None
+        logger.info("Opened mmap vector store at %s: %s", self.directory, self.stats())
+
+    # ------------------------------------------------------------------ writes
+
+    def add_documents(self, chunks: Iterable[DocumentChunk]) -> None:
+        chunk_list = list(chunks)
+        if not chunk_list or any(chunk.embedding is None for chunk in chunk_list):
+            return
+        vectors = _normalize(np.vstack([chunk.embedding for chunk in chunk_list]))
+
+        with self._write_lock():
+            dim = self._dimension()
+            if dim is None:
+                dim = vectors.shape[1]
+                self._set_info("dim", str(dim))
+            elif dim != vectors.shape[1]:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match store dimension {dim}.")
+
+            start = self._row_count()
+            _write_rows(self._vectors_path, start * dim * 4, vectors.tobytes())
+            quantizer = build_quantizer(self.quantization, dim)
+            if quantizer is not None and self._code_rows(quantizer) >= start:
+                # Stale stores are backfilled on the next refresh instead.
+                _write_rows(self._codes_path, start * quantizer.code_bytes, quantizer.encode(vectors).tobytes())
+
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                # Upsert semantics: an id written again tombstones its previous row.
+                self._conn.executemany(
+                    "UPDATE chunks SET deleted = 1 WHERE id = ? AND deleted = 0",
+                    [(chunk.id,) for chunk in chunk_list],
+                )
+                self._conn.executemany(
+                    "INSERT INTO chunks (row, id, document_id, content, metadata) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            start + offset,
+                            chunk.id,
+                            (chunk.metadata or {}).get("document_id"),
+                            chunk.content,
+                            json.dumps(chunk.metadata or {}),
+                        )
+                        for offset, chunk in enumerate(chunk_list)
+                    ],
+                )
+                self._set_info("rows", str(start + len(chunk_list)))
+                self._bump_generation()
+
+    def delete_document(self, document_id: str) -> None:
+        with self._write_lock(), self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            # Chunks stored before document_id metadata existed only carry the filename; newer chunks keep
+            # their filename too (a new version may be "<filename>@<key>"), so only the former match on it.
+            self._conn.execute(
+                "UPDATE chunks SET deleted = 1 WHERE deleted = 0 AND "
+                "(document_id = ? OR (document_id IS NULL AND json_extract(metadata, '$.filename') = ?))",
+                (document_id, document_id),
+            )
+            self._bump_generation()
+
+    # ------------------------------------------------------------------- reads
+
+    def query(
+        self,
+        text: str,
+        limit: int = 5,
+        *,
+        where: dict[str, str] | None = None,
+        embedding: np.ndarray | None = None,
+    ) -> List[QueryResult]:
+        if embedding is None:
+            embedding = self.query_embedder([text])[0]
+        query_vector = _normalize(np.asarray(embedding, dtype=np.float32)[None, :])[0]
+
+        with self._lock:
+            self._refresh()
+            matrix, live, ivf = self._matrix, self._live, self._ivf
+            quantizer, codes = self._quantizer, self._codes
+        if matrix is None or not len(matrix):
+            return []
+
+        if not where and quantizer is not None and codes is not None:
+            candidates = ivf.candidates(query_vector, self.ivf_probe) if ivf is not None else None
+            return self._two_stage_search(query_vector, limit, matrix, live, quantizer, codes, candidates)
+
+        if where:
+            rows = self._rows_matching(where)
+            rows = rows[rows < len(matrix)]
+        elif ivf is not None:
+            rows = ivf.candidates(query_vector, self.ivf_probe)
+            rows = rows[live[rows]]
+        else:
+            rows = None
+
+        if rows is None:
+            scores = matrix @ query_vector
+            scores[~live] = -np.inf
+            candidate_rows = np.arange(len(matrix))
+        else:
+            if not len(rows):
+                return []
+            rows = np.sort(rows)
+            scores = matrix[rows] @ query_vector
+            candidate_rows = rows
+
+        top = _top_k(scores, limit)
+        top = top[np.isfinite(scores[top])]
+        return self._results(candidate_rows[top], scores[top])
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            self._refresh()
+            rows = 0 if self._matrix is None else len(self._matrix)
+            live = int(self._live.sum())
+            dim = 0 if self._matrix is None else self._matrix.shape[1]
+            code_bytes = self._quantizer.code_bytes if self._quantizer is not None else 0
+        return {
+            "rows": rows,
+            "live_rows": live,
+            "dimension": dim,
+            "quantization": self.quantization,
+            "vector_bytes": rows * dim * 4,
+            "code_bytes": rows * code_bytes,
+            # What an unfiltered search has to scan per chunk.
+            "scan_bytes_per_chunk": code_bytes or dim * 4,
+            "index_bytes_per_chunk": dim * 4 + code_bytes,
+            "ivf_lists": len(self._ivf.lists) if self._ivf is not None else 0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._matrix = None
+            self._conn.close()
+
+    # ---------------------------------------------------------------- internals
+
+    def _refresh(self) -> None:
+        generation = int(self._get_info("generation") or 0)
+        if generation == self._generation:
+            return
+        dim = self._dimension()
+        rows = self._row_count()
+        if dim is None or rows == 0:
+            self._matrix, self._live, self._ivf, self._codes = None, np.zeros(0, dtype=bool), None, None
+            self._generation = generation
+            return
+
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(rows, dim))
+        live = np.ones(rows, dtype=bool)
+        deleted = np.fromiter(
+            (row for (row,) in self._conn.execute("SELECT row FROM chunks WHERE deleted = 1")), dtype=np.int64
+        )
+        live[deleted[deleted < rows]] = False
+        self._live = live
+        self._refresh_codes(rows, dim)
+
+        if self.ivf_lists > 0 and rows >= max(self.ivf_min_rows, self.ivf_lists):
+            if self._ivf is None or rows > self._ivf.size * 2:
+                logger.info("Training IVF index with %d lists over %d vectors", self.ivf_lists, rows)
+                self._ivf = _IvfIndex.train(self._matrix, self.ivf_lists)
+            else:
+                self._ivf.extend(self._matrix)
+        self._generation = generation
+
+    def _refresh_codes(self, rows: int, dim: int) -> None:
+        quantizer = build_quantizer(self.quantization, dim)
+        self._quantizer = quantizer
+        if quantizer is None:
+            self._codes = None
+            return
+        code_rows = self._code_rows(quantizer)
+        if code_rows < rows:
+            logger.info("Backfilling %s codes for %d vectors", quantizer.name, rows - code_rows)
+            with self._write_lock():
+                code_rows = self._code_rows(quantizer)
+                missing = np.asarray(self._matrix[code_rows:rows])
+                _write_rows(self._codes_path, code_rows * quantizer.code_bytes, quantizer.encode(missing).tobytes())
+        self._codes = np.memmap(self._codes_path, dtype=np.uint8, mode="r", shape=(rows, quantizer.code_bytes))
+
+    def _code_rows(self, quantizer: Quantizer) -> int:
+        if not self._codes_path.exists():
+            return 0
+        return self._codes_path.stat().st_size // quantizer.code_bytes
+
+    def _two_stage_search(
+        self,
+        query_vector: np.ndarray,
+        limit: int,
+        matrix: np.ndarray,
+        live: np.ndarray,
+        quantizer: Quantizer,
+        codes: np.ndarray,
+        candidates: np.ndarray | None,
+    ) -> list[QueryResult]:
+        prepared = quantizer.prepare_query(query_vector)
+        if candidates is None:
+            approx = quantizer.score(codes, prepared)
+            approx[~live] = -np.inf
+            candidate_rows = np.arange(len(codes))
+        else:
+            candidate_rows = np.sort(candidates[live[candidates]])
+            approx = quantizer.score(codes[candidate_rows], prepared)
+
+        shortlist = _top_k(approx, limit * self.rerank_factor)
+        shortlist = np.sort(candidate_rows[shortlist[np.isfinite(approx[shortlist])]])
+        if not len(shortlist):
+            return []
+        exact = np.asarray(matrix[shortlist]) @ query_vector
+        top = _top_k(exact, limit)
+        return self._results(shortlist[top], exact[top])
+
+    def _rows_matching(self, where: dict[str, str]) -> np.ndarray:
+        clauses: list[str] = []
+        params: list[str] = []
+        for key, value in where.items():
+            if key == "document_id":
+                clauses.append("document_id = ?")
+            else:
+                clauses.append("json_extract(metadata, ?) = ?")
+                params.append(f"$.{key}")
+            params.append(value)
+        sql = f"SELECT row FROM chunks WHERE deleted = 0 AND {' AND '.join(clauses)}"
+        with self._lock:
+            return np.fromiter((row for (row,) in self._conn.execute(sql, params)), dtype=np.int64)
+
+    def _results(self, rows: np.ndarray, scores: np.ndarray) -> list[QueryResult]:
+        if not len(rows):
+            return []
+        placeholders = ",".join("?" for _ in rows)
+        with self._lock:
+            records = {
+                row: (chunk_id, content, metadata)
+                for row, chunk_id, content, metadata in self._conn.execute(
+                    f"SELECT row, id, content, metadata FROM chunks WHERE row IN ({placeholders})",
+                    [int(row) for row in rows],
+                )
+            }
+        output: list[QueryResult] = []
+        for row, score in zip(rows.tolist(), scores.tolist()):
+            chunk_id, content, metadata = records[row]
+            chunk = DocumentChunk(id=chunk_id, content=content, metadata=json.loads(metadata))
+            output.append(QueryResult(chunk=chunk, score=1.0 - score))
+        return output
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        with self._lock, open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _dimension(self) -> int | None:
+        value = self._get_info("dim")
+        return int(value) if value is not None else None
+
+    def _row_count(self) -> int:
+        return int(self._get_info("rows") or 0)
+
+    def _bump_generation(self) -> None:
+        self._conn.execute(
+            "INSERT INTO store_info (key, value) VALUES ('generation', '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+
+    def _get_info(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM store_info WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_info(self, key: str, value: str) -> None:
+        self._conn.execute(
+            "INSERT INTO store_info (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+
+def _write_rows(path: Path, offset: int, payload: bytes) -> None:
+    """Write ``payload`` at ``offset`` and drop anything after it (rows from an interrupted write)."""
+    with open(path, "r+b" if path.exists() else "wb") as handle:
+        handle.seek(offset)
+        handle.write(payload)
+        handle.truncate()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    if k <= 0 or not len(scores):
+        return np.zeros(0, dtype=np.int64)
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top])]
@@ -1,4 +1,16 @@
 from .upload_controller import handle_upload
-from .chat_controller import handle_chat
+from .bulk_controller import handle_bulk_upload, handle_get_bulk_run
+from .chat_controller import handle_chat, handle_chat_stream
+from .job_controller import handle_cancel_job, handle_get_job
+from .readiness_controller import handle_ready
 
-__all__ = ["handle_upload", "handle_chat"]
+__all__ = [
+    "handle_upload",
+    "handle_bulk_upload",
+    "handle_get_bulk_run",
+    "handle_chat",
+    "handle_chat_stream",
+    "handle_get_job",
+    "handle_cancel_job",
+    "handle_ready",
+]
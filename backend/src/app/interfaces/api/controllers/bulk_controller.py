@@ -0,0 +1,60 @@
+import logging
+from dataclasses import asdict
+
+from fastapi import HTTPException, UploadFile
+
+from app.application.bulk_ingestion import BulkIngestionService, BulkRun
+from app.interfaces.api.schemas import BulkItemResponse, BulkRunResponse
+
+logger = logging.getLogger(__name__)
+
+_ACCEPTED_SUFFIXES = (".pdf", ".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+
+def to_bulk_run_response(run: BulkRun) -> BulkRunResponse:
+    summary = run.report.summary()
+    errors = list(summary["errors"])
+    if run.error:
+        errors.append(run.error)
+    return BulkRunResponse(
+        run_id=run.id,
+        status=run.status,
+        files=run.files,
+        documents=summary["documents"],
+        statuses=summary["statuses"],
+        pages=summary["pages"],
+        chunks=summary["chunks"],
+        elapsed_seconds=summary["elapsed_seconds"],
+        docs_per_minute=summary["docs_per_minute"],
+        errors=errors,
+        results=[BulkItemResponse(**asdict(result)) for result in run.report.results],
+    )
+
+
+async def handle_bulk_upload(files: list[UploadFile], bulk_ingestion: BulkIngestionService) -> BulkRunResponse:
+    logger.info("Received bulk upload request with %d files", len(files))
+    for file in files:
+        if not (file.filename or "").lower().endswith(_ACCEPTED_SUFFIXES):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported file {file.filename!r}: upload PDFs or zip/tar archives of PDFs.",
+            )
+
+    run = bulk_ingestion.create_run()
+    try:
+        for file in files:
+            await bulk_ingestion.spool(run, file.filename, file.file)
+    except BaseException:
+        await bulk_ingestion.discard(run)
+        raise
+    # Extraction, embedding and storage run in the background; clients poll GET /upload/bulk/{run_id}.
+    bulk_ingestion.launch(run)
+    logger.info("Started bulk ingestion run %s for %d files", run.id, run.files)
+    return to_bulk_run_response(run)
+
+
+async def handle_get_bulk_run(run_id: str, bulk_ingestion: BulkIngestionService) -> BulkRunResponse:
+    run = bulk_ingestion.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Bulk run {run_id} not found.")
+    return to_bulk_run_response(run)
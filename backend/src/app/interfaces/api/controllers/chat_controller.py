@@ -1,6 +1,11 @@
+import json
 import logging
+from typing import AsyncIterator
 
-from app.application.chat import ChatUseCase
+from fastapi.responses import StreamingResponse
+
+from app.application.chat import ChatStream, ChatUseCase
+from app.core.executors import ExecutorSaturatedError
 from app.interfaces.api.schemas import ChatRequest, ChatResponse
 
 logger = logging.getLogger(__name__)
@@ -8,5 +13,43 @@ logger = logging.getLogger(__name__)
 
 async def handle_chat(payload: ChatRequest, chat_use_case: ChatUseCase) -> ChatResponse:
     logger.info("Chat request received for document_id=%s", payload.document_id)
-    result = chat_use_case.chat(question=payload.question, document_id=payload.document_id)
+    result = await chat_use_case.chat(question=payload.question, document_id=payload.document_id)
     return ChatResponse(answer=result.answer, source=result.source)
+
+
+async def handle_chat_stream(payload: ChatRequest, chat_use_case: ChatUseCase) -> StreamingResponse:
+    logger.info("Streaming chat request received for document_id=%s", payload.document_id)
+    # Retrieval happens before the response starts so failures still map to regular HTTP errors.
+    stream = await chat_use_case.stream_chat(question=payload.question, document_id=payload.document_id)
+    return StreamingResponse(
+        _sse_events(stream),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _sse_events(stream: ChatStream) -> AsyncIterator[str]:
+    sources = [
+        {
+            "document_id": (chunk.metadata or {}).get("document_id"),
+            "filename": (chunk.metadata or {}).get("filename"),
+            "chunk": (chunk.metadata or {}).get("chunk"),
+        }
+        for chunk in stream.context
+    ]
+    yield _sse("sources", {"source": stream.source, "sources": sources})
+    try:
+        async for token in stream.tokens:
+            yield _sse("token", {"token": token})
+    except ExecutorSaturatedError as exc:
+        yield _sse("error", {"detail": f"The {exc.pool_name} stage is at capacity; retry shortly."})
+        return
+    except Exception:
+        logger.exception("Streaming generation failed")
+        yield _sse("error", {"detail": "Answer generation failed."})
+        return
+    yield _sse("done", {})
@@ -0,0 +1,41 @@
+import logging
+
+from fastapi import HTTPException
+
+from app.application.ingestion_jobs import IngestionJobQueue
+from app.domain import IngestionJob
+from app.interfaces.api.schemas import JobResponse
+
+logger = logging.getLogger(__name__)
+
+
+def to_job_response(job: IngestionJob) -> JobResponse:
+    return JobResponse(
+        job_id=job.id,
+        filename=job.filename,
+        status=job.status,
+        stage=job.stage,
+        pages_extracted=job.pages_extracted,
+        chunks_embedded=job.chunks_embedded,
+        chunks_stored=job.chunks_stored,
+        document_id=job.document_id,
+        duplicate=job.duplicate,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+async def handle_get_job(job_id: str, job_queue: IngestionJobQueue) -> JobResponse:
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found.")
+    return to_job_response(job)
+
+
+async def handle_cancel_job(job_id: str, job_queue: IngestionJobQueue) -> JobResponse:
+    logger.info("Cancellation requested for job_id=%s", job_id)
+    job = await job_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found.")
+    return to_job_response(job)
@@ -0,0 +1,17 @@
+from fastapi.responses import JSONResponse
+
+from app.core.readiness import ReadinessTracker
+from app.interfaces.api.schemas import ComponentStatusResponse, ReadinessResponse
+
+
+def handle_ready(readiness: ReadinessTracker) -> JSONResponse:
+    """200 once every non-lazy component has loaded, 503 while starting or after a failed load."""
+    components = {name: ComponentStatusResponse(**state) for name, state in readiness.snapshot().items()}
+    if readiness.ready:
+        status = "ready"
+    elif any(component.status == "failed" for component in components.values()):
+        status = "failed"
+    else:
+        status = "starting"
+    response = ReadinessResponse(status=status, components=components)
+    return JSONResponse(status_code=200 if readiness.ready else 503, content=response.model_dump())
@@ -2,24 +2,22 @@ import logging
 
 from fastapi import HTTPException, UploadFile
 
-from app.application.upload_document import UploadDocumentUseCase
+from app.application.ingestion_jobs import IngestionJobQueue
+from app.interfaces.api.controllers.job_controller import to_job_response
+from app.interfaces.api.schemas import JobResponse
 
 logger = logging.getLogger(__name__)
 
 
 async def handle_upload(
     file: UploadFile,
-    use_case: UploadDocumentUseCase,
-) -> dict[str, str]:
+    job_queue: IngestionJobQueue,
+) -> JobResponse:
     logger.info("Received upload request: filename=%s content_type=%s", file.filename, file.content_type)
     if file.content_type != "application/pdf":
         raise HTTPException(status_code=400, detail="Only PDF uploads are supported.")
 
-    data = await file.read()
-    logger.info("Read %d bytes for filename=%s", len(data), file.filename)
-
-    doc_id = use_case.embed_and_store(filename=file.filename, data=data)
-
-    logger.info("Upload pipeline completed: filename=%s document_id=%s", file.filename, doc_id)
-
-    return {"document_id": doc_id, "status": "indexed", "filename": file.filename}
+    # The body is streamed to the spool directory in blocks rather than read into memory.
+    # OCR, embedding and storage run in the background; clients poll GET /jobs/{job_id}.
+    job = await job_queue.submit(filename=file.filename, source=file.file)
+    return to_job_response(job)
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
-from typing import cast
+from typing import Awaitable, Callable, cast
 
 from fastapi import Request
 
 from app.application.upload_document import UploadDocumentUseCase
+from app.application.bulk_ingestion import BulkIngestionService
 from app.application.chat import ChatUseCase
+from app.application.ingestion_jobs import IngestionJobQueue
+from app.core.executors import ExecutorPools
+from app.core.metrics import MetricsRegistry
+from app.core.readiness import ReadinessTracker
 from app.domain import EmbeddingService, RagService, TextExtractorService, VectorStore
 
+# Components each kind of request needs loaded before it can be served.
+INGESTION_COMPONENTS = ("embedding", "vector_store")
+CHAT_COMPONENTS = ("embedding", "vector_store", "generation")
+
 
 def get_vector_store(request: Request) -> VectorStore:
     vector_store = getattr(request.app.state, "vector_store", None)
@@ -49,3 +58,54 @@ def get_chat_use_case(request: Request) -> ChatUseCase:
     if chat_use_case is None:
         raise RuntimeError("ChatUseCase has not been initialized.")
     return cast(ChatUseCase, chat_use_case)
+
+
+def get_executors(request: Request) -> ExecutorPools:
+    executors = getattr(request.app.state, "executors", None)
+    if executors is None:
+        raise RuntimeError("Executor pools have not been initialized.")
+    return cast(ExecutorPools, executors)
+
+
+def get_job_queue(request: Request) -> IngestionJobQueue:
+    job_queue = getattr(request.app.state, "job_queue", None)
+    if job_queue is None:
+        raise RuntimeError("Ingestion job queue has not been initialized.")
+    return cast(IngestionJobQueue, job_queue)
+
+
+def get_bulk_ingestion(request: Request) -> BulkIngestionService:
+    bulk_ingestion = getattr(request.app.state, "bulk_ingestion", None)
+    if bulk_ingestion is None:
+        raise RuntimeError("Bulk ingestion service has not been initialized.")
+    return cast(BulkIngestionService, bulk_ingestion)
+
+
+def get_metrics(request: Request) -> MetricsRegistry:
+    metrics = getattr(request.app.state, "metrics", None)
+    if metrics is None:
+        raise RuntimeError("Metrics registry has not been initialized.")
+    return cast(MetricsRegistry, metrics)
+
+
+def get_readiness(request: Request) -> ReadinessTracker:
+    readiness = getattr(request.app.state, "readiness", None)
+    if readiness is None:
+        raise RuntimeError("Readiness tracker has not been initialized.")
+    return cast(ReadinessTracker, readiness)
+
+
+def require_components(*names: str) -> Callable[[Request], Awaitable[None]]:
+    """
+    Dependency that waits (up to ``component_wait_seconds``) for ``names`` to load.
+
+    Lazy components start loading on the first request that needs them. Raises
+    ``ComponentNotReadyError`` (503) if they are still loading or failed to load.
+    """
+
+    async def _require_components(request: Request) -> None:
+        settings = getattr(request.app.state, "settings", None)
+        timeout = settings.component_wait_seconds if settings is not None else None
+        await get_readiness(request).wait_for(names, timeout=timeout)
+
+    return _require_components
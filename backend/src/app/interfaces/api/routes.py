@@ -1,10 +1,32 @@
 from fastapi import APIRouter, Depends, File, UploadFile
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
-from app.application.upload_document import UploadDocumentUseCase
+from app.application.bulk_ingestion import BulkIngestionService
 from app.application.chat import ChatUseCase
-from app.interfaces.api.controllers import handle_chat, handle_upload
-from app.interfaces.api.dependencies import get_chat_use_case, get_upload_use_case
-from app.interfaces.api.schemas import ChatRequest, ChatResponse
+from app.application.ingestion_jobs import IngestionJobQueue
+from app.core.metrics import MetricsRegistry
+from app.core.readiness import ReadinessTracker
+from app.interfaces.api.controllers import (
+    handle_bulk_upload,
+    handle_cancel_job,
+    handle_chat,
+    handle_chat_stream,
+    handle_get_bulk_run,
+    handle_get_job,
+    handle_ready,
+    handle_upload,
+)
+from app.interfaces.api.dependencies import (
+    CHAT_COMPONENTS,
+    INGESTION_COMPONENTS,
+    get_bulk_ingestion,
+    get_chat_use_case,
+    get_job_queue,
+    get_metrics,
+    get_readiness,
+    require_components,
+)
+from app.interfaces.api.schemas import BulkRunResponse, ChatRequest, ChatResponse, JobResponse, ReadinessResponse
 
 router = APIRouter()
 
@@ -14,17 +36,76 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
-@router.post("/upload")
+@router.get("/ready", response_model=ReadinessResponse, responses={503: {"model": ReadinessResponse}})
+async def ready(readiness: ReadinessTracker = Depends(get_readiness)) -> JSONResponse:
+    return handle_ready(readiness)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(registry: MetricsRegistry = Depends(get_metrics)) -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@router.post("/upload", response_model=JobResponse, status_code=202)
 async def upload_pdf(
     file: UploadFile = File(...),
-    upload_use_case: UploadDocumentUseCase = Depends(get_upload_use_case),
-) -> dict[str, str]:
-    return await handle_upload(file, upload_use_case)
+    job_queue: IngestionJobQueue = Depends(get_job_queue),
+) -> JobResponse:
+    return await handle_upload(file, job_queue)
+
+
+@router.post(
+    "/upload/bulk",
+    response_model=BulkRunResponse,
+    status_code=202,
+    dependencies=[Depends(require_components(*INGESTION_COMPONENTS))],
+)
+async def upload_bulk(
+    files: list[UploadFile] = File(...),
+    bulk_ingestion: BulkIngestionService = Depends(get_bulk_ingestion),
+) -> BulkRunResponse:
+    return await handle_bulk_upload(files, bulk_ingestion)
+
+
+@router.get("/upload/bulk/{run_id}", response_model=BulkRunResponse)
+async def get_bulk_run(
+    run_id: str,
+    bulk_ingestion: BulkIngestionService = Depends(get_bulk_ingestion),
+) -> BulkRunResponse:
+    return await handle_get_bulk_run(run_id, bulk_ingestion)
 
 
-@router.post("/chat", response_model=ChatResponse)
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    job_queue: IngestionJobQueue = Depends(get_job_queue),
+) -> JobResponse:
+    return await handle_get_job(job_id, job_queue)
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(
+    job_id: str,
+    job_queue: IngestionJobQueue = Depends(get_job_queue),
+) -> JobResponse:
+    return await handle_cancel_job(job_id, job_queue)
+
+
+@router.post("/chat", response_model=ChatResponse, dependencies=[Depends(require_components(*CHAT_COMPONENTS))])
 async def chat(
     payload: ChatRequest,
     chat_use_case: ChatUseCase = Depends(get_chat_use_case),
 ) -> ChatResponse:
     return await handle_chat(payload, chat_use_case)
+
+
+@router.post(
+    "/chat/stream",
+    response_class=StreamingResponse,
+    dependencies=[Depends(require_components(*CHAT_COMPONENTS))],
+)
+async def chat_stream(
+    payload: ChatRequest,
+    chat_use_case: ChatUseCase = Depends(get_chat_use_case),
+) -> StreamingResponse:
+    return await handle_chat_stream(payload, chat_use_case)
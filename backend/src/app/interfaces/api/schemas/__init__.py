@@ -1,3 +1,14 @@
+from .bulk import BulkItemResponse, BulkRunResponse
 from .chat import ChatRequest, ChatResponse
+from .jobs import JobResponse
+from .readiness import ComponentStatusResponse, ReadinessResponse
 
-__all__ = ["ChatRequest", "ChatResponse"]
+__all__ = [
+    "BulkItemResponse",
+    "BulkRunResponse",
+    "ChatRequest",
+    "ChatResponse",
+    "ComponentStatusResponse",
+    "JobResponse",
+    "ReadinessResponse",
+]
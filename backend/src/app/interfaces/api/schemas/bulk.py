@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+
+
+class BulkItemResponse(BaseModel):
+    filename: str
+    status: str
+    document_id: str | None = None
+    chunk_count: int = 0
+    pages: int = 0
+    error: str | None = None
+
+
+class BulkRunResponse(BaseModel):
+    run_id: str
+    status: str
+    files: int
+    documents: int = 0
+    statuses: dict[str, int] = {}
+    pages: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+    docs_per_minute: float = 0.0
+    errors: list[str] = []
+    results: list[BulkItemResponse] = []
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    filename: str
+    status: str
+    stage: str
+    pages_extracted: int = 0
+    chunks_embedded: int = 0
+    chunks_stored: int = 0
+    document_id: str | None = None
+    duplicate: bool = False
+    error: str | None = None
+    created_at: str | None = None
+    updated_at: str | None = None
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class ComponentStatusResponse(BaseModel):
+    status: str
+    load_seconds: float | None = None
+    warmup_seconds: float | None = None
+    error: str | None = None
+
+
+class ReadinessResponse(BaseModel):
+    status: str
+    components: dict[str, ComponentStatusResponse]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+from dataclasses import asdict
+
+from app.application.bulk_ingestion import BulkIngestionPipeline, BulkIngestionReport, iter_pdf_sources
+from app.application.upload_document import UploadDocumentUseCase
+from app.bootstrap import (
+    build_chunker,
+    build_embedding_service,
+    build_ingestion_registry,
+    build_lexical_index,
+    build_text_extractor,
+    build_vector_store,
+)
+from app.core.config import get_settings
+from app.core.executors import ExecutorPools
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        prog="kb-bulk-ingest",
+        description=(
+            "Ingest PDFs, directories of PDFs and zip/tar archives into the knowledge base, using the "
+            "same KB_* settings as the API. A running API drops its cached answers for the ingested "
+            "documents on its next chat request."
+        ),
+    )
+    parser.add_argument("paths", nargs="+", help="PDF files, directories or zip/tar archives")
+    parser.add_argument("--extract-concurrency", type=int, default=settings.bulk_extract_concurrency)
+    parser.add_argument("--embed-concurrency", type=int, default=settings.bulk_embed_concurrency)
+    parser.add_argument("--queue-size", type=int, default=settings.bulk_queue_size)
+    parser.add_argument("--details", action="store_true", help="include per-document results in the output")
+    args = parser.parse_args(argv)
+    missing = [path for path in args.paths if not os.path.exists(path)]
+    if missing:
+        parser.error(f"no such file or directory: {', '.join(missing)}")
+    return args
+
+
+async def _ingest(args: argparse.Namespace) -> BulkIngestionReport:
+    settings = get_settings()
+    executors = ExecutorPools.from_settings(settings)
+    text_extractor = build_text_extractor(settings)
+    embedding_service = build_embedding_service(settings)
+    registry = build_ingestion_registry(settings)
+    lexical_index = build_lexical_index(settings)
+    try:
+        use_case = UploadDocumentUseCase(
+            text_extractor=text_extractor,
+            embedder=embedding_service,
+            vector_store=build_vector_store(settings, embedding_service),
+            chunk_size=800,
+            overlap=100,
+            chunker=build_chunker(settings, embedding_service),
+            registry=registry,
+            lexical_index=lexical_index,
+            executors=executors,
+        )
+        pipeline = BulkIngestionPipeline(
+            use_case,
+            extract_concurrency=args.extract_concurrency,
+            embed_concurrency=args.embed_concurrency,
+            queue_size=args.queue_size,
+        )
+        return await pipeline.run(iter_pdf_sources(args.paths))
+    finally:
+        executors.shutdown(wait=False)
+        text_extractor.close()
+        registry.close()
+        if lexical_index is not None:
+            lexical_index.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    args = _parse_args(argv)
+    report = asyncio.run(_ingest(args))
+    output = report.summary()
+    if args.details:
+        output["results"] = [asdict(result) for result in report.results]
+    print(json.dumps(output, indent=2))
+    failed = any(result.status == "failed" for result in report.results) or bool(report.errors)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
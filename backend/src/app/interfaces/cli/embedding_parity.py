@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import time
+from typing import Sequence
+
+import numpy as np
+
+from app.bootstrap import onnx_export_dir
+from app.core.config import get_settings
+from app.infrastructure import SentenceTransformerEmbeddingService
+
+# Used without --texts: mixed lengths and topics, so neighbour rankings mean something.
+_SAMPLE_TEXTS = [
+    "How do I reset my password?",
+    "Password resets are done from the account settings page under Security.",
+    "Invoices are issued on the first business day of every month.",
+    "The quarterly report shows revenue grew 12% compared to the previous quarter.",
+    "Employees accrue 2.5 days of paid leave per month of service.",
+    "Requests for parental leave must be submitted at least eight weeks in advance.",
+    "The API rate limit is 600 requests per minute per token.",
+    "Exceeding the rate limit returns HTTP 429 with a Retry-After header.",
+    "Backups run nightly and are kept for 30 days in a separate region.",
+    "Restore a backup by opening a ticket with the date and the affected database.",
+    "The warehouse in Rotterdam ships orders placed before 2 pm on the same day.",
+    "Returns are accepted within 30 days if the item is unused and in its original packaging.",
+    "Safety goggles must be worn at all times on the production floor.",
+    "Fire exits are marked in green and must never be blocked.",
+    "The new onboarding programme pairs every hire with a mentor for three months.",
+    "Travel expenses above 500 euros require approval from a department head.",
+]
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        prog="kb-embedding-parity",
+        description=(
+            "Embed the same texts with the fp32 PyTorch baseline and another backend of KB_EMBEDDING_MODEL, "
+            "and report how closely the vectors and nearest-neighbour rankings agree. Exits with 1 when the "
+            "lowest cosine similarity is below --min-cosine."
+        ),
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["torch-int8", "onnx", "onnx-int8"],
+        default=settings.embedding_backend if settings.embedding_backend != "torch" else "onnx-int8",
+        help="backend to compare (default: KB_EMBEDDING_BACKEND, or onnx-int8 when that is torch)",
+    )
+    parser.add_argument("--texts", help="file with one text per line (default: a small built-in sample)")
+    parser.add_argument("--min-cosine", type=float, default=0.99)
+    parser.add_argument("--top-k", type=int, default=5, help="neighbours compared per text")
+    parser.add_argument("--batch-size", type=int, default=32)
+    return parser.parse_args(argv)
+
+
+def _load_texts(path: str | None) -> list[str]:
+    if path is None:
+        return list(_SAMPLE_TEXTS)
+    with open(path, encoding="utf-8") as handle:
+        return [line.strip() for line in handle if line.strip()]
+
+
+def _embed(
+    embedder: SentenceTransformerEmbeddingService, texts: Sequence[str], batch_size: int
+) -> tuple[np.ndarray, float]:
+    embedder.warmup()
+    start = time.perf_counter()
+    vectors = np.concatenate([embedder.embed(texts[i : i + batch_size]) for i in range(0, len(texts), batch_size)])
+    return vectors, time.perf_counter() - start
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _neighbour_overlap(baseline: np.ndarray, candidate: np.ndarray, k: int) -> float:
+    """Mean share of each text's top-k neighbours (itself excluded) that both backends agree on."""
+    k = min(k, len(baseline) - 1)
+    if k < 1:
+        return 1.0
+    overlaps = []
+    for scores_a, scores_b in zip(baseline @ baseline.T, candidate @ candidate.T):
+        top_a = set(np.argsort(-scores_a)[1 : k + 1])
+        top_b = set(np.argsort(-scores_b)[1 : k + 1])
+        overlaps.append(len(top_a & top_b) / k)
+    return float(np.mean(overlaps))
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    args = _parse_args(argv)
+    settings = get_settings()
+    texts = _load_texts(args.texts)
+    if not texts:
+        raise SystemExit("No texts to embed.")
+
+    def _service(backend: str) -> SentenceTransformerEmbeddingService:
+        return SentenceTransformerEmbeddingService(
+            settings.embedding_model,
+            normalize=settings.embedding_normalize,
+            backend=backend,  # type: ignore[arg-type]
+            threads=settings.embedding_threads,
+            onnx_quantization=settings.onnx_quantization,
+            export_dir=onnx_export_dir(settings),
+        )
+
+    baseline, baseline_seconds = _embed(_service("torch"), texts, args.batch_size)
+    candidate, candidate_seconds = _embed(_service(args.backend), texts, args.batch_size)
+    baseline, candidate = _unit(baseline), _unit(candidate)
+    cosine = np.sum(baseline * candidate, axis=1)
+
+    output = {
+        "model": settings.embedding_model,
+        "backend": args.backend,
+        "texts": len(texts),
+        "cosine_min": round(float(cosine.min()), 6),
+        "cosine_mean": round(float(cosine.mean()), 6),
+        "cosine_p01": round(float(np.percentile(cosine, 1)), 6),
+        f"top{args.top_k}_overlap": round(_neighbour_overlap(baseline, candidate, args.top_k), 4),
+        "baseline_texts_per_second": round(len(texts) / baseline_seconds, 1),
+        "backend_texts_per_second": round(len(texts) / candidate_seconds, 1),
+        "min_cosine": args.min_cosine,
+        "passed": bool(cosine.min() >= args.min_cosine),
+    }
+    print(json.dumps(output, indent=2))
+    return 0 if output["passed"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
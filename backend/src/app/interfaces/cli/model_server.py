@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+
+import uvicorn
+
+from app.core.config import get_settings
+from app.infrastructure.model_server import parse_model_server_url
+from app.interfaces.model_server import create_model_server_app
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        prog="kb-model-server",
+        description=(
+            "Host the embedding model and LLM in one process for any number of API workers. Start the "
+            "API with the same KB_MODEL_SERVER_URL to use it; other KB_* model settings apply here."
+        ),
+    )
+    parser.add_argument(
+        "--url",
+        default=settings.model_server_url or f"unix://{os.path.abspath(os.path.join(settings.data_dir, 'models.sock'))}",
+        help="unix:///path/to.sock or http://127.0.0.1:PORT (default: KB_MODEL_SERVER_URL or <data_dir>/models.sock)",
+    )
+    args = parser.parse_args(argv)
+    try:
+        parse_model_server_url(args.url)
+    except ValueError as exc:
+        parser.error(str(exc))
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    socket_path, host, port = parse_model_server_url(args.url)
+    if socket_path is not None:
+        os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+        # A socket file left by a previous run that was killed would make the bind fail.
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        uvicorn.run(create_model_server_app(), uds=socket_path, log_level="info")
+    else:
+        uvicorn.run(create_model_server_app(), host=host, port=port, log_level="info")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,5 @@
+"""Model server: hosts the embedding model and LLM for API workers (see ``kb-model-server``)."""
+
+from .app import create_model_server_app
+
+__all__ = ["create_model_server_app"]
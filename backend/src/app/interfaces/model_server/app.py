@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import numpy as np
+from fastapi import APIRouter, Depends, FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+
+from app.bootstrap import build_embedding_service, build_rag_service
+from app.core.config import Settings, get_settings
+from app.core.executors import ExecutorPools, ExecutorSaturatedError, run_in_pool, stream_in_pool
+from app.core.metrics import MetricsRegistry
+from app.core.readiness import ComponentNotReadyError, LazyComponent, ReadinessTracker
+from app.domain import DocumentChunk
+from app.infrastructure import MicroBatchingEmbedder
+from app.interfaces.api.controllers import handle_ready
+from app.interfaces.api.dependencies import require_components
+from app.interfaces.model_server.schemas import EmbedRequest, GenerateRequest, GenerateResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def create_model_server_app(settings: Settings | None = None) -> FastAPI:
+    """
+    HTTP app serving ``EmbeddingService`` and ``RagService`` to API workers.
+
+    The models load once, in the background (``/ready`` reports progress). Embedding requests from
+    all workers are coalesced by a ``MicroBatchingEmbedder`` and concurrent prompts, streamed or not,
+    share decoding batches in the RAG service (``KB_RAG_MAX_BATCH_SIZE`` > 1), so batches fill across
+    workers rather than within one.
+    """
+    settings = settings or get_settings()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        app.state.settings = settings
+        app.state.metrics = MetricsRegistry()
+        instrumentation = app.state.metrics if settings.metrics_enabled else None
+        app.state.executors = ExecutorPools.from_settings(settings)
+        readiness = app.state.readiness = ReadinessTracker()
+        embedding = readiness.add(
+            LazyComponent(
+                "embedding",
+                lambda: build_embedding_service(settings, instrumentation, in_process=True),
+                warmup=settings.model_warmup_enabled,
+                deferred="embedding" in settings.lazy_components,
+            )
+        )
+        generation = readiness.add(
+            LazyComponent(
+                "generation",
+                lambda: build_rag_service(settings, instrumentation, in_process=True),
+                warmup=settings.model_warmup_enabled,
+                deferred="generation" in settings.lazy_components,
+            )
+        )
+        app.state.embedding_service = embedding.proxy()
+        app.state.rag_service = generation.proxy()
+        app.state.query_embedder = (
+            MicroBatchingEmbedder(
+                app.state.embedding_service,
+                max_batch_size=settings.embedding_batch_max_size,
+                max_wait_ms=settings.embedding_batch_max_wait_ms,
+                pool=app.state.executors.embedding,
+            )
+            if settings.embedding_batching_enabled
+            else None
+        )
+        for pool in app.state.executors.all():
+            app.state.metrics.register(pool.queue_wait_histogram)
+        if app.state.query_embedder is not None:
+            app.state.metrics.register(app.state.query_embedder.batch_size_histogram)
+            app.state.metrics.register(app.state.query_embedder.queue_wait_histogram)
+
+        preload = asyncio.create_task(readiness.preload(), name="preload-models")
+        try:
+            yield
+        finally:
+            preload.cancel()
+            await asyncio.gather(preload, return_exceptions=True)
+            if app.state.query_embedder is not None:
+                await app.state.query_embedder.close()
+            app.state.executors.shutdown(wait=False)
+            readiness.close()
+
+    app = FastAPI(title=f"{settings.app_name} model server", lifespan=lifespan)
+
+    @app.exception_handler(ComponentNotReadyError)
+    async def component_not_ready_handler(request: Request, exc: ComponentNotReadyError) -> JSONResponse:
+        return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "10"})
+
+    @app.exception_handler(ExecutorSaturatedError)
+    async def executor_saturated_handler(request: Request, exc: ExecutorSaturatedError) -> JSONResponse:
+        return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "5"})
+
+    app.include_router(router)
+    return app
+
+
+@router.get("/health")
+async def health() -> dict[str, str]:
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready(request: Request) -> JSONResponse:
+    return handle_ready(request.app.state.readiness)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(request.app.state.metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/info", dependencies=[Depends(require_components("embedding"))])
+async def info(request: Request) -> dict[str, dict[str, object]]:
+    """What clients need to behave like the in-process services (content keys, chunk sizes)."""
+    embedder = request.app.state.embedding_service
+    return {
+        "embedding": {
+            "model_name": request.app.state.settings.embedding_model,
+            "fingerprint": embedder.fingerprint,
+            "max_tokens": embedder.max_tokens,
+        },
+        "generation": {"model_name": request.app.state.settings.rag_model_name},
+    }
+
+
+@router.post("/embed", dependencies=[Depends(require_components("embedding"))])
+async def embed(payload: EmbedRequest, request: Request) -> Response:
+    """Raw C-order float32 rows; the shape is in the ``X-Embedding-Shape`` header."""
+    state = request.app.state
+    if not payload.texts:
+        vectors = np.empty((0, 0), dtype=np.float32)
+    elif state.query_embedder is not None:
+        vectors = await state.query_embedder.embed(payload.texts)
+    else:
+        vectors = await run_in_pool(state.executors.embedding, state.embedding_service.embed, payload.texts)
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    return Response(
+        content=vectors.tobytes(),
+        media_type="application/octet-stream",
+        headers={"X-Embedding-Shape": f"{vectors.shape[0]},{vectors.shape[1]}"},
+    )
+
+
+@router.post("/generate", response_model=GenerateResponse, dependencies=[Depends(require_components("generation"))])
+async def generate(payload: GenerateRequest, request: Request) -> GenerateResponse:
+    state = request.app.state
+    answer = await run_in_pool(
+        state.executors.generation,
+        state.rag_service.generate_answer,
+        question=payload.question,
+        context=_context(payload),
+        chat_history=payload.chat_history,
+    )
+    return GenerateResponse(answer=answer)
+
+
+@router.post("/generate/stream", dependencies=[Depends(require_components("generation"))])
+async def generate_stream(payload: GenerateRequest, request: Request) -> StreamingResponse:
+    """Newline-delimited JSON: ``{"text": ...}`` per decoded piece, or a final ``{"error": ...}``."""
+    state = request.app.state
+    tokens = stream_in_pool(
+        state.executors.generation,
+        state.rag_service.stream_answer,
+        question=payload.question,
+        context=_context(payload),
+        chat_history=payload.chat_history,
+    )
+
+    async def _events() -> AsyncIterator[str]:
+        try:
+            async for text in tokens:
+                yield json.dumps({"text": text}) + "\n"
+        except Exception as exc:  # noqa: BLE001 - headers are already sent; report in-band
+            logger.exception("Streaming generation failed")
+            yield json.dumps({"error": str(exc) or type(exc).__name__}) + "\n"
+        finally:
+            # A client that disconnects mid-send leaves this generator suspended at ``yield``; close the
+            # token stream explicitly so its prompt leaves the decoding batch now rather than at GC.
+            await tokens.aclose()
+
+    return StreamingResponse(_events(), media_type="application/x-ndjson")
+
+
+def _context(payload: GenerateRequest) -> list[DocumentChunk]:
+    return [DocumentChunk(id=chunk.id, content=chunk.content, metadata=chunk.metadata) for chunk in payload.context]
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+
+
+class EmbedRequest(BaseModel):
+    texts: list[str]
+
+
+class ContextChunk(BaseModel):
+    id: str
+    content: str
+    metadata: dict[str, str] | None = None
+
+
+class GenerateRequest(BaseModel):
+    question: str
+    context: list[ContextChunk] = []
+    chat_history: list[tuple[str, str]] | None = None
+
+
+class GenerateResponse(BaseModel):
+    answer: str
@@ -1,19 +1,40 @@
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import os
+import time
+from typing import Any, Callable
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from starlette.datastructures import State
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from app.application.bulk_ingestion import BulkIngestionPipeline, BulkIngestionService
 from app.application.chat import ChatUseCase
+from app.application.ingestion_jobs import IngestionJobQueue
+from app.application.spooling import UploadTooLargeError
 from app.application.upload_document import UploadDocumentUseCase
-from app.core.config import get_settings
-from app.infrastructure import (
-    ChromaVectorStore,
-    LangChainRagService,
-    SentenceTransformerEmbeddingService,
-    TesseractTextExtractor,
+from app.bootstrap import (
+    build_chunker,
+    build_embedding_service,
+    build_ingestion_registry,
+    build_lexical_index,
+    build_rag_service,
+    build_text_extractor,
+    build_vector_store,
 )
+from app.core.config import get_settings
+from app.core.executors import ExecutorPools, ExecutorSaturatedError
+from app.core.metrics import MetricsRegistry, collect_timings, format_server_timing
+from app.core.readiness import ComponentNotReadyError, LazyComponent, ReadinessTracker
+from app.infrastructure import InMemoryAnswerCache, MicroBatchingEmbedder, ModelServerError, SqliteJobStore
 from app.interfaces.api import get_api_router
+from app.interfaces.api.dependencies import INGESTION_COMPONENTS
+
+logger = logging.getLogger(__name__)
+
+_COMPONENT_RETRY_SECONDS = 30
 
 
 def configure_logging() -> None:
@@ -28,6 +49,83 @@ def configure_logging() -> None:
     root.setLevel(level)
 
 
+def _register_metrics(metrics: MetricsRegistry, state: State) -> None:
+    """Export histograms owned by components and read cache/queue statistics at scrape time."""
+    pools = state.executors.all()
+    for pool in pools:
+        metrics.register(pool.queue_wait_histogram)
+    metrics.add_gauge(
+        "executor_in_flight",
+        lambda: [({"pool": pool.name}, pool.in_flight) for pool in pools],
+        description="Tasks running or queued on each executor pool.",
+    )
+    if state.query_embedder is not None:
+        metrics.register(state.query_embedder.batch_size_histogram)
+        metrics.register(state.query_embedder.queue_wait_histogram)
+
+    answer_cache = state.answer_cache
+    if answer_cache is not None:
+        metrics.add_gauge(
+            "answer_cache_lookups",
+            lambda: [
+                ({"result": "hit"}, answer_cache.hits),
+                ({"result": "similar_hit"}, answer_cache.similar_hits),
+                ({"result": "miss"}, answer_cache.misses),
+            ],
+            description="Answer cache lookups by result.",
+        )
+        metrics.add_gauge(
+            "answer_cache_hit_ratio", lambda: [({}, answer_cache.hit_rate)], description="Answer cache hit rate."
+        )
+        metrics.add_gauge(
+            "answer_cache_entries", lambda: [({}, answer_cache.stats()["entries"])], description="Cached answers."
+        )
+
+    ocr_cache = getattr(getattr(state.text_extractor, "ocr", state.text_extractor), "cache", None)
+    if ocr_cache is not None:
+        metrics.add_gauge(
+            "ocr_cache_lookups",
+            lambda: [({"result": "hit"}, ocr_cache.hits), ({"result": "miss"}, ocr_cache.misses)],
+            description="OCR page cache lookups by result.",
+        )
+        metrics.add_gauge("ocr_cache_hit_ratio", lambda: [({}, ocr_cache.hit_rate)], description="OCR page cache hit rate.")
+
+    components = state.readiness.components
+    metrics.add_gauge(
+        "component_ready",
+        lambda: [({"component": name}, 1.0 if component.loaded else 0.0) for name, component in components.items()],
+        description="Whether each model-backed component has loaded.",
+    )
+    metrics.add_gauge(
+        "component_load_seconds",
+        lambda: [
+            ({"component": name}, component.load_seconds)
+            for name, component in components.items()
+            if component.load_seconds is not None
+        ],
+        description="Time each component took to load, excluding warmup.",
+    )
+
+    job_store = state.job_store
+    metrics.add_gauge(
+        "ingestion_jobs",
+        lambda: [({"status": status}, count) for status, count in job_store.count_by_status().items()],
+        description="Ingestion jobs by status.",
+    )
+
+
+async def _start_ingestion(readiness: ReadinessTracker, job_queue: IngestionJobQueue) -> None:
+    """Start the job workers once the models ingestion needs have loaded; uploads queue up until then."""
+    while True:
+        try:
+            await readiness.wait_for(INGESTION_COMPONENTS)
+            break
+        except ComponentNotReadyError as exc:
+            logger.error("Ingestion workers not started (%s); retrying in %ds.", exc, _COMPONENT_RETRY_SECONDS)
+            await asyncio.sleep(_COMPONENT_RETRY_SECONDS)
+    await job_queue.start()
+
+
 def create_app() -> FastAPI:
     configure_logging()
     settings = get_settings()
@@ -35,32 +133,131 @@ def create_app() -> FastAPI:
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         app.state.settings = settings
-        app.state.text_extractor = TesseractTextExtractor()
-        app.state.embedding_service = SentenceTransformerEmbeddingService(settings.embedding_model)
-        app.state.vector_store = ChromaVectorStore(
-            host=settings.chroma_host,
-            port=settings.chroma_port,
-            collection_name=settings.chroma_collection_name,
-            embedding_model=settings.embedding_model,
+        app.state.metrics = MetricsRegistry()
+        # /metrics always serves what is registered; the flag only controls the per-call wrappers.
+        instrumentation = app.state.metrics if settings.metrics_enabled else None
+        app.state.executors = ExecutorPools.from_settings(settings)
+        app.state.text_extractor = build_text_extractor(settings, instrumentation)
+        # Model-backed components load concurrently in the background (see GET /ready); until then
+        # app.state holds proxies that forward to them once loaded.
+        readiness = app.state.readiness = ReadinessTracker()
+
+        def component(name: str, factory: Callable[[], Any]) -> LazyComponent[Any]:
+            return readiness.add(
+                LazyComponent(
+                    name,
+                    factory,
+                    warmup=settings.model_warmup_enabled,
+                    deferred=name in settings.lazy_components,
+                )
+            )
+
+        app.state.embedding_service = component(
+            "embedding", lambda: build_embedding_service(settings, instrumentation)
+        ).proxy()
+        app.state.vector_store = component(
+            "vector_store", lambda: build_vector_store(settings, app.state.embedding_service, instrumentation)
+        ).proxy()
+        app.state.rag_service = component("generation", lambda: build_rag_service(settings, instrumentation)).proxy()
+        app.state.query_embedder = (
+            MicroBatchingEmbedder(
+                app.state.embedding_service,
+                max_batch_size=settings.embedding_batch_max_size,
+                max_wait_ms=settings.embedding_batch_max_wait_ms,
+                pool=app.state.executors.embedding,
+            )
+            if settings.embedding_batching_enabled
+            else None
         )
-        app.state.rag_service = LangChainRagService(
-            model_name=settings.rag_model_name,
-            max_new_tokens=settings.rag_max_new_tokens,
-            temperature=settings.rag_temperature,
+        app.state.ingestion_registry = build_ingestion_registry(settings)
+        app.state.lexical_index = build_lexical_index(settings)
+        app.state.answer_cache = (
+            InMemoryAnswerCache(
+                max_entries=settings.answer_cache_max_entries,
+                max_bytes=settings.answer_cache_max_mb * 1024 * 1024,
+                ttl_seconds=settings.answer_cache_ttl_seconds,
+                similarity_threshold=settings.answer_cache_similarity_threshold,
+            )
+            if settings.answer_cache_enabled
+            else None
         )
+        # Built on first use: the sentence chunker counts tokens with the embedding model's tokenizer.
+        app.state.chunker = LazyComponent(
+            "chunker", lambda: build_chunker(settings, app.state.embedding_service), warmup=False
+        ).proxy()
         app.state.upload_use_case = UploadDocumentUseCase(
             text_extractor=app.state.text_extractor,
             embedder=app.state.embedding_service,
             vector_store=app.state.vector_store,
             chunk_size=800,
             overlap=100,
+            chunker=app.state.chunker,
+            registry=app.state.ingestion_registry,
+            lexical_index=app.state.lexical_index,
+            answer_cache=app.state.answer_cache,
+            executors=app.state.executors,
+        )
+        app.state.job_store = SqliteJobStore(
+            settings.job_store_path or os.path.join(settings.data_dir, "jobs.sqlite3"),
+            lease_seconds=settings.job_lease_seconds,
+        )
+        app.state.job_queue = IngestionJobQueue(
+            use_case=app.state.upload_use_case,
+            store=app.state.job_store,
+            spool_dir=os.path.join(settings.data_dir, "uploads"),
+            workers=settings.ingestion_workers,
+            max_upload_bytes=settings.max_upload_mb * 1024 * 1024,
+            lease_seconds=settings.job_lease_seconds,
+        )
+        app.state.bulk_ingestion = BulkIngestionService(
+            BulkIngestionPipeline(
+                app.state.upload_use_case,
+                extract_concurrency=settings.bulk_extract_concurrency,
+                embed_concurrency=settings.bulk_embed_concurrency,
+                queue_size=settings.bulk_queue_size,
+            ),
+            spool_dir=os.path.join(settings.data_dir, "bulk"),
+            max_upload_bytes=settings.max_upload_mb * 1024 * 1024,
         )
         app.state.chat_use_case = ChatUseCase(
             vector_store=app.state.vector_store,
             rag_service=app.state.rag_service,
             top_k=settings.rag_top_k,
+            registry=app.state.ingestion_registry,
+            query_embedder=app.state.query_embedder.embed_one if app.state.query_embedder else None,
+            lexical_index=app.state.lexical_index,
+            fusion_k=settings.rrf_k,
+            answer_cache=app.state.answer_cache,
+            executors=app.state.executors,
         )
-        yield
+        _register_metrics(app.state.metrics, app.state)
+
+        if settings.preload_blocking:
+            await readiness.preload()
+            if not readiness.ready:
+                failed = [name for name, state in readiness.snapshot().items() if state["status"] == "failed"]
+                raise RuntimeError(f"Components failed to load: {', '.join(failed)}")
+        background = [
+            asyncio.create_task(readiness.preload(), name="preload-components"),
+            asyncio.create_task(_start_ingestion(readiness, app.state.job_queue), name="start-ingestion"),
+        ]
+        try:
+            yield
+        finally:
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+            await app.state.job_queue.close()
+            await app.state.bulk_ingestion.close()
+            if app.state.query_embedder is not None:
+                await app.state.query_embedder.close()
+            app.state.executors.shutdown(wait=False)
+            readiness.close()
+            app.state.text_extractor.close()
+            app.state.ingestion_registry.close()
+            app.state.job_store.close()
+            if app.state.lexical_index is not None:
+                app.state.lexical_index.close()
 
     app = FastAPI(title=settings.app_name, lifespan=lifespan)
     app.add_middleware(
@@ -71,6 +268,53 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    @app.exception_handler(ExecutorSaturatedError)
+    async def executor_saturated_handler(request: Request, exc: ExecutorSaturatedError) -> JSONResponse:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": f"The {exc.pool_name} stage is at capacity; retry shortly."},
+            headers={"Retry-After": "5"},
+        )
+
+    @app.exception_handler(ComponentNotReadyError)
+    async def component_not_ready_handler(request: Request, exc: ComponentNotReadyError) -> JSONResponse:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": f"{exc} Retry shortly."},
+            headers={"Retry-After": "10"},
+        )
+
+    @app.exception_handler(ModelServerError)
+    async def model_server_error_handler(request: Request, exc: ModelServerError) -> JSONResponse:
+        if exc.status == 503:
+            # The model server is busy or still loading; pass that on instead of reporting a failure.
+            return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "5"})
+        return JSONResponse(status_code=502, content={"detail": str(exc)})
+
+    @app.exception_handler(UploadTooLargeError)
+    async def upload_too_large_handler(request: Request, exc: UploadTooLargeError) -> JSONResponse:
+        return JSONResponse(status_code=413, content={"detail": str(exc)})
+
+    if settings.metrics_enabled:
+
+        @app.middleware("http")
+        async def record_request_timings(request: Request, call_next):
+            start = time.perf_counter()
+            with collect_timings() as timings:
+                response = await call_next(request)
+            elapsed = time.perf_counter() - start
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            request.app.state.metrics.histogram(
+                "http_request_duration_seconds",
+                description="Time until the response headers were ready.",
+                method=request.method,
+                route=route,
+            ).observe(elapsed)
+            if settings.timing_headers_enabled:
+                # Streamed responses only include the work done before the first byte.
+                response.headers["Server-Timing"] = format_server_timing({**timings, "total": elapsed})
+            return response
+
     api_router = get_api_router()
     app.include_router(api_router, prefix=settings.api_prefix)
 
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from app.application.bulk_ingestion import iter_pdf_sources
+
+
+def test_pdfs_sharing_a_name_get_distinct_names(tmp_path):
+    for folder in ("first", "second", "third"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "a.pdf").write_bytes(b"%PDF-1.4")
+
+    paths = [str(tmp_path / folder / "a.pdf") for folder in ("first", "second", "third")]
+    names = [name for name, _ in iter_pdf_sources(paths)]
+
+    assert names == ["a.pdf", "a (2).pdf", "a (3).pdf"]
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+import torch
+from transformers import GPT2Config, GPT2LMHeadModel
+
+from app.infrastructure.rag.generation_scheduler import BatchingGenerationScheduler
+
+
+class _CharTokenizer:
+    pad_token_id = 0
+    eos_token_id = 1
+
+    def __call__(self, prompts: list[str]) -> dict[str, list[list[int]]]:
+        return {"input_ids": [[2 + ord(char) % 60 for char in prompt] for prompt in prompts]}
+
+    def decode(self, ids: list[int], skip_special_tokens: bool = True) -> str:
+        return "".join(chr(65 + id_ % 26) for id_ in ids if id_ > 1)
+
+    def batch_decode(self, rows: torch.Tensor, skip_special_tokens: bool = True) -> list[str]:
+        return [self.decode(row.tolist()) for row in rows]
+
+
+@pytest.fixture
+def scheduler():
+    torch.manual_seed(0)
+    config = GPT2Config(vocab_size=64, n_positions=128, n_embd=32, n_layer=2, n_head=2, eos_token_id=1, bos_token_id=1)
+    scheduler = BatchingGenerationScheduler(
+        model=GPT2LMHeadModel(config).eval(),
+        tokenizer=_CharTokenizer(),
+        generation_kwargs={"max_new_tokens": 12, "do_sample": False},
+        max_batch_size=4,
+        max_wait_ms=50,
+    )
+    yield scheduler
+    scheduler.close()
+
+
+def test_streamed_and_blocking_prompts_share_a_batch(scheduler):
+    prompts = ["hello there", "a", "what is the capital", "zz top"]
+    expected = {prompt: scheduler.generate(prompt) for prompt in prompts}
+    results: dict[str, str] = {}
+
+    def _generate(prompt: str) -> None:
+        results[prompt] = scheduler.generate(prompt)
+
+    def _stream(prompt: str) -> None:
+        results[prompt] = "".join(scheduler.stream(prompt))
+
+    threads = [threading.Thread(target=_generate, args=(prompt,)) for prompt in prompts[:2]]
+    threads += [threading.Thread(target=_stream, args=(prompt,)) for prompt in prompts[2:]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Left padding inside a batch must not change greedy completions.
+    assert results == expected
+
+
+def test_closed_stream_leaves_the_scheduler_usable(scheduler):
+    stream = scheduler.stream("hello there")
+    next(stream)
+    stream.close()
+
+    assert scheduler.generate("a")
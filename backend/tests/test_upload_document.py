@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Iterable, Iterator
+
+import numpy as np
+import pytest
+
+from app.application.upload_document import UploadDocumentUseCase
+from app.domain import DocumentChunk, DocumentSource, ExtractedPage
+from app.infrastructure.registry import SqliteIngestionRegistry
+from app.infrastructure.vectorstores import MmapVectorStore
+
+
+class _Extractor:
+    fingerprint = "test-extractor"
+
+    def extract_text(self, source: DocumentSource) -> str:
+        return bytes(source).decode()
+
+    def iter_pages(self, source: DocumentSource) -> Iterator[ExtractedPage]:
+        yield ExtractedPage(number=1, text=bytes(source).decode())
+
+
+class _Embedder:
+    fingerprint = "test-embedder"
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+class _VectorStore:
+    def __init__(self) -> None:
+        self.chunks: dict[str, DocumentChunk] = {}
+
+    def add_documents(self, chunks: Iterable[DocumentChunk]) -> None:
+        self.chunks.update((chunk.id, chunk) for chunk in chunks)
+
+    def delete_document(self, document_id: str) -> None:
+        # Same rule as the real stores: the filename only matches legacy chunks without a document_id.
+        self.chunks = {
+            id_: chunk
+            for id_, chunk in self.chunks.items()
+            if chunk.metadata.get("document_id", chunk.metadata["filename"]) != document_id
+        }
+
+    def texts(self, document_id: str | None) -> list[str]:
+        return [chunk.content for chunk in self.chunks.values() if chunk.metadata["document_id"] == document_id]
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = SqliteIngestionRegistry(str(tmp_path / "ingestion.sqlite3"))
+    yield registry
+    registry.close()
+
+
+@pytest.fixture
+def store() -> _VectorStore:
+    return _VectorStore()
+
+
+@pytest.fixture
+def use_case(registry, store) -> UploadDocumentUseCase:
+    return UploadDocumentUseCase(
+        text_extractor=_Extractor(), embedder=_Embedder(), vector_store=store, registry=registry
+    )
+
+
+async def _upload(use_case: UploadDocumentUseCase, filename: str, text: str):
+    return await use_case.embed_and_store(filename=filename, source=text.encode())
+
+
+async def test_duplicate_upload_moves_existing_name_to_shared_content(use_case, registry, store):
+    await _upload(use_case, "a.pdf", "alpha")
+    await _upload(use_case, "b.pdf", "beta")
+
+    result = await _upload(use_case, "b.pdf", "alpha")
+
+    assert result.duplicate and result.document_id == "a.pdf"
+    assert registry.resolve("b.pdf") == "a.pdf"
+    assert store.texts("b.pdf") == []
+
+
+async def test_replacing_document_keeps_content_of_its_aliases(use_case, registry, store):
+    await _upload(use_case, "a.pdf", "alpha")
+    await _upload(use_case, "c.pdf", "alpha")
+
+    await _upload(use_case, "a.pdf", "gamma")
+
+    assert store.texts(registry.resolve("a.pdf")) == ["gamma"]
+    assert store.texts(registry.resolve("c.pdf")) == ["alpha"]
+
+    # Once the last alias moves on, the old version is deleted.
+    await _upload(use_case, "c.pdf", "gamma")
+    assert registry.resolve("c.pdf") == registry.resolve("a.pdf")
+    assert [chunk.content for chunk in store.chunks.values()] == ["gamma"]
+
+
+async def test_releasing_old_version_keeps_new_version_stored_under_same_filename(use_case, registry, store):
+    await _upload(use_case, "a.pdf", "alpha")
+    await _upload(use_case, "c.pdf", "alpha")
+    await _upload(use_case, "a.pdf", "gamma")  # stored as "a.pdf@<key>" while c.pdf still needs "a.pdf"
+
+    await _upload(use_case, "c.pdf", "gamma")  # releases the old "a.pdf"
+
+    assert store.texts(registry.resolve("a.pdf")) == ["gamma"]
+    assert store.texts(registry.resolve("c.pdf")) == ["gamma"]
+
+
+async def test_releasing_old_version_keeps_new_version_in_mmap_store(registry, tmp_path):
+    store = MmapVectorStore(directory=str(tmp_path / "vectors"), embedder=_Embedder())
+    use_case = UploadDocumentUseCase(
+        text_extractor=_Extractor(), embedder=_Embedder(), vector_store=store, registry=registry
+    )
+    for filename, text in [("a.pdf", "alpha"), ("c.pdf", "alpha"), ("a.pdf", "gamma"), ("c.pdf", "gamma")]:
+        await _upload(use_case, filename, text)
+
+    results = store.query("gamma", limit=10, where={"document_id": registry.resolve("a.pdf")})
+    assert [result.chunk.content for result in results] == ["gamma"]
+
+
+async def test_replacement_without_chunks_forgets_previous_version(use_case, registry, store):
+    await _upload(use_case, "a.pdf", "alpha")
+
+    result = await _upload(use_case, "a.pdf", "   ")
+
+    assert result.chunk_count == 0
+    assert registry.resolve("a.pdf") is None
+    again = await _upload(use_case, "b.pdf", "alpha")
+    assert not again.duplicate and store.texts("b.pdf") == ["alpha"]
+
+
+async def test_concurrent_uploads_of_one_name_run_one_after_another(use_case, registry, store):
+    long_text = " ".join(["alpha"] * 400)  # several chunks, so an overlapping upload would leave some behind
+
+    async def upload(text: str) -> None:
+        # Yielding on every progress report lets the two ingestions interleave.
+        await use_case.embed_and_store(filename="a.pdf", source=text.encode(), on_progress=lambda _: asyncio.sleep(0))
+
+    await asyncio.gather(upload(long_text), upload("beta"))
+
+    assert store.texts(registry.resolve("a.pdf")) == ["beta"]
+    assert [chunk.content for chunk in store.chunks.values()] == ["beta"]
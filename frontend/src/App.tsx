@@ -5,6 +5,36 @@ import { API_BASE_URL } from './config';
 
 type ChatResponse = { answer: string; source?: string | null };
 
+type IngestionJob = {
+  job_id: string;
+  filename: string;
+  status: 'queued' | 'running' | 'succeeded' | 'failed' | 'cancelled';
+  stage: string;
+  pages_extracted: number;
+  chunks_embedded: number;
+  chunks_stored: number;
+  document_id: string | null;
+  error: string | null;
+};
+
+const JOB_POLL_INTERVAL_MS = 1000;
+
+async function waitForJob(jobId: string, onProgress: (job: IngestionJob) => void): Promise<IngestionJob> {
+  for (;;) {
+    const response = await fetch(`${API_BASE_URL}/jobs/${jobId}`);
+    if (!response.ok) {
+      throw new Error(`Checking upload status failed: ${response.status}`);
+    }
+    const job = (await response.json()) as IngestionJob;
+    if (job.status === 'succeeded') return job;
+    if (job.status === 'failed' || job.status === 'cancelled') {
+      throw new Error(job.error ? `Indexing ${job.status}: ${job.error}` : `Indexing ${job.status}.`);
+    }
+    onProgress(job);
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+  }
+}
+
 const seedMessages: ChatMessage[] = [
   {
     id: 'intro',
@@ -72,7 +102,13 @@ function App() {
       if (!response.ok) {
         throw new Error(`Upload failed: ${response.status}`);
       }
-      const result = (await response.json()) as { document_id: string; filename: string };
+      const job = (await response.json()) as IngestionJob;
+      console.log('[upload] queued', job);
+      const result = await waitForJob(job.job_id, (progress) => {
+        setUploadStatusMessage(
+          `Indexing ${progress.filename}: ${progress.pages_extracted} pages read, ${progress.chunks_stored} chunks stored…`,
+        );
+      });
       console.log('[upload] success', result);
       setDocumentId(result.document_id);
       setUploadStatus('ready');